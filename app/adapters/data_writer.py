@@ -0,0 +1,141 @@
+"""Single writer for the shared data files.
+
+Scripts run in parallel (see the script_runner module) each work on a private copy of the data folder.
+Their changes are collected as DataChanges, and applied to the shared data files by one DataWriter,
+so that concurrent scripts never write the same files.
+
+Ratings are computed by each script from its own copy: the rating changes of two scripts sharing players
+can't be merged entry by entry. The writer only tells whether ratings changed (ratings_changed),
+and the ratings are then recomputed from the merged tournaments (see script_runner.run_scripts()).
+Other changes of the same entry by two sources are conflicts: the changes of the second source are rejected.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from app.adapters.json_storage import JSONStorage
+import json
+import logging
+
+logger = logging.getLogger()
+
+# fields derived from the ratings computed by each script: they don't make conflicts
+RATING_FIELDS = {"player": ("rating",), "tournament": ("rated",)}
+
+
+class DataConflictError(ValueError):
+    """Changes of a source conflict with changes already applied from another source."""
+
+    def __init__(self, source: str, conflicts: list[str]):
+        super().__init__(f"Changes of {source} conflict with other changes: {', '.join(conflicts)}")
+        self.source = source
+        self.conflicts = conflicts
+
+
+@dataclass
+class DataChanges:
+    """Changes made to a copy of the data files.
+
+    - players: player ID => player data, for new or changed players
+    - tournaments: tournament ID => tournament metadata, for new or changed tournaments
+    - head_to_head: player pair => meetings, for new or changed pairs (see the head_to_head module)
+    - files: name => content of the tournament data files (and event logs) written
+    """
+
+    players: dict[str, dict] = field(default_factory=dict)
+    tournaments: dict[str, dict] = field(default_factory=dict)
+    head_to_head: dict[str, dict] = field(default_factory=dict)
+    files: dict[str, bytes] = field(default_factory=dict)
+
+
+def read_json(json_file: Path) -> dict:
+    """Reads a JSON data file, or returns an empty dict if the file doesn't exist."""
+    if not Path(json_file).exists():
+        return {}
+    with open(json_file, "r", encoding="utf8") as f:
+        json_str = f.read()
+    return json.loads(json_str) if json_str else {}
+
+
+def changed_entries(before: dict, after: dict) -> dict:
+    """Entries of after that are new or different from before."""
+    return {k: v for k, v in after.items() if before.get(k) != v}
+
+
+def collect_changes(before: dict[str, dict], players_file: Path, index_file: Path, head_to_head_file: Path):
+    """Collects the changes made to a copy of the data files.
+
+    before holds the content of the data files before the changes ("players", "tournaments", "head_to_head").
+    """
+    changes = DataChanges(
+        players=changed_entries(before.get("players", {}), read_json(players_file)),
+        tournaments=changed_entries(before.get("tournaments", {}), read_json(index_file)),
+        head_to_head=changed_entries(before.get("head_to_head", {}), read_json(head_to_head_file)),
+    )
+    tournament_dir = Path(index_file).parent
+    for metadata in changes.tournaments.values():
+        if not (data_file := metadata.get("data_file")):
+            continue
+        data_file = Path(tournament_dir, data_file)
+        for f in (data_file, data_file.with_name(data_file.stem + ".events.jsonl")):
+            if f.exists():
+                changes.files[f.name] = f.read_bytes()
+    return changes
+
+
+class DataWriter:
+    """Applies DataChanges to the shared data files, and writes them once on commit()."""
+
+    def __init__(self, players_file: Path, index_file: Path, head_to_head_file: Path):
+        self._players = JSONStorage(players_file)
+        self._index = JSONStorage(index_file)
+        self._head_to_head = JSONStorage(head_to_head_file)
+        self._tournament_dir = Path(index_file).parent
+        # entry => source of the applied change, to detect conflicting changes
+        self._sources: dict[tuple[str, str], str] = {}
+        # True once a change touched the ratings: they must then be recomputed
+        self.ratings_changed: bool = False
+
+    def _entries(self, changes: DataChanges) -> list[tuple[str, JSONStorage, dict]]:
+        return [("player", self._players, changes.players), ("tournament", self._index, changes.tournaments)]
+
+    def _conflicts(self, changes: DataChanges, source: str) -> list[str]:
+        """Entries changed by another source, with different values (rating fields aside)."""
+        conflicts = []
+        for store_n, store, entries in self._entries(changes):
+            ignored = RATING_FIELDS[store_n]
+            for key, value in entries.items():
+                if (previous := self._sources.get((store_n, key))) is None or previous == source:
+                    continue
+                applied = {k: v for k, v in store[key].items() if k not in ignored}
+                if applied != {k: v for k, v in value.items() if k not in ignored}:
+                    conflicts.append(f"{store_n} {key} (changed by {previous})")
+        return conflicts
+
+    def apply(self, changes: DataChanges, source: str = ""):
+        """Applies changes in memory. Tournament data files are written immediately.
+
+        Raises DataConflictError, without applying any change, when the changes conflict with the changes
+        of another source. Changes of the rating fields are not conflicts: they set ratings_changed.
+        """
+        if conflicts := self._conflicts(changes, source):
+            raise DataConflictError(source, conflicts)
+        for store_n, store, entries in self._entries(changes):
+            for field_n in RATING_FIELDS[store_n]:
+                if any(value.get(field_n) != store.get(key, {}).get(field_n) for key, value in entries.items()):
+                    self.ratings_changed = True
+            for key, value in entries.items():
+                self._sources[(store_n, key)] = source
+                store[key] = value
+        for pair, meetings in changes.head_to_head.items():
+            # meetings are keyed by match: merge them
+            self._head_to_head[pair] = {**self._head_to_head.get(pair, {}), **meetings}
+        for name, content in changes.files.items():
+            o_file = Path(self._tournament_dir, name)
+            tmp_file = o_file.with_name(o_file.name + ".tmp")
+            tmp_file.write_bytes(content)
+            tmp_file.replace(o_file)
+
+    def commit(self):
+        self._players.write_store()
+        self._index.write_store()
+        self._head_to_head.write_store()
@@ -8,6 +8,8 @@ from app.models.model_baseclasses import (
     generic_entity_filter_func,
 )
 from pathlib import Path
+from app.adapters import warm_cache
+from app.helpers.tracing import traced
 
 
 class JSONStorage(MutableMapping):
@@ -15,6 +17,9 @@ class JSONStorage(MutableMapping):
 
     The object is not automatically synced with a file, so you have to manually call write_store()
     to commit all changes to the external JSON file.
+
+    With lazy set, an existing file is only loaded on first access to the storage.
+    With warm_cache set, the decoded data is also kept in a warm-start cache (see the warm_cache module).
     """
 
     def __init__(
@@ -22,13 +27,20 @@ class JSONStorage(MutableMapping):
         json_file,
         encoder: json.JSONEncoder = None,
         decoder: json.JSONDecoder = None,
+        lazy: bool = False,
+        warm_cache: bool = False,
     ):
         self._store = {}
+        self._loaded: bool = True
         self._file = Path(json_file).resolve()
         self.encoder = encoder
         self.decoder = decoder
+        self.warm_cache: bool = warm_cache
         if self._file.exists():
-            self.load_store()
+            if lazy:
+                self._loaded = False
+            else:
+                self.load_store()
         else:
             if not self._file.parent.exists():
                 self._file.parent.mkdir(mode=0o777, parents=True, exist_ok=True)
@@ -36,36 +48,76 @@ class JSONStorage(MutableMapping):
             self._file.touch(mode=0o666)
             self._file.unlink()
 
+    @traced("storage load_store")
     def load_store(self):
         """(re)-loads this storage from the linked JSON file"""
+        if self.warm_cache:
+            self._store = warm_cache.read_decoded(
+                self._file, self._decode, pack=self._warm_pack(), unpack=self._warm_unpack()
+            )
+            self._loaded = True
+            return
         with open(self._file, "r", encoding="utf8") as json_file:
             json_str = json_file.read()
             self._store = (
                 json.loads(json_str, cls=self.decoder) if len(json_str) else {}
             )
+        self._loaded = True
+
+    def _decode(self, json_str: str) -> dict:
+        return json.loads(json_str, cls=self.decoder) if len(json_str) else {}
+
+    # decoders may provide a compact form of the decoded data for the warm cache (warm_pack / warm_unpack)
+
+    def _warm_pack(self):
+        return getattr(self.decoder, "warm_pack", None)
 
+    def _warm_unpack(self):
+        return getattr(self.decoder, "warm_unpack", None)
+
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def _load_once(self):
+        if not self._loaded:
+            self.load_store()
+
+    @traced("storage write_store")
     def write_store(self):
         """Dumps this storage to its linked JSON file."""
+        self._load_once()
         if not self._file.exists():
             self._file.touch(mode=0o666)
+        if self.warm_cache:
+            content = json.dumps(self._store, cls=self.encoder, indent=1, ensure_ascii=False).encode("utf8")
+            with open(self._file, "wb") as json_file:
+                json_file.write(content)
+            # the encoders and decoders round-trip: the data in memory is what a restart would decode from the file
+            warm_cache.store_cached(self._file, content, self._store, pack=self._warm_pack())
+            return
         with open(self._file, "w", encoding="utf8") as json_file:
             json.dump(
                 self._store, json_file, cls=self.encoder, indent=1, ensure_ascii=False
             )
 
     def __getitem__(self, key: Any) -> Any:
+        self._load_once()
         return self._store.__getitem__(key)
 
     def __setitem__(self, key: Any, value: Any) -> None:
+        self._load_once()
         self._store.__setitem__(key, value)
 
     def __delitem__(self, key: Any) -> None:
+        self._load_once()
         self._store.__delitem__(key)
 
     def __iter__(self) -> Iterator:
+        self._load_once()
         return self._store.__iter__()
 
     def __len__(self) -> int:
+        self._load_once()
         return self._store.__len__()
 
 
@@ -76,13 +128,25 @@ class JSONRepository(GenericRepository[EntityType]):
     The JSON data is indexed by the entity ids, converted as strings.
 
     WARNING: For now, we don't support concurrent access of the data in the file...
+
+    While deferred is set, commit_changes() keeps the changes in memory until flush() is called
+    (see the unit_of_work module).
+    With lazy set, the JSON file is only decoded when the repository is first read or changed.
+    With warm_cache set, the decoded data is kept in a warm-start cache (see the warm_cache module).
     """
 
-    def __init__(self, file, encoder, decoder):
+    def __init__(self, file, encoder, decoder, lazy: bool = False, warm_cache: bool = False):
         self._changes = []
-        self._store = JSONStorage(json_file=file, encoder=encoder, decoder=decoder)
+        self._store = JSONStorage(json_file=file, encoder=encoder, decoder=decoder, lazy=lazy, warm_cache=warm_cache)
+        self.deferred: bool = False
 
+    @traced("repository commit_changes")
     def commit_changes(self):
+        if not self.deferred:
+            self.flush()
+
+    def flush(self):
+        """Writes the pending changes to file, even when deferred."""
         if len(self._changes):
             self._store.write_store()
             self._changes = []
@@ -99,7 +163,7 @@ class JSONRepository(GenericRepository[EntityType]):
         if not str(entity.id()) in self._store:
             self.add(entity)
         else:
-            self._store[entity.id()] = entity
+            self._store[str(entity.id())] = entity
             self._changes.append(("update", str(entity.id())))
 
     def delete(self, key: Hashable = None, **conditions):
@@ -116,6 +180,7 @@ class JSONRepository(GenericRepository[EntityType]):
     def list_all(self) -> Sequence[EntityType]:
         return list(self._store.values())
 
+    @traced("repository find_many")
     def find_many(self, **filters) -> Sequence[EntityType]:
         if not len(filters):
             return self.list_all()
@@ -0,0 +1,129 @@
+"""Warm-start cache of decoded JSON files.
+
+Decoding the data files through the custom JSON decoders (players, tournament index) is the bulk of the app
+load time. The decoded data is kept next to its source file (<source>.warm), along with the fingerprint
+of the source: modification time, size and SHA-256 hash. Next time the source file is read, the cached data
+is used instead of decoding the file again, as long as the fingerprint still matches.
+
+The data is cached with marshal when possible (plain JSON data, or data packed into plain values by a pack
+function, see PlayerJSONDecoder.warm_pack()), and pickled otherwise.
+
+The cache is refreshed each time the app writes the source file (see JSONStorage.write_store()),
+with the data the app just encoded, so that a restart (after a crash, for instance) finds a warm cache.
+The written file is not decoded again: the JSON encoders and decoders of the data models must round-trip.
+"""
+
+from pathlib import Path
+from typing import Any, Callable
+import hashlib
+import logging
+import marshal
+import os
+import pickle
+
+logger = logging.getLogger()
+
+# bump when the cached form of the data models changes, to invalidate existing caches
+WARM_CACHE_FORMAT = 1
+CACHE_SUFFIX = ".warm"
+
+
+def cache_file(source_file: str | Path) -> Path:
+    source_file = Path(source_file)
+    return source_file.with_name(source_file.name + CACHE_SUFFIX)
+
+
+def fingerprint(stat: os.stat_result, content: bytes) -> dict:
+    """Fingerprint of a source file, from its stat and its content."""
+    return {
+        "format": WARM_CACHE_FORMAT,
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": hashlib.sha256(content).hexdigest(),
+    }
+
+
+def load_cached(
+    source_file: str | Path, stat: os.stat_result, content: bytes, unpack: Callable[[Any], Any] = None
+) -> tuple[bool, Any]:
+    """Returns (True, data) if the cache of a source file matches its fingerprint, (False, None) otherwise.
+
+    unpack(payload) rebuilds the data from the form returned by the pack function given to store_cached().
+    """
+    cached = cache_file(source_file)
+    try:
+        with open(cached, "rb") as cf:
+            header: dict = pickle.load(cf)
+            if (
+                header.get("format") != WARM_CACHE_FORMAT
+                or header.get("mtime_ns") != stat.st_mtime_ns
+                or header.get("size") != stat.st_size
+                or header.get("sha256") != hashlib.sha256(content).hexdigest()
+                or header.get("packed") != (unpack is not None)
+            ):
+                return False, None
+            # marshal.load() reads a file object piece by piece: read it whole instead
+            payload = marshal.loads(cf.read()) if header.get("codec") == "marshal" else pickle.load(cf)
+        logger.debug(f"Loaded warm cache {cached}")
+        return True, unpack(payload) if unpack else payload
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.error(f"Ignoring invalid warm cache {cached}: {e}")
+    return False, None
+
+
+def store_cached(
+    source_file: str | Path,
+    content: bytes,
+    data: Any,
+    stat: os.stat_result = None,
+    pack: Callable[[Any], Any] = None,
+):
+    """Caches the decoded data of a source file, with the fingerprint of the source file.
+
+    pack(data) converts the data to plain values (see the marshal module), faster to load than pickled objects.
+    """
+    cached = cache_file(source_file)
+    try:
+        header = fingerprint(stat or Path(source_file).stat(), content)
+        payload = pack(data) if pack else data
+        header["packed"] = pack is not None
+        try:
+            serialized, header["codec"] = marshal.dumps(payload), "marshal"
+        except ValueError:
+            serialized, header["codec"] = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL), "pickle"
+        tmp_file = cached.with_name(cached.name + ".tmp")
+        with open(tmp_file, "wb") as cf:
+            # the header comes first, so that a stale cache is detected without loading the data
+            pickle.dump(header, cf, protocol=pickle.HIGHEST_PROTOCOL)
+            cf.write(serialized)
+        tmp_file.replace(cached)
+    except (OSError, pickle.PicklingError) as e:
+        logger.error(f"Failed to write warm cache {cached}: {e}")
+
+
+def read_decoded(
+    source_file: str | Path,
+    decode: Callable[[str], Any],
+    pack: Callable[[Any], Any] = None,
+    unpack: Callable[[Any], Any] = None,
+) -> Any:
+    """Reads a source file and returns its decoded data: from the warm cache if valid,
+    from decode(text) otherwise (then the cache is updated).
+    """
+    source_file = Path(source_file)
+    with open(source_file, "rb") as sf:
+        stat = os.fstat(sf.fileno())
+        content = sf.read()
+    hit, data = load_cached(source_file, stat, content, unpack=unpack)
+    if hit:
+        return data
+    data = decode(content.decode("utf8"))
+    store_cached(source_file, content, data, stat=stat, pack=pack)
+    return data
+
+
+def clear(source_file: str | Path):
+    """Removes the cache of a source file."""
+    cache_file(source_file).unlink(missing_ok=True)
@@ -0,0 +1,120 @@
+"""Command dispatcher used by the app main loop.
+
+The dispatcher holds the pending commands and executes them as fast as they come:
+the main loop only blocks when a view waits for user input,
+or when it waits for commands from an attached producer (see CommandDispatcher.producer()).
+"""
+
+from app.commands.commands_abc import CommandInterface
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable
+import threading
+import logging
+
+logger = logging.getLogger()
+
+
+class CommandDispatcher:
+    """Stack of pending commands.
+
+    Commands are executed in stack order: the last received command is executed first,
+    so that the commands issued by a view run before the command that displayed the view is repeated.
+
+    Commands may be pushed from other threads. While a producer is attached,
+    an empty dispatcher waits for new commands instead of ending the main loop.
+    """
+
+    def __init__(self):
+        self._stack: deque[CommandInterface] = deque()
+        self._cond = threading.Condition()
+        self._producers: int = 0
+        self._stopped: bool = False
+        # number of commands executed by dispatch()
+        self.executed: int = 0
+
+    def __len__(self) -> int:
+        return len(self._stack)
+
+    def stopped(self) -> bool:
+        return self._stopped
+
+    def push(self, *commands: CommandInterface):
+        """Adds commands on top of the stack."""
+        with self._cond:
+            self._stack.extend(commands)
+            self._cond.notify()
+
+    def pop(self) -> CommandInterface:
+        """Removes and returns the command on top of the stack.
+
+        Waits for a command while the stack is empty and a producer is attached.
+        Returns None when the stack is empty (and no producer is attached) or when the dispatcher is stopped.
+        """
+        with self._cond:
+            while not self._stack and self._producers and not self._stopped:
+                self._cond.wait()
+            if self._stopped or not self._stack:
+                return None
+            return self._stack.pop()
+
+    def drop(self) -> CommandInterface:
+        """Removes the command on top of the stack, without waiting. Returns None if the stack is empty."""
+        with self._cond:
+            return self._stack.pop() if self._stack else None
+
+    def clear(self):
+        with self._cond:
+            self._stack.clear()
+
+    def stop(self):
+        """Stops dispatching: pending commands are not executed."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    @contextmanager
+    def producer(self):
+        """Attaches a producer of commands for the duration of the context.
+
+        While at least one producer is attached, the main loop waits for commands instead of ending.
+        """
+        with self._cond:
+            self._producers += 1
+        try:
+            yield self
+        finally:
+            with self._cond:
+                self._producers -= 1
+                self._cond.notify_all()
+
+    def dispatch(
+        self,
+        after_command: Callable[[], None] = None,
+        execute: Callable[[CommandInterface], None] = None,
+    ) -> int:
+        """Executes commands until the stack is empty or the dispatcher is stopped.
+
+        Cycling commands are pushed back before being executed (see CommandInterface.cycle).
+        execute(cmd) executes each command (default: cmd.execute()), for instance to measure it.
+        after_command() is called after each command (the app renders its views there).
+        Returns the number of executed commands.
+        """
+        executed = 0
+        while (cmd := self.pop()) is not None:
+            logger.debug(f"executing command {cmd.__class__}")
+            # should we repeat this command next loop ?
+            if cmd.cycle is True:
+                self.push(cmd)
+            elif isinstance(cmd.cycle, int) and cmd.cycle > 0:
+                cmd.cycle -= 1
+                self.push(cmd)
+            if execute:
+                execute(cmd)
+            else:
+                cmd.execute()
+            executed += 1
+            if after_command:
+                after_command()
+        self.executed += executed
+        return executed
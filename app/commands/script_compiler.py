@@ -0,0 +1,131 @@
+"""Compiler for automation scripts.
+
+Script lines are calls to controller methods, with parameters expressed as a JSON object:
+
+    TournamentManager.register_player({"player_id": "OP98765", "tournament_id": null, "confirmed": false})
+
+A script is compiled once into a list of ScriptCommand: resolved controller class and method,
+and parameters decoded from JSON, with date and datetime strings already converted.
+
+The compiled script is cached next to the script file (<script>.cache), keyed by the SHA-256 hash of the script:
+replaying an unchanged script skips parsing completely.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable
+import hashlib
+import json
+import logging
+import pickle
+import re
+
+logger = logging.getLogger()
+
+# bump when the compiled form changes, to invalidate existing caches
+COMPILED_FORMAT = 1
+CACHE_SUFFIX = ".cache"
+
+# strings that may be ISO dates or datetimes (YYYY-MM-DD or YYYYMMDD, optionally followed by a time)
+_DATE_PREFIX = re.compile(r"\d{4}-?\d{2}-?\d{2}")
+
+
+class ScriptError(ValueError):
+    """Error in a script, at a given line."""
+
+    def __init__(self, line: int, msg: str):
+        super().__init__(f"Error in commands script at line {line}: {msg}")
+        self.line = line
+
+
+@dataclass(frozen=True)
+class ScriptCommand:
+    """A compiled script line: call method of the controller cls with params."""
+
+    line: int
+    cls: type
+    method: Callable
+    params: dict[str, Any] = field(default_factory=dict)
+
+
+def decode_param(value: Any) -> Any:
+    """Converts ISO date and datetime strings to date and datetime objects."""
+    if not isinstance(value, str) or not _DATE_PREFIX.match(value):
+        return value
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return value
+
+
+def compile_line(line: int, cmd_str: str, resolve: Callable[[str], type]) -> ScriptCommand:
+    """Compiles a script line. Returns None for blank lines and comments.
+
+    resolve returns the controller class of a class name (or None if unknown).
+    """
+    cmd_str = cmd_str.strip()
+    if not cmd_str or cmd_str[0] == "#":
+        return None
+    dot, open_par, close_par = cmd_str.find("."), cmd_str.find("("), cmd_str.rfind(")")
+    if dot < 0 or open_par < dot or close_par < open_par:
+        raise ScriptError(line, f"expecting <controller>.<method>(<params>), got: {cmd_str}")
+    cls_n, method_n = cmd_str[:dot], cmd_str[dot + 1: open_par]
+    if (cls := resolve(cls_n)) is None:
+        raise ScriptError(line, f"unknown controller {cls_n}")
+    if not callable(method := getattr(cls, method_n, None)):
+        raise ScriptError(line, f"unknown method {cls_n}.{method_n}")
+    params = {}
+    if param_json := cmd_str[open_par + 1: close_par].strip():
+        try:
+            params = json.loads(param_json)
+        except json.JSONDecodeError as e:
+            raise ScriptError(line, f"invalid parameters: {e}")
+        if not isinstance(params, dict):
+            raise ScriptError(line, "parameters must be a JSON object")
+        params = {k: decode_param(v) for k, v in params.items()}
+    return ScriptCommand(line=line, cls=cls, method=method, params=params)
+
+
+def compile_script(cmd_list: list[str], resolve: Callable[[str], type]) -> list[ScriptCommand]:
+    """Compiles the lines of a script. Fails with a ScriptError on the first invalid line."""
+    script = []
+    for line, cmd_str in enumerate(cmd_list, start=1):
+        if compiled := compile_line(line, cmd_str, resolve):
+            script.append(compiled)
+    return script
+
+
+def cache_file(script_file: str | Path) -> Path:
+    script_file = Path(script_file)
+    return script_file.with_name(script_file.name + CACHE_SUFFIX)
+
+
+def load_script_file(script_file: str | Path, resolve: Callable[[str], type]) -> list[ScriptCommand]:
+    """Loads a compiled script from its cache, or compiles it (and updates the cache)."""
+    content = Path(script_file).read_bytes()
+    digest = hashlib.sha256(content).hexdigest()
+    cached = cache_file(script_file)
+    try:
+        with open(cached, "rb") as cf:
+            data = pickle.load(cf)
+        if data.get("format") == COMPILED_FORMAT and data.get("sha256") == digest:
+            logger.debug(f"Loaded compiled script from {cached}")
+            return data["commands"]
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.error(f"Ignoring invalid script cache {cached}: {e}")
+    script = compile_script(content.decode("utf8").splitlines(), resolve)
+    try:
+        tmp_file = cached.with_name(cached.name + ".tmp")
+        with open(tmp_file, "wb") as cf:
+            pickle.dump({"format": COMPILED_FORMAT, "sha256": digest, "commands": script}, cf)
+        tmp_file.replace(cached)
+    except OSError as e:
+        logger.error(f"Failed to write script cache {cached}: {e}")
+    return script
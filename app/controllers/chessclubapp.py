@@ -1,26 +1,38 @@
+import atexit
+import importlib
 import logging
 import app
+import os
+import time
 import types
 import typing
+from contextlib import redirect_stdout
 from dataclasses import dataclass, field
-from time import sleep
 from pathlib import Path
 from app.commands.commands_abc import CommandInterface
+from app.commands.dispatcher import CommandDispatcher
+from app.commands.script_compiler import ScriptCommand, ScriptError, compile_script, load_script_file
 from app.controllers.controller_abc import MainController, BaseController
 from app.commands.commands import StopCommand, ExitCurrentCommand
 from app.commands import commands
-from app.views.views_abc import AbstractView
+from app.views.views_abc import AbstractView, BaseView
 from app.views.menu import MenuOption, Menu
-from app.models.player_model import PlayerRepository
-from app.controllers.player_manager import PlayerManager
-from app.models.tournament_model import TournamentRepository
-from app.controllers import (
-    tournament_manager,
-    running_tournament_manager,
-    reports_manager,
-)
-from app.helpers.validation import is_valid_date, is_valid_datetime
-from datetime import date, datetime
+from app.helpers import tracing
+from app.helpers.startup_timing import timer as startup_timer
+from datetime import date
+
+# controllers and models are imported on first use (see AssetLoader.CLASSES), to keep the app startup fast
+if typing.TYPE_CHECKING:
+    from app.models.player_model import PlayerRepository
+    from app.models.tournament_model import TournamentRepository
+    from app.models.active_tournaments import ActiveTournaments
+    from app.models.head_to_head import HeadToHeadIndex
+    from app.helpers.instrumentation import Instrumentation
+    from app.helpers.sampling_profiler import SamplingProfiler
+    from app.controllers.player_manager import PlayerManager
+    from app.controllers.tournament_manager import TournamentManager
+    from app.controllers.running_tournament_manager import RunningTournamentManager
+    from app.controllers.reports_manager import ReportsManager
 
 logger = logging.getLogger()
 
@@ -37,85 +49,211 @@ class AppConfig:
     report_css_file: Path = field(
         default=Path(app.APPDIR, "assets", "css", "report_styles.css")
     )
+    # log tournament changes as events, and snapshot tournament data every tournament_snapshot_interval events
+    tournament_event_sourcing: bool = False
+    tournament_snapshot_interval: int = 50
+    # lock tournaments, for result entry from several threads (several arbiters served by one process)
+    tournament_thread_safe: bool = False
+    # results of all meetings between two players, across tournaments
+    head_to_head_file: Path = field(default=Path(app.DATADIR, "head_to_head.json"))
+    # pairings avoid the players who already met in other tournaments since this date (None: ever)
+    season_start: date = None
+    # sampling profiler (see ChessclubApp.toggle_sampling_profiler()): output file and time between samples, in seconds
+    sampling_profile_file: Path = field(default=Path(app.APPDIR.parent, "logs", "profile.collapsed"))
+    sampling_interval: float = 0.01
+    # keep the decoded players, tournament index and tournament files in a warm-start cache (see the warm_cache module)
+    warm_cache: bool = True
+    # lifetime of the controllers and repositories loaded by the app, by class name (see AssetLoader.LIFETIMES)
+    controller_lifetimes: dict[str, str] = field(default_factory=dict)
+
+
+# lifetimes of the instances loaded by the AssetLoader
+# one instance for the app lifetime
+SINGLETON = "singleton"
+# one instance per session: from a main menu option to the return to the main menu (see AssetLoader.end_session())
+SESSION = "session"
+# a new instance each time it is loaded (on each launch() of a controller)
+COMMAND = "command"
 
 
 class AssetLoader:
     """Helper class used to instanciate controllers and repositories.
-    This is used by the main controller's launch() method."""
+    This is used by the main controller's launch() method.
+
+    Instances are built on first load, and kept in a registry according to the lifetime of their class
+    (see LIFETIMES, overridden by AppConfig.controller_lifetimes).
+    """
 
     def __init__(self, cfg: AppConfig, app: MainController):
         self._cfg = cfg
-        self.player_repo = None
-        self.tournament_repo = None
-        self.tournament_manager = None
-        self.running_tournament_manager = None
         self.app: MainController = app
+        # loaded instances, by class name (instances with the COMMAND lifetime are not kept)
+        self._instances: dict[str, typing.Any] = {}
+        self._lifetimes: dict[str, str] = self.LIFETIMES | (getattr(cfg, "controller_lifetimes", None) or {})
+        for cls_n, lifetime in self._lifetimes.items():
+            if lifetime not in (SINGLETON, SESSION, COMMAND):
+                raise ValueError(f"Unknown lifetime {lifetime} for class {cls_n}.")
+
+    # controllers and repositories supported by load(): class name => module, imported on first use
+    CLASSES: dict[str, str] = {
+        "PlayerManager": "app.controllers.player_manager",
+        "PlayerRepository": "app.models.player_model",
+        "TournamentRepository": "app.models.tournament_model",
+        "ActiveTournaments": "app.models.active_tournaments",
+        "HeadToHeadIndex": "app.models.head_to_head",
+        "TournamentManager": "app.controllers.tournament_manager",
+        "RunningTournamentManager": "app.controllers.running_tournament_manager",
+        "ReportsManager": "app.controllers.reports_manager",
+    }
+
+    # default lifetime of the instances of each class:
+    # repositories are shared by all controllers, menu controllers live as long as the user stays in their menus
+    LIFETIMES: dict[str, str] = {
+        "PlayerManager": SESSION,
+        "PlayerRepository": SINGLETON,
+        "TournamentRepository": SINGLETON,
+        "ActiveTournaments": SINGLETON,
+        "HeadToHeadIndex": SINGLETON,
+        "TournamentManager": SINGLETON,
+        "RunningTournamentManager": SINGLETON,
+        "ReportsManager": SESSION,
+    }
+
+    @classmethod
+    def resolve(cls, cls_name: str) -> type:
+        """Returns the supported class of a given name (importing its module if needed), or None."""
+        if (module_n := cls.CLASSES.get(cls_name)) is None:
+            return None
+        return getattr(importlib.import_module(module_n), cls_name)
 
     def load(self, cls) -> BaseController:
         """Loads an instance of a suppported controller or repository,
         applying the app config.
+
+        Returns the registered instance if any, builds it otherwise.
         """
         cls_n = cls if isinstance(cls, str) else cls.__name__
+        if (instance := self._instances.get(cls_n)) is not None:
+            return instance
+        instance = self._create(cls_n)
+        if self._lifetimes.get(cls_n, COMMAND) != COMMAND:
+            self._instances[cls_n] = instance
+        return instance
+
+    def loaded(self, cls) -> bool:
+        """Whether an instance of a class is registered."""
+        return (cls if isinstance(cls, str) else cls.__name__) in self._instances
+
+    def end_session(self):
+        """Drops the instances with the SESSION lifetime: they are built again on next load."""
+        for cls_n in [cls_n for cls_n in self._instances if self._lifetimes.get(cls_n) == SESSION]:
+            del self._instances[cls_n]
+
+    def _create(self, cls_n: str):
         match cls_n:
-            case PlayerManager.__name__:
-                return self.load_player_manager()
-            case PlayerRepository.__name__:
-                return self.load_player_repository()
-            case TournamentRepository.__name__:
-                return self.load_tournament_repository()
-            case tournament_manager.TournamentManager.__name__:
-                return self.load_tournament_manager()
-            case running_tournament_manager.RunningTournamentManager.__name__:
-                return self.load_running_tournament_manager()
-            case reports_manager.ReportsManager.__name__:
-                return self.load_reports_manager()
+            case "PlayerManager":
+                return self.new_player_manager()
+            case "PlayerRepository":
+                return self.new_player_repository()
+            case "TournamentRepository":
+                return self.new_tournament_repository()
+            case "ActiveTournaments":
+                return self.new_active_tournaments()
+            case "HeadToHeadIndex":
+                return self.new_head_to_head_index()
+            case "TournamentManager":
+                return self.new_tournament_manager()
+            case "RunningTournamentManager":
+                return self.new_running_tournament_manager()
+            case "ReportsManager":
+                return self.new_reports_manager()
         raise ValueError(f"Failed to load instance of unknown class {cls_n}.")
 
-    def load_player_repository(self) -> PlayerRepository:
-        if not self.player_repo:
-            self.player_repo = PlayerRepository(self._cfg.player_repository_file)
-        return self.player_repo
+    def load_player_repository(self) -> "PlayerRepository":
+        return self.load("PlayerRepository")
 
-    def load_player_manager(self) -> PlayerManager:
-        return PlayerManager(player_repo=self.load_player_repository(), app=self.app)
+    def load_player_manager(self) -> "PlayerManager":
+        return self.load("PlayerManager")
 
-    def load_tournament_repository(self) -> TournamentRepository:
-        if not self.tournament_repo:
-            self.tournament_repo = TournamentRepository(
-                metadata_file=self._cfg.tournament_repository_file,
-                player_repo=self.load_player_repository(),
-            )
-        return self.tournament_repo
-
-    def load_tournament_manager(self) -> tournament_manager.TournamentManager:
-        if not self.tournament_manager:
-            self.tournament_manager = tournament_manager.TournamentManager(
-                player_repo=self.load_player_repository(),
-                tournament_repo=self.load_tournament_repository(),
-                main_app=self.app,
-            )
-        return self.tournament_manager
-
-    def load_running_tournament_manager(
-        self,
-    ) -> running_tournament_manager.RunningTournamentManager:
-        if not self.running_tournament_manager:
-            self.running_tournament_manager = (
-                running_tournament_manager.RunningTournamentManager(
-                    player_repo=self.load_player_repository(),
-                    tournament_repo=self.load_tournament_repository(),
-                    main_app=self.app,
-                )
-            )
-        return self.running_tournament_manager
+    def load_tournament_repository(self) -> "TournamentRepository":
+        return self.load("TournamentRepository")
+
+    def load_active_tournaments(self) -> "ActiveTournaments":
+        return self.load("ActiveTournaments")
+
+    def load_head_to_head_index(self) -> "HeadToHeadIndex":
+        return self.load("HeadToHeadIndex")
 
-    def load_reports_manager(self) -> reports_manager.ReportsManager:
-        instance = reports_manager.ReportsManager(
-            player_repo=self.player_repo,
-            tournament_repo=self.tournament_repo,
+    def load_tournament_manager(self) -> "TournamentManager":
+        return self.load("TournamentManager")
+
+    def load_running_tournament_manager(self) -> "RunningTournamentManager":
+        return self.load("RunningTournamentManager")
+
+    def load_reports_manager(self) -> "ReportsManager":
+        return self.load("ReportsManager")
+
+    def new_player_repository(self) -> "PlayerRepository":
+        # the players file is only decoded when players are first needed
+        return self.resolve("PlayerRepository")(
+            self._cfg.player_repository_file, lazy=True, warm_cache=self._cfg.warm_cache
+        )
+
+    def new_player_manager(self) -> "PlayerManager":
+        return self.resolve("PlayerManager")(
+            player_repo=self.load_player_repository(),
+            app=self.app,
+            tournament_repo=self.load_tournament_repository(),
+        )
+
+    def new_tournament_repository(self) -> "TournamentRepository":
+        return self.resolve("TournamentRepository")(
+            metadata_file=self._cfg.tournament_repository_file,
+            player_repo=self.load_player_repository(),
+            event_sourcing=self._cfg.tournament_event_sourcing,
+            snapshot_interval=self._cfg.tournament_snapshot_interval,
+            thread_safe=self._cfg.tournament_thread_safe,
+            lazy=True,
+            warm_cache=self._cfg.warm_cache,
+        )
+
+    def new_active_tournaments(self) -> "ActiveTournaments":
+        return self.resolve("ActiveTournaments")(tournament_repo=self.load_tournament_repository())
+
+    def new_head_to_head_index(self) -> "HeadToHeadIndex":
+        head_to_head_index = self.resolve("HeadToHeadIndex")(self._cfg.head_to_head_file)
+        if not head_to_head_index.file_exists():
+            # first run: index the matches of existing tournaments
+            head_to_head_index.rebuild(self.load_tournament_repository())
+            head_to_head_index.commit_changes()
+        return head_to_head_index
+
+    def new_tournament_manager(self) -> "TournamentManager":
+        return self.resolve("TournamentManager")(
+            player_repo=self.load_player_repository(),
+            tournament_repo=self.load_tournament_repository(),
             main_app=self.app,
+            active_tournaments=self.load_active_tournaments(),
+        )
+
+    def new_running_tournament_manager(self) -> "RunningTournamentManager":
+        return self.resolve("RunningTournamentManager")(
+            player_repo=self.load_player_repository(),
+            tournament_repo=self.load_tournament_repository(),
+            main_app=self.app,
+            active_tournaments=self.load_active_tournaments(),
+            head_to_head_index=self.load_head_to_head_index(),
+            season_start=self._cfg.season_start,
+        )
+
+    def new_reports_manager(self) -> "ReportsManager":
+        return self.resolve("ReportsManager")(
+            player_repo=self.load_player_repository(),
+            tournament_repo=self.load_tournament_repository(),
+            main_app=self.app,
+            active_tournaments=self.load_active_tournaments(),
+            head_to_head_index=self.load_head_to_head_index(),
         )
-        return instance
 
 
 class MainMenuCommand(CommandInterface):
@@ -132,23 +270,53 @@ class MainMenuCommand(CommandInterface):
         self.app.main_menu()
 
 
+class InstrumentationReportCommand(CommandInterface):
+    """Command to display the timings collected by the instrumentation (see ChessclubApp.enable_instrumentation())."""
+
+    def __init__(self, app: MainController) -> None:
+        super().__init__()
+        self.app = app
+
+    def execute(self):
+        self.app.instrumentation_report()
+
+
+class ToggleSamplingProfilerCommand(CommandInterface):
+    """Command to start or stop the sampling profiler (see ChessclubApp.toggle_sampling_profiler())."""
+
+    def __init__(self, app: MainController) -> None:
+        super().__init__()
+        self.app = app
+
+    def execute(self):
+        self.app.toggle_sampling_profiler()
+
+
 class ChessclubApp(MainController):
     """Main App controller.
 
     Pilots the app execution from an infinite loop in the main() method.
 
-    The commands found in the queue are executed in stacked order.
+    The commands found in the queue are executed in stacked order (see CommandDispatcher).
     Usually, a command will call a controller's method.
     Controllers set up views and pass them to the view() method.
     Views issue commands, collected by the receive() method and placed in the queue.
 
     """
 
-    def __init__(self):
-        self._command_stack: list[CommandInterface] = []
-        self._received_stop_command = False
+    def __init__(self, config: AppConfig = None):
+        self._dispatcher: CommandDispatcher = CommandDispatcher()
         self._views: list[AbstractView] = []
-        self._config: AppConfig = AppConfig()
+        # headless mode: views are discarded (see run_batch())
+        self._batch: bool = False
+        # opt-in timings of commands and controller methods (see enable_instrumentation())
+        self._instrumentation: "Instrumentation" = None
+        # opt-in sampling of the main thread stack (see toggle_sampling_profiler())
+        self._sampling_profiler: "SamplingProfiler" = None
+        # startup timings report, written when the first view is rendered (see enable_startup_timing())
+        self._startup_report_file: str | Path = None
+        self._startup_target_ms: float = None
+        self._config: AppConfig = config or AppConfig()
         self._loader: AssetLoader = AssetLoader(cfg=self._config, app=self)
         #
         # some features require to store values
@@ -189,16 +357,22 @@ class ChessclubApp(MainController):
                     )
                 )
             if isinstance(cmd, StopCommand):
-                self._received_stop_command = True
+                self._dispatcher.stop()
                 cmd.execute()
+            elif self._batch and cmd.cycle:
+                # cycling commands wait for user input (menus): skip them in batch mode
+                logger.debug(f"Batch mode: skip cycling command {cmd.__class__}")
             else:
-                self._command_stack.append(cmd)
+                self._dispatcher.push(cmd)
 
     def view(self, viewobj: AbstractView):
         """Load a view to the current view store.
 
         Views will be rendered once the current command has completed its execution.
         """
+        if self._batch:
+            logger.debug(f"Batch mode: discard view {viewobj.__class__}")
+            return
         logger.debug(f"loaded view {viewobj.__class__}")
         self._views.append(viewobj)
 
@@ -207,37 +381,37 @@ class ChessclubApp(MainController):
         while len(self._views):
             v = self._views.pop()
             logger.debug(f"Render view {v.__class__}")
+            if startup_timer.mark_first_view():
+                self._startup_report()
             v.render()
 
     def main_menu(self):
         """Loads the main menu in the views store."""
         logger.debug("Preparing the main menu.")
+        # back to the main menu: the session of the previous menu ends
+        self._loader.end_session()
         menu_view = Menu("Chess Club Main Menu", cmdManager=self)
         menu_view.add_option(
             MenuOption(
                 option_text="Manage Players",
-                command=commands.LaunchManagerCommand(
-                    app=self, cls_or_obj=PlayerManager
-                ),
+                command=commands.LaunchManagerCommand(app=self, cls_or_obj="PlayerManager"),
             )
         )
         menu_view.add_option(
             MenuOption(
                 option_text="Manage Tournaments",
-                command=commands.LaunchManagerCommand(
-                    app=self, cls_or_obj=tournament_manager.TournamentManager
-                ),
+                command=commands.LaunchManagerCommand(app=self, cls_or_obj="TournamentManager"),
             )
         )
         menu_view.add_option(
             MenuOption(
                 option_text="Set Current Tournament",
-                command=tournament_manager.LoadTournamentCommand(
+                command=commands.LaunchManagerCommand(
                     app=self,
-                    confirm_cmd=commands.LaunchManagerCommand(
-                        app=self,
-                        cls_or_obj=running_tournament_manager.RunningTournamentManager,
-                    ),
+                    cls_or_obj="TournamentManager",
+                    method="load_tournament",
+                    tournament_id=None,
+                    confirm_cmd=commands.LaunchManagerCommand(app=self, cls_or_obj="RunningTournamentManager"),
                 ),
             )
         )
@@ -245,18 +419,24 @@ class ChessclubApp(MainController):
             menu_view.add_option(
                 MenuOption(
                     option_text="Run Current Tournament",
+                    command=commands.LaunchManagerCommand(app=self, cls_or_obj="RunningTournamentManager"),
+                )
+            )
+        # tournaments are only activated through the registry: until it is loaded, none is active
+        active_count = len(self._loader.load_active_tournaments()) if self._loader.loaded("ActiveTournaments") else 0
+        if active_count > 1:
+            menu_view.add_option(
+                MenuOption(
+                    option_text="Switch Active Tournament",
                     command=commands.LaunchManagerCommand(
-                        app=self,
-                        cls_or_obj=running_tournament_manager.RunningTournamentManager,
+                        app=self, cls_or_obj="TournamentManager", method="switch_tournament", tournament_id=None
                     ),
                 )
             )
         menu_view.add_option(
             MenuOption(
                 option_text="Reports",
-                command=commands.LaunchManagerCommand(
-                    app=self, cls_or_obj=reports_manager.ReportsManager
-                ),
+                command=commands.LaunchManagerCommand(app=self, cls_or_obj="ReportsManager"),
             )
         )
         menu_view.add_option(
@@ -264,23 +444,39 @@ class ChessclubApp(MainController):
                 option_text="Exit", alt_key="X", command=ExitCurrentCommand(self)
             )
         )
+        if self._instrumentation:
+            menu_view.add_option(
+                MenuOption(
+                    option_text="Performance report",
+                    alt_key="P",
+                    hidden=True,
+                    command=InstrumentationReportCommand(self),
+                )
+            )
+        menu_view.add_option(
+            MenuOption(
+                option_text="Sampling profiler on/off",
+                alt_key="S",
+                hidden=True,
+                command=ToggleSamplingProfilerCommand(self),
+            )
+        )
         self.view(menu_view)
 
     def exit_all(self):
         """Exits the app without delay."""
         logger.debug("Exit app without delay.")
-        self._received_stop_command = True
-        self._command_stack = []
+        self._dispatcher.stop()
+        self._dispatcher.clear()
         self._views = []
         exit()
 
     def exit_current(self):
         """Exits current context."""
         logger.debug(
-            f"Exit current context: {len(self._command_stack)} -> {len(self._command_stack) - 1}"
+            f"Exit current context: {len(self._dispatcher)} -> {max(len(self._dispatcher) - 1, 0)}"
         )
-        if len(self._command_stack) > 0:
-            self._command_stack.pop()
+        self._dispatcher.drop()
 
     def launch(self, cls_or_obj, method="default", **kwargs):
         """Launches a manager / controller.
@@ -298,11 +494,17 @@ class ChessclubApp(MainController):
             method_n = method.__name__
         handler = getattr(obj, method_n or "default")
         logger.debug(f"Launching: {obj.__class__.__name__}.{method_n} ({kwargs})")
-        handler(**kwargs)
+        with tracing.span(f"controller {obj.__class__.__name__}.{method_n or "default"}"):
+            if self._instrumentation:
+                with self._instrumentation.method(obj.__class__.__name__, method_n or "default"):
+                    handler(**kwargs)
+            else:
+                handler(**kwargs)
 
-    def interpret_script(self, cmd_list: list[str] = None):
+    def interpret_script(self, cmd_list: list[str] | list[ScriptCommand] = None) -> list[CommandInterface]:
         """Interprets the elements of a list as commands.
-        Decodes each line to produce the command with proper parameters.
+        Decodes each line to produce the command with proper parameters
+        (see the script_compiler module), unless the script is already compiled.
 
         We expect elements like this in the input:
         <controllerclass>.<controllermethod>(params_json)
@@ -313,50 +515,33 @@ class ChessclubApp(MainController):
         "TournamentManager.register_player({"player_id": "OP98765", "tournament_id": null, "confirmed": false})"
 
         """
-        import json
-
-        script: list[CommandInterface] = []
         try:
-            line = 0
-            for cmd_str in cmd_list:
-                line += 1
-                cmd_str = cmd_str.strip()
-                if len(cmd_str) == 0:
-                    # blank line
-                    continue
-                if cmd_str[0] == "#":
-                    # comment
-                    continue
-                cls_n = cmd_str[: cmd_str.index(".")]
-                method_n = cmd_str[cmd_str.index(".") + 1: cmd_str.index("(")]
-                if param_json := cmd_str[cmd_str.index("(") + 1: cmd_str.index(")")]:
-                    params: dict = json.loads(param_json)
-                    logger.debug(f"decoded params: {params}")
-                    for p in params:
-                        d_str = str(params[p])
-                        if is_valid_date(d_str):
-                            logger.debug(
-                                f"try to decode date: {d_str} ({type(d_str).__name__})"
-                            )
-                            params[p] = date.fromisoformat(d_str)
-                        elif is_valid_datetime(d_str):
-                            logger.debug(f"try to decode datetime: {d_str}")
-                            params[p] = datetime.fromisoformat(d_str)
-                else:
-                    params = {}
-                script.append(
-                    commands.LaunchManagerCommand(
-                        app=self, cls_or_obj=cls_n, method=method_n, **params
-                    )
-                )
-        except Exception as e:
-            err_msg = f"Error in commands script at line {line}: {e}"
-            logger.error(err_msg, stack_info=True)
-            print(err_msg)
+            if cmd_list and isinstance(cmd_list[0], ScriptCommand):
+                script = cmd_list
+            else:
+                script = compile_script(cmd_list or [], resolve=self._loader.resolve)
+        except ScriptError as e:
+            logger.error(str(e), stack_info=True)
+            print(e)
             return []
-        return script
+        return [
+            commands.LaunchManagerCommand(app=self, cls_or_obj=cmd.cls, method=cmd.method, **cmd.params)
+            for cmd in script
+        ]
 
-    def run(self, cmd_script: list[str] = None):
+    def load_script_file(self, script_file: str | Path) -> list[ScriptCommand]:
+        """Loads a script file, compiled (see the script_compiler module).
+
+        Returns None if the script can't be loaded.
+        """
+        try:
+            return load_script_file(script_file, resolve=self._loader.resolve)
+        except (OSError, ScriptError) as e:
+            logger.error(f"Failed to load script file {script_file}: {e}")
+            print(e)
+            return None
+
+    def run(self, cmd_script: list[str] | list[ScriptCommand] = None):
         """Runs the application main loop.
 
         Accepts a list of commands to execute."""
@@ -370,27 +555,148 @@ class ChessclubApp(MainController):
             cmd_list = list(reversed(self.interpret_script(cmd_script)))
             self.receive(*cmd_list)
 
-        while len(self._command_stack) > 0 and self._received_stop_command is False:
-            logger.debug(f"Main loop: {len(self._command_stack)} commands found in stack")
-            cmd = self._command_stack.pop()
-            logger.debug(f"executing command {cmd.__class__}")
-
-            # should we repeat this command next loop ?
-            if cmd.cycle is True:
-                self.receive(cmd)
-            elif isinstance(cmd.cycle, int) and cmd.cycle > 0:
-                cmd.cycle -= 1
-                self.receive(cmd)
-
-            cmd.execute()
-            self.render_views()
-            sleep(0.01)
+        self.dispatch()
         logger.debug(
             "Main loop ended, stop application because {}.".format(
-                "command queue is empty"
-                if len(self._command_stack) == 0
-                else "stop command received"
+                "stop command received"
+                if self._dispatcher.stopped()
+                else "command queue is empty"
             )
         )
         print("Done.")
         exit()
+
+    def run_batch(
+        self, cmd_script: list[str] | list[ScriptCommand], log_file: str | Path = None, flush_every: int = 0
+    ) -> int:
+        """Runs a script headless, then returns the number of executed commands.
+
+        Views are discarded and menus are skipped. Status messages are written to log_file, or discarded.
+        Repository writes are deferred, and flushed at the end of the script, or every flush_every commands.
+        """
+        from app.models.unit_of_work import UnitOfWork
+
+        logger.debug("Start batch mode")
+        commands = self.interpret_script(cmd_script)
+        self._batch = True
+        start = time.perf_counter()
+        unit_of_work = UnitOfWork(
+            self._loader.load_player_repository(),
+            self._loader.load_tournament_repository(),
+            self._loader.load_head_to_head_index(),
+            flush_every=flush_every,
+        )
+        try:
+            with (
+                open(log_file or os.devnull, "a", encoding="utf8") as log,
+                redirect_stdout(log),
+                unit_of_work,
+            ):
+                self.receive(*reversed(commands))
+                executed = self._dispatcher.dispatch(after_command=unit_of_work.step, execute=self._execute)
+        finally:
+            self._batch = False
+        elapsed = time.perf_counter() - start
+        print(f"Executed {executed} commands in {elapsed:.2f}s ({unit_of_work.flushes} writes to the data files).")
+        return executed
+
+    def dispatch(self) -> int:
+        """Executes the received commands until none is left or a stop command is received.
+
+        Views are rendered after each command. Returns the number of executed commands.
+        """
+        return self._dispatcher.dispatch(after_command=self.render_views, execute=self._execute)
+
+    def _execute(self, cmd: CommandInterface):
+        if self._instrumentation:
+            with self._instrumentation.command(cmd):
+                cmd.execute()
+        else:
+            cmd.execute()
+
+    def enable_instrumentation(self, profile_dir: str | Path = None, report_file: str | Path = None):
+        """Records the timings of each command and controller method.
+
+        The report is written to report_file (or printed) when the app exits,
+        and can be displayed from the main menu with the hidden 'P' option.
+        With profile_dir, each command also runs under cProfile, and its profile is written to profile_dir.
+        """
+        from app.helpers.instrumentation import Instrumentation
+
+        self._instrumentation = Instrumentation(profile_dir=profile_dir)
+        atexit.register(self._instrumentation.dump, report_file)
+
+    def enable_startup_timing(self, report_file: str | Path = None, target_ms: float = None):
+        """Reports the startup timings (see the startup_timing module) when the first view is rendered,
+        to report_file (or printed). The startup timer must be enabled before the app modules are imported.
+        """
+        startup_timer.enable()
+        self._startup_report_file = report_file
+        self._startup_target_ms = target_ms
+
+    def _startup_report(self):
+        kwargs = {"target_ms": self._startup_target_ms} if self._startup_target_ms else {}
+        try:
+            startup_timer.dump(self._startup_report_file, **kwargs)
+        except OSError as e:
+            logger.error(f"Failed to write the startup timings: {e}")
+
+    def enable_tracing(self, trace_file: str | Path, max_spans: int = 0):
+        """Records tracing spans (see the tracing module), and writes them to trace_file when the app exits:
+        in the Chrome trace-event format for .json files, as JSON lines otherwise.
+        """
+        tracing.tracer.enable(max_spans=max_spans)
+        atexit.register(tracing.tracer.export, trace_file)
+
+    def start_sampling_profiler(self, profile_file: str | Path = None, interval: float = None):
+        """Starts sampling the main thread stack (see the sampling_profiler module).
+
+        The samples are written to profile_file (default: AppConfig.sampling_profile_file),
+        in the collapsed-stack format, when the profiler is stopped or when the app exits.
+        """
+        if self._sampling_profiler and self._sampling_profiler.running():
+            return
+        from app.helpers.sampling_profiler import SamplingProfiler
+
+        if profile_file:
+            self._config.sampling_profile_file = Path(profile_file)
+        self._sampling_profiler = SamplingProfiler(interval=interval or self._config.sampling_interval)
+        self._sampling_profiler.start()
+        atexit.register(self.stop_sampling_profiler)
+
+    def stop_sampling_profiler(self) -> Path:
+        """Stops the sampling profiler and writes its samples. Returns the profile file, or None."""
+        if not (self._sampling_profiler and self._sampling_profiler.running()):
+            return None
+        atexit.unregister(self.stop_sampling_profiler)
+        self._sampling_profiler.stop()
+        profile_file = self._config.sampling_profile_file
+        try:
+            self._sampling_profiler.write_collapsed(profile_file)
+        except OSError as e:
+            logger.error(f"Failed to write sampling profile {profile_file}: {e}")
+            return None
+        return profile_file
+
+    def toggle_sampling_profiler(self):
+        """Starts or stops the sampling profiler (hidden option 'S' of the main menu)."""
+        if self._sampling_profiler and self._sampling_profiler.running():
+            profiler = self._sampling_profiler
+            if profile_file := self.stop_sampling_profiler():
+                self.status.notify_success(
+                    f"Sampling profiler stopped: {profiler.samples} samples written to {profile_file} "
+                    + f"(overhead {100 * profiler.overhead():.2f}%)."
+                )
+            else:
+                self.status.notify_failure("Sampling profiler stopped: failed to write the samples.")
+        else:
+            self.start_sampling_profiler()
+            self.status.notify_success(
+                f"Sampling profiler started (every {1000 * self._sampling_profiler.interval:g} ms)."
+            )
+
+    def instrumentation_report(self):
+        """Displays the timings recorded so far."""
+        if not self._instrumentation:
+            return
+        self.view(BaseView(cmd_manager=self, title="Performance report", text=self._instrumentation.report()))
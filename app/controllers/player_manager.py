@@ -1,5 +1,7 @@
 from datetime import date
 from app.models.player_model import PlayerRepository, Player
+from app.models.tournament_model import TournamentRepository
+from app.models.rating_model import RatingUpdater, throughput
 from app.controllers.controller_abc import BaseController, MainController
 from app.commands import commands_abc, commands
 from app.views.menu import Menu, MenuOption
@@ -54,11 +56,24 @@ class UpdatePlayerDataCommand(commands.LaunchManagerCommand):
         )
 
 
+class RebuildRatingsCommand(commands.LaunchManagerCommand):
+    def __init__(self, app: commands_abc.CommandManagerInterface) -> None:
+        super().__init__(
+            app=app, cls_or_obj=PlayerManager, method=PlayerManager.rebuild_ratings
+        )
+
+
 class PlayerManager(BaseController):
-    def __init__(self, player_repo: PlayerRepository, app: MainController):
+    def __init__(
+        self,
+        player_repo: PlayerRepository,
+        app: MainController,
+        tournament_repo: TournamentRepository = None,
+    ):
         super().__init__()
         self.main_app: MainController = app
         self.player_repo: PlayerRepository = player_repo
+        self.tournament_repo: TournamentRepository = tournament_repo
 
     def default(self):
         """Launches the player manager: display the menu."""
@@ -87,6 +102,12 @@ class PlayerManager(BaseController):
                 command=ListAllPlayersCommand(app=self.main_app),
             )
         )
+        menu.add_option(
+            MenuOption(
+                option_text="Rebuild player ratings",
+                command=RebuildRatingsCommand(app=self.main_app),
+            )
+        )
         menu.add_option(
             MenuOption(
                 option_text="Return to previous menu",
@@ -140,9 +161,11 @@ class PlayerManager(BaseController):
         self.main_app.view(editor)
 
     def add_new_player(
-        self, national_player_id: str, name: str, surname: str, birthdate: date
+        self, national_player_id: str, name: str, surname: str, birthdate: date, rating: float = None
     ) -> bool:
-        """Register a new player to the database"""
+        """Register a new player to the database.
+        New players are not rated: their rating is computed from the tournaments they play.
+        """
         try:
             player = Player(
                 national_player_id=national_player_id,
@@ -174,7 +197,13 @@ class PlayerManager(BaseController):
         return False
 
     def update_player(
-        self, player_id: str, national_player_id: str, name: str, surname: str, birthdate: date
+        self,
+        player_id: str,
+        national_player_id: str,
+        name: str,
+        surname: str,
+        birthdate: date,
+        rating: float = None,
     ) -> bool:
         """Updates an existing player in the database.
 
@@ -187,6 +216,7 @@ class PlayerManager(BaseController):
         - If nothing has changed, send a notificaiton to the user and return.
         - For the moment, changing the National player ID is not allowed.
         - In all other cases update the existing player data in the repository.
+        The rating can't be edited: the current rating is kept.
         Notify user and returns True on success.
         """
         player_data = self.player_repo.find_by_id(player_id) if player_id is not None else None
@@ -194,7 +224,11 @@ class PlayerManager(BaseController):
             self.add_new_player(national_player_id, name, surname, birthdate)
         try:
             new_player_data = Player(
-                national_player_id, surname=surname, name=name, birthdate=birthdate
+                national_player_id,
+                surname=surname,
+                name=name,
+                birthdate=birthdate,
+                rating=player_data.rating if player_data else None,
             )
 
             if player_data == new_player_data:
@@ -231,3 +265,18 @@ class PlayerManager(BaseController):
         player_list.sort(key=lambda x: (x.surname.lower() + x.name.lower()))
         view = PlayerListView(player_list=[p.asdict() for p in player_list])
         self.main_app.view(view)
+
+    def rebuild_ratings(self):
+        """Recomputes the ratings of all players from the tournament archive."""
+        if not self.tournament_repo:
+            self.status.notify_failure("Can't rebuild ratings: no tournament repository.")
+            return
+        try:
+            match_count, duration = RatingUpdater(self.tournament_repo).rebuild()
+            self.status.notify_success(
+                f"Rebuilt player ratings from {match_count} matches in {duration:.2f}s"
+                + f" ({throughput(match_count, duration):.0f} matches/s)"
+            )
+        except Exception as e:
+            logger.exception(e)
+            self.status.notify_failure(f"Failed to rebuild player ratings: {e}")
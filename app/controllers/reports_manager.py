@@ -9,16 +9,34 @@ from app.commands.commands import (
 from app.views.menu import Menu, MenuOption
 from app.models.player_model import PlayerRepository
 from app.models.tournament_model import TournamentRepository
+from app.models.active_tournaments import ActiveTournaments
+from app.models.head_to_head import HeadToHeadIndex
 from app.controllers import player_manager, tournament_manager
-from app.views.reports.tournament_reports import TournamentReportView, ExportToHTMLDialog
-from app.views.html.reports import html_reports
-from app.views.html.base_html import HTMLBaseView
+from app.views.reports.tournament_reports import (
+    TournamentReportView,
+    ExportToHTMLDialog,
+    HeadToHeadForm,
+    HeadToHeadView,
+)
+from app.helpers.tracing import span
 from pathlib import Path
+from types import ModuleType
+from typing import TYPE_CHECKING
 import logging
 
+if TYPE_CHECKING:
+    from app.views.html.base_html import HTMLBaseView
+
 logger = logging.getLogger()
 
 
+def _html_reports() -> ModuleType:
+    """Returns the HTML report views module, imported on first export (it depends on yattag)."""
+    from app.views.html.reports import html_reports
+
+    return html_reports
+
+
 class TournamentReportCommand(LaunchManagerCommand):
     def __init__(self, app: CommandManagerInterface,
                  tournament_id: str = None,
@@ -89,6 +107,19 @@ class TournamentParticipantsReportCommand(LaunchManagerCommand):
                          export_to=export_to)
 
 
+class HeadToHeadReportCommand(LaunchManagerCommand):
+    def __init__(self,
+                 app: CommandManagerInterface = None,
+                 player1_id: str = None,
+                 player2_id: str = None
+                 ) -> None:
+        super().__init__(app=app,
+                         cls_or_obj=ReportsManager,
+                         method=ReportsManager.head_to_head_report,
+                         player1_id=player1_id,
+                         player2_id=player2_id)
+
+
 class ExportToHTMLCommand(LaunchManagerCommand):
     def __init__(self,
                  app: CommandManagerInterface,
@@ -116,10 +147,16 @@ class ReportsManager(tournament_manager.TournamentManagerBase):
         player_repo: PlayerRepository,
         tournament_repo: TournamentRepository,
         main_app: MainController,
+        active_tournaments: ActiveTournaments = None,
+        head_to_head_index: HeadToHeadIndex = None,
     ):
         super().__init__(
-            player_repo=player_repo, tournament_repo=tournament_repo, main_app=main_app
+            player_repo=player_repo,
+            tournament_repo=tournament_repo,
+            main_app=main_app,
+            active_tournaments=active_tournaments,
         )
+        self.head_to_head_index: HeadToHeadIndex = head_to_head_index
 
     def default(self):
         """Launches the Reports manager: display the menu."""
@@ -170,6 +207,13 @@ class ReportsManager(tournament_manager.TournamentManagerBase):
                     )
             )
         )
+        if self.head_to_head_index is not None:
+            menu.add_option(
+                MenuOption(
+                    option_text="Head-to-head record",
+                    command=HeadToHeadReportCommand(app=self.main_app),
+                )
+            )
         menu.add_option(
             MenuOption(
                 option_text="Return to previous menu",
@@ -203,7 +247,7 @@ class ReportsManager(tournament_manager.TournamentManagerBase):
                 tournaments = self.tournament_repo.list_tournament_meta()
                 tournaments.sort(key=lambda x: x.start_date)
                 data = [m.asdict() for m in tournaments]
-                v = html_reports.TournamentListHTML(
+                v = _html_reports().TournamentListHTML(
                     title="All Tournaments",
                     tournament_list=data,
                     cmd_manager=self.main_app,
@@ -211,7 +255,7 @@ class ReportsManager(tournament_manager.TournamentManagerBase):
                 )
                 # also export the CSS
                 self._set_html_view_css(v, export_to)
-                with RenderToFileContext(ofile=Path(export_to)):
+                with span("view render_html", view=v.__class__.__name__), RenderToFileContext(ofile=Path(export_to)):
                     v.render()
                 self.status.notify_success(f"Wrote report to {export_to}")
             except Exception as e:
@@ -242,7 +286,7 @@ class ReportsManager(tournament_manager.TournamentManagerBase):
             try:
                 player_data = [p.asdict() for p in self.player_repo.list_all()]
                 player_data.sort(key=lambda x: x.get("surname", "").upper() + x.get("name", "").upper())
-                v = html_reports.PlayersReportHTML(
+                v = _html_reports().PlayersReportHTML(
                     title="Players List",
                     player_list=player_data,
                     cmd_manager=self.main_app,
@@ -250,7 +294,7 @@ class ReportsManager(tournament_manager.TournamentManagerBase):
                 )
                 # also export the CSS
                 self._set_html_view_css(v, export_to)
-                with RenderToFileContext(ofile=Path(export_to)):
+                with span("view render_html", view=v.__class__.__name__), RenderToFileContext(ofile=Path(export_to)):
                     v.render()
                 self.status.notify_success(f"Wrote report to {export_to}")
             except Exception as e:
@@ -291,7 +335,7 @@ class ReportsManager(tournament_manager.TournamentManagerBase):
             try:
                 tournament = self._get_tournament(tournament_id=tournament_id, use_current=False)
 
-                v = html_reports.TournamentInfoHTML(
+                v = _html_reports().TournamentInfoHTML(
                     title="Tournament Info",
                     tournament_data=tournament.metadata.asdict(),
                     cmd_manager=self.main_app,
@@ -299,7 +343,7 @@ class ReportsManager(tournament_manager.TournamentManagerBase):
                 )
                 # also export the CSS
                 self._set_html_view_css(v, export_to)
-                with RenderToFileContext(ofile=Path(export_to)):
+                with span("view render_html", view=v.__class__.__name__), RenderToFileContext(ofile=Path(export_to)):
                     v.render()
                 self.status.notify_success(f"Wrote report to {export_to}")
             except Exception as e:
@@ -341,11 +385,11 @@ class ReportsManager(tournament_manager.TournamentManagerBase):
             #
             # Produce the html view and write to file
             try:
-                tournament = self._get_tournament(tournament_id=tournament_id, use_current=False)
+                tournament = self._get_tournament(tournament_id=tournament_id, use_current=False).snapshot()
                 player_data = [p.asdict() for p in tournament.participants]
                 player_data.sort(key=lambda x: x.get("surname", "").upper() + x.get("name", "").upper())
                 title = f"Registered Players - tournament in {tournament.metadata.location}"
-                v = html_reports.PlayersReportHTML(
+                v = _html_reports().PlayersReportHTML(
                     title=title,
                     player_list=player_data,
                     cmd_manager=self.main_app,
@@ -353,7 +397,7 @@ class ReportsManager(tournament_manager.TournamentManagerBase):
                 )
                 # also export the CSS
                 self._set_html_view_css(v, export_to)
-                with RenderToFileContext(ofile=Path(export_to)):
+                with span("view render_html", view=v.__class__.__name__), RenderToFileContext(ofile=Path(export_to)):
                     v.render()
                 self.status.notify_success(f"Wrote report to {export_to}")
             except Exception as e:
@@ -392,17 +436,11 @@ class ReportsManager(tournament_manager.TournamentManagerBase):
         tournament = self._get_tournament(tournament_id)
         if not tournament:
             return
-        ranking_data = []
-        for player in tournament.participants:
-            ranking_data.append((
-                    tournament.player_rank(player.id()),
-                    player.asdict(),
-                    tournament.player_score(player.id())
-                ))
-        ranking_data.sort(key=lambda x: x[0])
+        # read an immutable snapshot: results may be entered while the report is produced
+        tournament = tournament.snapshot()
         tournament_data = {
             "metadata": tournament.metadata.asdict(),
-            "ranking_list": ranking_data,
+            "ranking_list": self._ranking_data(tournament),
             "rounds": []
         }
         if tournament.has_started():
@@ -415,7 +453,7 @@ class ReportsManager(tournament_manager.TournamentManagerBase):
             # Produce the html view and write to file
             try:
                 title = f"Tournament in {tournament.metadata.location}"
-                v = html_reports.TournamentReportHTML(
+                v = _html_reports().TournamentReportHTML(
                     title=title,
                     tournament_data=tournament_data,
                     cmd_manager=self.main_app,
@@ -423,7 +461,7 @@ class ReportsManager(tournament_manager.TournamentManagerBase):
                 )
                 # also export the CSS
                 self._set_html_view_css(v, export_to)
-                with RenderToFileContext(ofile=Path(export_to)):
+                with span("view render_html", view=v.__class__.__name__), RenderToFileContext(ofile=Path(export_to)):
                     v.render()
                 self.status.notify_success(f"Wrote report to {export_to}")
             except Exception as e:
@@ -444,7 +482,38 @@ class ReportsManager(tournament_manager.TournamentManagerBase):
             v = TournamentReportView(tournament_data=tournament_data)
             self.main_app.view(v)
 
-    def _set_html_view_css(self, view: HTMLBaseView, dest_view_path: Path) -> bool:
+    def head_to_head_report(self, player1_id: str = None, player2_id: str = None):
+        """Displays the record of a player against another one, across all tournaments."""
+        if self.head_to_head_index is None:
+            self.status.notify_failure("The head-to-head index is not available.")
+            return
+        if player1_id is None or player2_id is None:
+            form = HeadToHeadForm(cmd_manager=self.main_app,
+                                  confirm_cmd=HeadToHeadReportCommand(app=self.main_app))
+            self.main_app.view(form)
+            return
+        try:
+            record_data = self.head_to_head_index.record(player1_id, player2_id).asdict()
+            for key, player_id in (("player", player1_id), ("opponent", player2_id)):
+                if player := self.player_repo.find_by_id(player_id):
+                    record_data[key] = player.asdict()
+            meetings_data = []
+            for meeting in self.head_to_head_index.list_meetings(player1_id, player2_id):
+                meta = self.tournament_repo.find_tournament_metadata_by_id(meeting["tournament_id"])
+                meetings_data.append({
+                    "date": meeting["date"],
+                    "tournament": (meta.description or meta.location) if meta else meeting["tournament_id"],
+                    "round": meeting["round_idx"] + 1,
+                    "score": meeting["score"],
+                })
+        except Exception as e:
+            logger.error(e)
+            self.status.notify_failure(f"Can't display the head-to-head record: {e}")
+            return
+        v = HeadToHeadView(record_data=record_data, meetings_data=meetings_data, cmd_manager=self.main_app)
+        self.main_app.view(v)
+
+    def _set_html_view_css(self, view: "HTMLBaseView", dest_view_path: Path) -> bool:
         """Adds a link to a css stylesheet in a view, and exports the css
         file to the folder where the view should be exported.
         """
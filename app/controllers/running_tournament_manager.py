@@ -1,9 +1,12 @@
-from datetime import datetime
+from datetime import date, datetime
 from app.commands import commands
 from app.commands.commands_abc import CommandInterface
 from app.controllers.controller_abc import MainController
 from app.models.player_model import PlayerRepository
-from app.models.tournament_model import TournamentRepository, Match
+from app.models.tournament_model import TournamentRepository, Tournament, Round, Match
+from app.models.rating_model import RatingUpdater
+from app.models.active_tournaments import ActiveTournaments
+from app.models.head_to_head import HeadToHeadIndex
 from app.controllers import tournament_manager
 from app.views.menu import Menu, MenuOption
 from app.views.tournament.running_tournament import (
@@ -12,8 +15,10 @@ from app.views.tournament.running_tournament import (
     SelectMatchForm,
     StartMatchForm,
     EndMatchForm,
+    EndMatchesForm,
     RankingView,
-    SelectRoundForm
+    SelectRoundForm,
+    ProjectionView,
 )
 from app.helpers.string_formatters import formatdate
 import logging
@@ -104,6 +109,24 @@ class EndMatchCommand(commands.LaunchManagerCommand):
         )
 
 
+class EndMatchesCommand(commands.LaunchManagerCommand):
+    def __init__(
+        self,
+        app: commands.CommandManagerInterface,
+        results: list[dict] = None,
+        end_time: datetime = None,
+        tournament_id: str = None,
+    ) -> None:
+        super().__init__(
+            app,
+            cls_or_obj=RunningTournamentManager,
+            method=RunningTournamentManager.end_matches,
+            results=results,
+            end_time=end_time,
+            tournament_id=tournament_id,
+        )
+
+
 class DisplayRankingListCommand(commands.LaunchManagerCommand):
     def __init__(self, app: commands.CommandManagerInterface,
                  title: str = None,
@@ -117,6 +140,15 @@ class DisplayRankingListCommand(commands.LaunchManagerCommand):
                          tournament_id=tournament_id)
 
 
+class DisplayProjectionCommand(commands.LaunchManagerCommand):
+    def __init__(self, app: commands.CommandManagerInterface,
+                 tournament_id: str = None) -> None:
+        super().__init__(app=app,
+                         cls_or_obj=RunningTournamentManager,
+                         method=RunningTournamentManager.display_projection,
+                         tournament_id=tournament_id)
+
+
 class ViewRoundInfoCommand(commands.LaunchManagerCommand):
     def __init__(self, app: commands.CommandManagerInterface,
                  round_idx: int,
@@ -136,10 +168,21 @@ class RunningTournamentManager(tournament_manager.TournamentManagerBase):
         player_repo: PlayerRepository,
         tournament_repo: TournamentRepository,
         main_app: MainController,
+        active_tournaments: ActiveTournaments = None,
+        head_to_head_index: HeadToHeadIndex = None,
+        season_start: date = None,
     ):
+        """- head_to_head_index: when set, ended matches are recorded in the index,
+        and pairings avoid the players who already met in other tournaments since season_start.
+        """
         super().__init__(
-            player_repo=player_repo, tournament_repo=tournament_repo, main_app=main_app
+            player_repo=player_repo,
+            tournament_repo=tournament_repo,
+            main_app=main_app,
+            active_tournaments=active_tournaments,
         )
+        self.head_to_head_index: HeadToHeadIndex = head_to_head_index
+        self.season_start: date = season_start
 
     def default(self):
         """Launches the player manager: display the menu."""
@@ -209,6 +252,14 @@ class RunningTournamentManager(tournament_manager.TournamentManagerBase):
                         command=ListMatchesCommand(app=self.main_app),
                     )
                 )
+                menu.add_option(
+                    MenuOption(
+                        option_text="Standings projection",
+                        command=DisplayProjectionCommand(
+                            app=self.main_app,
+                            tournament_id=current_tournament.id()),
+                    )
+                )
                 if current_tournament.has_pending_matches():
                     menu.add_option(
                         MenuOption(
@@ -234,6 +285,16 @@ class RunningTournamentManager(tournament_manager.TournamentManagerBase):
                             )
                         )
                     )
+                    menu.add_option(
+                        MenuOption(
+                            option_text="End several matches",
+                            command=EndMatchesCommand(
+                                app=self.main_app,
+                                results=None,
+                                tournament_id=current_tournament.id()
+                            )
+                        )
+                    )
             menu.add_option(
                 MenuOption(
                     option_text="Edit tournament info",
@@ -276,6 +337,9 @@ class RunningTournamentManager(tournament_manager.TournamentManagerBase):
     def start_next_round(self):
         tournament = self._curr_tournament()
         try:
+            if self.head_to_head_index is not None:
+                index, tid, since = self.head_to_head_index, tournament.id(), self.season_start
+                tournament.past_meetings = lambda p1, p2: index.meetings(p1, p2, since=since, exclude_tournament=tid)
             new_round = tournament.start_next_round()
             self.tournament_repo.store_tournament(tournament)
             self.status.notify_success(f"Round {new_round.name} has started !")
@@ -388,23 +452,98 @@ class RunningTournamentManager(tournament_manager.TournamentManagerBase):
                     success_str += f"\n  {results[0][0]}: {results[0][1]}"
                     success_str += f"\n  {results[1][0]}: {results[1][1]}\n"
                     self.status.notify_success(success_str)
-                    if round.has_ended():
-                        title = "Final Ranks and Scores" if tournament.has_ended() else "Current Ranks and Scores"
-                        text = f"Completed: {round.name}"
-                        if not tournament.has_ended():
-                            remaining_rounds = tournament.metadata.round_count - tournament.current_round_idx - 1
-                            text += f" ({remaining_rounds} round{"s" if remaining_rounds > 1 else ""} to go)"
-                        self.main_app.receive(DisplayRankingListCommand(app=self.main_app,
-                                                                        title=title,
-                                                                        text=text,
-                                                                        tournament_id=tournament.id()))
-                        return
+                    self._after_matches_ended(tournament, round, [match_idx])
                 else:
                     raise Exception("Failed to start match for an unexpected reason.")
         except Exception as e:
             logger.error(e)
             self.status.notify_failure(f"Can't start match {match_idx+1}: {e}")
 
+    def end_matches(
+        self,
+        results: list[dict] = None,
+        end_time: datetime = None,
+        tournament_id: str = None,
+    ):
+        """Ends several matches of the current round at once, and stores the tournament once.
+
+        results lists the outcome of each match, as dicts with a match_idx, winner_id and (optional) end_time.
+        end_time is the default end time of the matches.
+        """
+        tournament_id = tournament_id or self._curr_tournament_id()
+        tournament = self._get_tournament(tournament_id)
+        if not tournament:
+            logger.error(f"Tournament not found: id={tournament_id}")
+            return
+        if results is None:
+            logger.debug("Match results are required, redirect to the batch form")
+            form = EndMatchesForm(
+                cmd_manager=self.main_app,
+                running_matches_data=self._match_data(tournament.running_matches()),
+                confirm_cmd=EndMatchesCommand(
+                    app=self.main_app, tournament_id=tournament.id()
+                ),
+            )
+            self.main_app.view(form)
+            return
+        logger.debug(f"Ending {len(results)} matches")
+        try:
+            round = tournament.current_round()
+            match_results = []
+            for result in results:
+                match_idx = int(result["match_idx"])
+                winner_id = result.get("winner_id")
+                # winner_id might be a code used in scripts
+                if winner_id == "_player1_":
+                    winner_id = round.matches[match_idx].player1().id()
+                elif winner_id == "_player2_":
+                    winner_id = round.matches[match_idx].player2().id()
+                match_end_time = result.get("end_time") or end_time
+                if isinstance(match_end_time, str):
+                    match_end_time = datetime.fromisoformat(match_end_time)
+                match_results.append((match_idx, winner_id, match_end_time))
+            tournament.end_matches(match_results)
+            if self.tournament_repo.store_tournament(tournament):
+                self.status.notify_success(f"Ended {len(match_results)} matches.")
+                self._after_matches_ended(tournament, round, [match_idx for match_idx, _, _ in match_results])
+            else:
+                raise Exception("Failed to end matches for an unexpected reason.")
+        except Exception as e:
+            logger.error(e)
+            self.status.notify_failure(f"Can't end matches: {e}")
+
+    def _after_matches_ended(self, tournament: Tournament, round: Round, match_indexes: list[int]):
+        """Records the ended matches in the head-to-head index, updates player ratings when the tournament has ended,
+        and displays the ranking list when the round has ended."""
+        self._record_head_to_head(tournament, round, match_indexes)
+        if tournament.has_ended():
+            RatingUpdater(self.tournament_repo).update(tournament)
+        if round.has_ended():
+            title = "Final Ranks and Scores" if tournament.has_ended() else "Current Ranks and Scores"
+            text = f"Completed: {round.name}"
+            if not tournament.has_ended():
+                remaining_rounds = tournament.metadata.round_count - tournament.current_round_idx - 1
+                text += f" ({remaining_rounds} round{"s" if remaining_rounds > 1 else ""} to go)"
+            self.main_app.receive(DisplayRankingListCommand(app=self.main_app,
+                                                            title=title,
+                                                            text=text,
+                                                            tournament_id=tournament.id()))
+
+    def _record_head_to_head(self, tournament: Tournament, round: Round, match_indexes: list[int]):
+        """Records the ended matches in the head-to-head index.
+
+        The index is committed after each call: in batch mode, the write is deferred to the unit of work.
+        """
+        if self.head_to_head_index is None:
+            return
+        try:
+            round_idx = next(i for i, r in enumerate(tournament.rounds) if r is round)
+            for match_idx in match_indexes:
+                self.head_to_head_index.record_match(tournament.id(), round_idx, match_idx, round.matches[match_idx])
+            self.head_to_head_index.commit_changes()
+        except Exception as e:
+            logger.error(f"Failed to update the head-to-head index: {e}")
+
     def select_match(
         self,
         match_idx: int,
@@ -506,31 +645,46 @@ class RunningTournamentManager(tournament_manager.TournamentManagerBase):
         tournament = self._get_tournament(tournament_id or self._curr_tournament_id())
         if not tournament:
             return
+        tournament = tournament.snapshot()
         if not title:
             tournament_date = formatdate(d=tournament.start_date(), fmt="%d/%m/%Y")
             title = f"Tournament at {tournament.metadata.location}, {tournament_date}"
             title += " - Scores and Ranks"
         text = text or tournament.metadata.description
-        ranking_data = []
-        for player in tournament.participants:
-            ranking_data.append((
-                    tournament.player_rank(player.id()),
-                    player.asdict(),
-                    tournament.player_score(player.id())
-                ))
-        ranking_data.sort(key=lambda x: x[0] or 0)
         v = RankingView(cmd_manager=self.main_app,
-                        rank_data=ranking_data,
+                        rank_data=self._ranking_data(tournament),
                         title=title,
                         text=text)
         self.main_app.view(v)
 
+    def display_projection(self, tournament_id: str = None):
+        """Displays the range of final ranks each participant can still reach,
+        given the matches remaining in the current round.
+        """
+        tournament = self._get_tournament(tournament_id or self._curr_tournament_id())
+        if not tournament:
+            return
+        if tournament.status() != "running":
+            self.status.notify_warning("Projections are only available for running tournaments.")
+            return
+        projection = tournament.project_standings()
+        participants = {p.id(): p for p in tournament.participants}
+        v = ProjectionView(cmd_manager=self.main_app,
+                           projection_data=[(participants[p.player_id].asdict(), p.asdict())
+                                            for p in projection.players],
+                           remaining_matches=projection.remaining_matches,
+                           exact=projection.exact,
+                           rounds_left=projection.rounds_left,
+                           title=f"{tournament.current_round().name} - Standings projection")
+        self.main_app.view(v)
+
     def view_round_info(self, round_idx: int = None, tournament_id: str = None):
         """Display match details of a round
         """
         tournament = self._get_tournament(tournament_id or self._curr_tournament_id())
         if not tournament:
             return
+        tournament = tournament.snapshot()
         if round_idx is None:
             # round_idx is required, prompt the user
             round_map = {}
@@ -0,0 +1,115 @@
+"""Parallel execution of independent scripts.
+
+Each script runs headless (see ChessclubApp.run_batch()) in a worker process, against a private copy
+of the shared data files (players, tournament index and head-to-head index). The changes made by each script
+are sent back to the main process, where a single DataWriter applies them to the shared data files.
+
+Scripts must be independent: each one works on its own tournament(s). Scripts that other scripts depend on
+(for instance, the creation of the player database) must run before, sequentially.
+The changes of a script that conflict with the changes of a previous script are rejected (see the data_writer
+module). Scripts may share players: when tournaments end, the player ratings are recomputed after the merge.
+"""
+
+from app.adapters.data_writer import DataChanges, DataConflictError, DataWriter, collect_changes, read_json
+from app.controllers.chessclubapp import AppConfig, AssetLoader, ChessclubApp
+from app.models.rating_model import RatingUpdater
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+import io
+import logging
+import shutil
+import tempfile
+import time
+
+logger = logging.getLogger()
+
+
+@dataclass
+class ScriptResult:
+    """Outcome of a script run in a worker process."""
+
+    script_file: str
+    executed: int = 0
+    elapsed: float = 0.0
+    changes: DataChanges = field(default_factory=DataChanges)
+    output: str = ""
+    error: str = None
+
+
+def run_script(script_file: str, cfg: AppConfig, flush_every: int = 0) -> ScriptResult:
+    """Runs a script headless against a private copy of the data files, and collects its changes."""
+    start = time.perf_counter()
+    result = ScriptResult(script_file=str(script_file))
+    with tempfile.TemporaryDirectory() as scratch_dir:
+        scratch_cfg = replace(
+            cfg,
+            player_repository_file=Path(scratch_dir, "players.json"),
+            tournament_data_dir=Path(scratch_dir, "tournaments"),
+            tournament_repository_file=Path(scratch_dir, "tournaments", "tournament_index.json"),
+            head_to_head_file=Path(scratch_dir, "head_to_head.json"),
+        )
+        scratch_cfg.tournament_data_dir.mkdir(mode=0o777, parents=True, exist_ok=True)
+        before = {}
+        for key, src, dest in (
+            ("players", cfg.player_repository_file, scratch_cfg.player_repository_file),
+            ("tournaments", cfg.tournament_repository_file, scratch_cfg.tournament_repository_file),
+            ("head_to_head", cfg.head_to_head_file, scratch_cfg.head_to_head_file),
+        ):
+            if Path(src).exists():
+                shutil.copyfile(src, dest)
+            before[key] = read_json(dest)
+        output = io.StringIO()
+        try:
+            chessclub_app = ChessclubApp(config=scratch_cfg)
+            with redirect_stdout(output):
+                if script := chessclub_app.load_script_file(script_file):
+                    result.executed = chessclub_app.run_batch(script, flush_every=flush_every)
+            result.changes = collect_changes(
+                before,
+                scratch_cfg.player_repository_file,
+                scratch_cfg.tournament_repository_file,
+                scratch_cfg.head_to_head_file,
+            )
+        except BaseException as e:
+            logger.error(f"Script {script_file} failed: {e}", stack_info=True)
+            result.error = f"{e.__class__.__name__}: {e}"
+        result.output = output.getvalue()
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def run_scripts(
+    script_files: list[str], cfg: AppConfig = None, processes: int = None, flush_every: int = 0
+) -> list[ScriptResult]:
+    """Runs independent scripts in a pool of processes (one per CPU core by default).
+
+    The changes of the scripts are applied in the order of the script files, as soon as each script ends,
+    and written to the shared data files by the calling process only.
+    A script whose changes conflict with the changes of a previous script fails, and its changes are dropped.
+    When the scripts changed ratings, all ratings are then recomputed from the merged tournaments.
+    Returns the results in the order of the script files.
+    """
+    cfg = cfg or AppConfig()
+    # make sure the shared data files exist before the workers copy them
+    AssetLoader(cfg=cfg, app=None).load_head_to_head_index()
+    writer = DataWriter(cfg.player_repository_file, cfg.tournament_repository_file, cfg.head_to_head_file)
+    results = []
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(run_script, str(f), cfg, flush_every) for f in script_files]
+        for position, future in enumerate(futures, start=1):
+            result = future.result()
+            if result.error is None:
+                try:
+                    # the same script file may be run more than once: its runs are distinct sources
+                    writer.apply(result.changes, source=f"{result.script_file} (#{position})")
+                except DataConflictError as e:
+                    logger.error(e)
+                    result.error = str(e)
+            results.append(result)
+    writer.commit()
+    if writer.ratings_changed:
+        # each script rated its tournaments on its own copy of the players: rate them all again, together
+        RatingUpdater(AssetLoader(cfg=cfg, app=None).load_tournament_repository()).rebuild()
+    return results
@@ -1,7 +1,7 @@
 from datetime import date
 from app.commands import commands
 from app.controllers.controller_abc import BaseController, MainController
-from app.models.player_model import PlayerRepository
+from app.models.player_model import PlayerRepository, Player
 from app.models.tournament_model import (
     Match,
     Round,
@@ -9,6 +9,8 @@ from app.models.tournament_model import (
     Tournament,
     TournamentRepository
 )
+from app.models.snapshots import RoundSnapshot, TournamentSnapshot
+from app.models.active_tournaments import ActiveTournaments
 from app.views.views_abc import SimpleView
 from app.views.menu import Menu, MenuOption
 from app.views.tournament import tournament_views
@@ -48,6 +50,26 @@ class LoadTournamentCommand(commands.LaunchManagerCommand):
         )
 
 
+class SwitchTournamentCommand(commands.LaunchManagerCommand):
+    def __init__(self, app: commands.CommandManagerInterface, tournament_id: str = None) -> None:
+        super().__init__(
+            app=app,
+            cls_or_obj=TournamentManager,
+            method=TournamentManager.switch_tournament,
+            tournament_id=tournament_id,
+        )
+
+
+class CloseTournamentCommand(commands.LaunchManagerCommand):
+    def __init__(self, app: commands.CommandManagerInterface, tournament_id: str = None) -> None:
+        super().__init__(
+            app=app,
+            cls_or_obj=TournamentManager,
+            method=TournamentManager.close_tournament,
+            tournament_id=tournament_id,
+        )
+
+
 class SelectTournamentCommand(commands.LaunchManagerCommand):
     def __init__(
         self,
@@ -186,22 +208,37 @@ class TournamentInfoCommand(commands.LaunchManagerCommand):
 
 
 class TournamentManagerBase(BaseController):
-    """Manage Tournaments: create and run tournaments."""
+    """Manage Tournaments: create and run tournaments.
+
+    Tournaments loaded as current tournament stay active (loaded in memory) until closed:
+    see the active_tournaments module.
+    """
 
     def __init__(
         self,
         player_repo: PlayerRepository,
         tournament_repo: TournamentRepository,
         main_app: MainController,
+        active_tournaments: ActiveTournaments = None,
     ):
         super().__init__()
         self.main_app: MainController = main_app
         self.tournament_repo: TournamentRepository = tournament_repo
         self.player_repo: PlayerRepository = player_repo
+        # an empty registry is falsy: test for None, so that all managers share the same registry
+        self.active_tournaments: ActiveTournaments = (
+            active_tournaments if active_tournaments is not None else ActiveTournaments(tournament_repo)
+        )
 
     def _curr_tournament_id(self) -> str:
         return self.main_app.get_state("current_tournament_id")
 
+    def _set_curr_tournament(self, tournament_id: str) -> Tournament:
+        """Activates a tournament and sets it as current tournament."""
+        if tournament := self.active_tournaments.activate(tournament_id):
+            self.main_app.set_state("current_tournament_id", tournament_id)
+        return tournament
+
     def _curr_tournament_meta(self) -> TournamentMetaData:
         if curr_id := self._curr_tournament_id():
             return self.tournament_repo.find_tournament_metadata_by_id(curr_id)
@@ -215,9 +252,7 @@ class TournamentManagerBase(BaseController):
 
     def _curr_tournament(self) -> Tournament:
         if tournament_id := self._curr_tournament_id():
-            return self.tournament_repo.find_tournament_by_id(
-                tournament_id=tournament_id
-            )
+            return self.active_tournaments.get(tournament_id) or self.active_tournaments.activate(tournament_id)
         return None
 
     def _get_tournament(
@@ -236,7 +271,10 @@ class TournamentManagerBase(BaseController):
                 tournament_id = self._curr_tournament_id()
             if not tournament_id:
                 raise Exception("A tournament ID is required")
-            tournament = self.tournament_repo.find_tournament_by_id(tournament_id)
+            tournament = (
+                self.active_tournaments.get(tournament_id)
+                or self.tournament_repo.find_tournament_by_id(tournament_id)
+            )
             if not tournament:
                 raise Exception(f"Tournament not found: {tournament_id}")
         except Exception as e:
@@ -260,7 +298,24 @@ class TournamentManagerBase(BaseController):
             }
         return matches_data
 
-    def _tournament_round_data(self, round: Round) -> dict:
+    def _ranking_data(self, tournament: Tournament | TournamentSnapshot) -> list[tuple[int, dict, float, dict]]:
+        """Returns a view of a tournament's ranking list,
+        with the rank, player data, score and tie-break scores of each participant,
+        sorted by rank."""
+        participants = {p.id(): p for p in tournament.participants}
+        ranking_data = []
+        for player_id, rank, score in tournament.ranking_list():
+            if isinstance(player_id, Player):
+                player_id = player_id.id()
+            ranking_data.append((
+                rank,
+                participants[player_id].asdict(),
+                score,
+                tournament.tie_breaks(player_id).asdict()
+            ))
+        return ranking_data
+
+    def _tournament_round_data(self, round: Round | RoundSnapshot) -> dict:
         """Returns a dict containing a round's data"""
         round_data = {
             "name": round.name,
@@ -277,9 +332,13 @@ class TournamentManager(TournamentManagerBase):
         player_repo: PlayerRepository,
         tournament_repo: TournamentRepository,
         main_app: MainController,
+        active_tournaments: ActiveTournaments = None,
     ):
         super().__init__(
-            player_repo=player_repo, tournament_repo=tournament_repo, main_app=main_app
+            player_repo=player_repo,
+            tournament_repo=tournament_repo,
+            main_app=main_app,
+            active_tournaments=active_tournaments,
         )
 
     def default(self):
@@ -373,6 +432,21 @@ class TournamentManager(TournamentManagerBase):
                         ),
                     )
                 )
+            menu.add_option(
+                MenuOption(
+                    option_text="Close Current Tournament",
+                    command=CloseTournamentCommand(
+                        app=self.main_app, tournament_id=current_tournament_id
+                    ),
+                )
+            )
+        if len(self.active_tournaments) > 1:
+            menu.add_option(
+                MenuOption(
+                    option_text="Switch Active Tournament",
+                    command=SwitchTournamentCommand(app=self.main_app),
+                )
+            )
         menu.add_option(
             MenuOption(
                 option_text="Return to previous menu",
@@ -411,12 +485,55 @@ class TournamentManager(TournamentManagerBase):
                 self.status.notify_failure(msg)
                 return
             else:
-                self.main_app.set_state("current_tournament_id", tournament_id)
+                self._set_curr_tournament(tournament_id)
                 tournament_meta_str = self._tournament_meta_str(tournament.metadata)
                 self.status.notify_success(f"Tournament loaded: {tournament_meta_str}")
                 if confirm_cmd:
                     self.main_app.receive(confirm_cmd)
 
+    def switch_tournament(self, tournament_id: str = None):
+        """Sets an active tournament as current tournament, without loading anything."""
+        if not tournament_id:
+            memory_usage = self.active_tournaments.memory_usage()
+            tournament_list = [
+                {
+                    **t.metadata.asdict(),
+                    "memory_usage": memory_usage.get(t.id(), 0),
+                    "current": t.id() == self._curr_tournament_id(),
+                }
+                for t in self.active_tournaments.list_active()
+            ]
+            v = tournament_views.ActiveTournamentsView(
+                cmd_manager=self.main_app,
+                tournament_list=tournament_list,
+                confirm_cmd=SwitchTournamentCommand(app=self.main_app),
+            )
+            self.main_app.view(v)
+            return
+        try:
+            tournament = self.active_tournaments.switch(tournament_id)
+            self.main_app.set_state("current_tournament_id", tournament_id)
+            self.status.notify_success(f"Current tournament: {self._tournament_meta_str(tournament.metadata)}")
+        except KeyError as e:
+            logger.error(e)
+            self.status.notify_failure(f"Can't switch tournament: {e}")
+
+    def close_tournament(self, tournament_id: str = None):
+        """Releases an active tournament from memory.
+
+        When closing the current tournament, the last tournament activated becomes current.
+        """
+        tournament_id = tournament_id or self._curr_tournament_id()
+        if not self.active_tournaments.deactivate(tournament_id):
+            self.status.notify_warning(f"Tournament is not active: {tournament_id}")
+            return
+        if tournament_id == self._curr_tournament_id():
+            if self.active_tournaments.current_id:
+                self.main_app.set_state("current_tournament_id", self.active_tournaments.current_id)
+            else:
+                self.main_app.clear_state("current_tournament_id")
+        self.status.notify_success(f"Closed tournament {tournament_id}")
+
     def select_tournament(
         self, tournament_id: str = None, confirm_cmd: commands.CommandInterface = None
     ):
@@ -598,7 +715,7 @@ class TournamentManager(TournamentManagerBase):
             if self.tournament_repo.store_tournament(tournament):
                 t_str = self._tournament_meta_str(tournament.metadata)
                 self.status.notify_success(f"New tournament created: {t_str}")
-                self.main_app.set_state("current_tournament_id", tournament.id())
+                self._set_curr_tournament(tournament.id())
         except ValueError:
             self.status.notify_failure("Failed to store changes: invalid data.")
             return
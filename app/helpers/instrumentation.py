@@ -0,0 +1,139 @@
+"""Opt-in timing instrumentation of the app commands.
+
+Records, for each command class and each controller method launched by a command:
+wall time, CPU time and net allocated memory blocks, then reports counts, totals and percentiles.
+
+Optionally, each command is also run under cProfile, and its profile is written to a .prof file
+(to be read with pstats or snakeviz, for instance).
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+import cProfile
+import logging
+import math
+import sys
+import time
+
+logger = logging.getLogger()
+
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+@dataclass
+class TimingSamples:
+    """Measures of an instrumented operation."""
+
+    wall: list[float] = field(default_factory=list)
+    cpu: list[float] = field(default_factory=list)
+    blocks: list[int] = field(default_factory=list)
+
+    def add(self, wall: float, cpu: float, blocks: int):
+        self.wall.append(wall)
+        self.cpu.append(cpu)
+        self.blocks.append(blocks)
+
+    def summary(self) -> dict:
+        """Count, total and percentiles of wall time (in ms), mean CPU time (in ms) and mean allocated blocks."""
+        wall = sorted(self.wall)
+        count = len(wall)
+        data = {"count": count, "total_ms": 1000 * sum(wall)}
+        for q in PERCENTILES:
+            data[f"p{q}_ms"] = 1000 * percentile(wall, q)
+        data["cpu_ms"] = 1000 * sum(self.cpu) / count if count else 0.0
+        data["blocks"] = sum(self.blocks) / count if count else 0.0
+        return data
+
+
+class Instrumentation:
+    """Collects timings of commands (see ChessclubApp.dispatch()) and controller methods (see ChessclubApp.launch()).
+
+    - profile_dir: when set, each command runs under cProfile,
+      and its profile is written to <profile_dir>/<sequence>_<command class>.prof
+    """
+
+    def __init__(self, profile_dir: str | Path = None):
+        self.samples: dict[str, TimingSamples] = {}
+        self.profile_dir: Path = Path(profile_dir) if profile_dir else None
+        self._profiled: int = 0
+        if self.profile_dir:
+            self.profile_dir.mkdir(mode=0o777, parents=True, exist_ok=True)
+
+    @contextmanager
+    def measure(self, key: str):
+        """Measures the operation run in the context, and records it under key."""
+        blocks = sys.getallocatedblocks()
+        cpu = time.process_time()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start
+            samples = self.samples.setdefault(key, TimingSamples())
+            samples.add(wall, time.process_time() - cpu, sys.getallocatedblocks() - blocks)
+
+    @contextmanager
+    def command(self, cmd):
+        """Measures (and optionally profiles) the execution of a command."""
+        cmd_n = cmd.__class__.__name__
+        with self.measure(f"command {cmd_n}"):
+            if not self.profile_dir:
+                yield
+                return
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+                self._profiled += 1
+                prof_file = Path(self.profile_dir, f"{self._profiled:05d}_{cmd_n}.prof")
+                try:
+                    profiler.dump_stats(prof_file)
+                except OSError as e:
+                    logger.error(f"Failed to write profile {prof_file}: {e}")
+
+    def method(self, cls_n: str, method_n: str):
+        """Measures a controller method."""
+        return self.measure(f"method {cls_n}.{method_n}")
+
+    def report(self) -> str:
+        """Text report of all measures, slowest operations (by total time) first."""
+        summaries = sorted(
+            ((key, samples.summary()) for key, samples in self.samples.items()),
+            key=lambda x: x[1]["total_ms"],
+            reverse=True,
+        )
+        headers = ["operation", "count", "total ms"] + [f"p{q} ms" for q in PERCENTILES] + ["cpu ms", "blocks"]
+        rows = [headers]
+        for key, data in summaries:
+            rows.append(
+                [key, str(data["count"]), f"{data["total_ms"]:.2f}"]
+                + [f"{data[f"p{q}_ms"]:.2f}" for q in PERCENTILES]
+                + [f"{data["cpu_ms"]:.2f}", f"{data["blocks"]:.0f}"]
+            )
+        widths = [max(len(row[c]) for row in rows) for c in range(len(headers))]
+        lines = [
+            "  ".join(cell.ljust(w) if c == 0 else cell.rjust(w) for c, (cell, w) in enumerate(zip(row, widths)))
+            for row in rows
+        ]
+        lines.insert(1, "-" * len(lines[0]))
+        return "\n".join(lines)
+
+    def dump(self, report_file: str | Path = None):
+        """Writes the report to a file, or prints it."""
+        report = self.report()
+        if report_file:
+            with open(report_file, "w", encoding="utf8") as f:
+                f.write(report + "\n")
+        else:
+            print(report)
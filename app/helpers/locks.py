@@ -0,0 +1,72 @@
+"""Locking helpers.
+"""
+
+from contextlib import contextmanager
+from typing import Hashable, Iterator
+import threading
+
+
+class SharedExclusiveLock:
+    """A lock held either by any number of threads at once (shared mode), or by a single thread (exclusive mode).
+
+    Threads waiting for the exclusive mode have priority over new shared holders.
+    The thread holding the exclusive mode may enter either mode again. The shared mode is not reentrant.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._shared_holders = 0
+        self._exclusive_waiting = 0
+        self._exclusive_held = False
+        self._exclusive_owner: int = None
+
+    @contextmanager
+    def shared(self) -> Iterator[None]:
+        if self._exclusive_owner == threading.get_ident():
+            yield
+            return
+        with self._condition:
+            while self._exclusive_held or self._exclusive_waiting:
+                self._condition.wait()
+            self._shared_holders += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._shared_holders -= 1
+                if not self._shared_holders:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def exclusive(self) -> Iterator[None]:
+        if self._exclusive_owner == threading.get_ident():
+            yield
+            return
+        with self._condition:
+            self._exclusive_waiting += 1
+            while self._exclusive_held or self._shared_holders:
+                self._condition.wait()
+            self._exclusive_waiting -= 1
+            self._exclusive_held = True
+            self._exclusive_owner = threading.get_ident()
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._exclusive_owner = None
+                self._exclusive_held = False
+                self._condition.notify_all()
+
+
+class KeyedLocks:
+    """One lock per key, created on first use."""
+
+    def __init__(self):
+        self._guard = threading.Lock()
+        self._locks: dict[Hashable, threading.Lock] = {}
+
+    def __getitem__(self, key: Hashable) -> threading.Lock:
+        with self._guard:
+            if (lock := self._locks.get(key)) is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
@@ -0,0 +1,32 @@
+"""Memory accounting helpers.
+"""
+
+import gc
+import sys
+import types
+
+# Objects shared by the whole program, never accounted to a data structure.
+_SHARED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+def deep_sizeof(obj, exclude: tuple[type, ...] = ()) -> int:
+    """Returns the size in bytes of an object and of all the objects it references.
+
+    Objects of the exclude types (for instance, objects shared with other data structures)
+    are not accounted, and not traversed.
+    Each object is accounted once, even when referenced several times.
+    """
+    skip = _SHARED_TYPES + tuple(exclude)
+    seen: set[int] = set()
+    size = 0
+    pending = [obj]
+    while pending:
+        referents = []
+        for o in pending:
+            if isinstance(o, skip) or id(o) in seen:
+                continue
+            seen.add(id(o))
+            size += sys.getsizeof(o)
+            referents.append(o)
+        pending = gc.get_referents(*referents) if referents else []
+    return size
@@ -0,0 +1,106 @@
+"""Sampling profiler, for long app sessions.
+
+A background thread samples the stack of the profiled thread (the main thread by default)
+every interval seconds, through sys._current_frames(), and counts identical stacks.
+Unlike cProfile, the profiled code is not slowed down by each function call: the overhead only
+depends on the sampling rate (see SamplingProfiler.overhead()).
+
+Samples are written in the collapsed-stack format ("root;caller;callee count" lines),
+consumed by flamegraph tools (flamegraph.pl, speedscope, inferno, ...).
+"""
+
+from collections import Counter
+from pathlib import Path
+import logging
+import sys
+import threading
+import time
+
+logger = logging.getLogger()
+
+DEFAULT_INTERVAL = 0.01
+
+
+def frame_label(frame) -> str:
+    """Label of a stack frame: function qualified name, file name and first line of the function."""
+    code = frame.f_code
+    return f"{code.co_qualname} ({Path(code.co_filename).name}:{code.co_firstlineno})".replace(";", ",")
+
+
+class SamplingProfiler:
+    """Samples the stack of a thread from a background thread.
+
+    - interval: time between two samples, in seconds
+    - thread_id: identifier of the profiled thread (default: the main thread)
+    - max_depth: stacks are truncated to their max_depth innermost frames
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, thread_id: int = None, max_depth: int = 128):
+        self.interval: float = max(0.0001, float(interval))
+        self.thread_id: int = thread_id or threading.main_thread().ident
+        self.max_depth: int = max_depth
+        # stack (root first) => number of samples
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self.samples: int = 0
+        # time spent sampling, and time spent profiling, in seconds
+        self.sampling_time: float = 0.0
+        self.elapsed: float = 0.0
+        self._thread: threading.Thread = None
+        self._stop = threading.Event()
+        self._started_at: float = None
+
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        if self.running():
+            return
+        self._stop.clear()
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if not self.running():
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.elapsed += time.perf_counter() - self._started_at
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            start = time.perf_counter()
+            self.sample()
+            self.sampling_time += time.perf_counter() - start
+
+    def sample(self):
+        """Records the current stack of the profiled thread."""
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return
+        stack = []
+        while frame is not None and len(stack) < self.max_depth:
+            stack.append(frame_label(frame))
+            frame = frame.f_back
+        stack.reverse()
+        self.stacks[tuple(stack)] += 1
+        self.samples += 1
+
+    def overhead(self) -> float:
+        """Share of the profiling time spent sampling (the profiled thread waits for the GIL meanwhile)."""
+        elapsed = self.elapsed + (time.perf_counter() - self._started_at if self.running() else 0.0)
+        return self.sampling_time / elapsed if elapsed else 0.0
+
+    def collapsed(self) -> str:
+        """Samples in the collapsed-stack format, most frequent stacks first."""
+        return "\n".join(f"{";".join(stack)} {count}" for stack, count in self.stacks.most_common())
+
+    def write_collapsed(self, o_file: str | Path):
+        o_file = Path(o_file)
+        o_file.parent.mkdir(mode=0o777, parents=True, exist_ok=True)
+        with open(o_file, "w", encoding="utf8") as f:
+            f.write(self.collapsed() + "\n")
+        logger.debug(
+            f"Sampling profiler: {self.samples} samples written to {o_file} (overhead {100 * self.overhead():.2f}%)"
+        )
@@ -0,0 +1,174 @@
+"""Startup timing: where the time goes before the first menu shows up.
+
+Once enabled (as early as possible, see main.py), the startup timer records:
+  - the import time of each module imported from then on (self and cumulative time, like python -X importtime),
+  - the time spent in named load phases (app setup, repositories, ...),
+  - the time to the first view rendered by the app (the main menu, usually).
+
+The report compares the time to the first menu with a target (STARTUP_TARGET_MS).
+Modules imported before the timer is enabled (the standard library modules used by main.py) are not counted.
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+import importlib.abc
+import sys
+import threading
+import time
+
+# time-to-first-menu target, in milliseconds
+STARTUP_TARGET_MS = 250.0
+
+
+@dataclass
+class ImportTiming:
+    """Import time of a module, in seconds. Cumulative time includes the modules it imports."""
+
+    self_time: float = 0.0
+    cumulative: float = 0.0
+
+
+class _TimedLoader:
+    """Loader wrapper, timing the execution of the module."""
+
+    def __init__(self, loader, timer: "StartupTimer", name: str):
+        self._loader = loader
+        self._timer = timer
+        self._name = name
+
+    def __getattr__(self, attr: str):
+        return getattr(self._loader, attr)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        with self._timer.importing(self._name):
+            self._loader.exec_module(module)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    """Meta path finder wrapping the loaders found by the other finders with a _TimedLoader."""
+
+    def __init__(self, timer: "StartupTimer"):
+        self._timer = timer
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            if (spec := finder.find_spec(fullname, path, target)) is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, self._timer, fullname)
+                return spec
+        return None
+
+
+class StartupTimer:
+    """Records import and load times until the first view is rendered (see mark_first_view())."""
+
+    def __init__(self):
+        self.enabled: bool = False
+        self.origin: float = None
+        self.imports: dict[str, ImportTiming] = {}
+        self.phases: dict[str, float] = {}
+        # time to the first view, in seconds since the timer was enabled
+        self.first_view: float = None
+        self._finder: _TimingFinder = None
+        self._thread_id: int = None
+        # cumulative time of the imports nested in the module being imported
+        self._nested: list[float] = []
+
+    def enable(self):
+        """Starts timing, from now on."""
+        if self.enabled:
+            return
+        self.origin = time.perf_counter()
+        self._thread_id = threading.get_ident()
+        self._finder = _TimingFinder(self)
+        sys.meta_path.insert(0, self._finder)
+        self.enabled = True
+
+    def disable(self):
+        """Stops recording imports."""
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        self._finder = None
+        self.enabled = False
+
+    @contextmanager
+    def importing(self, name: str):
+        """Times the import of a module (imports from other threads are not recorded)."""
+        if not self.enabled or threading.get_ident() != self._thread_id:
+            yield
+            return
+        self._nested.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            cumulative = time.perf_counter() - start
+            nested = self._nested.pop()
+            if self._nested:
+                self._nested[-1] += cumulative
+            self.imports[name] = ImportTiming(self_time=cumulative - nested, cumulative=cumulative)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Times a load phase (phases with the same name add up)."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def mark_first_view(self) -> bool:
+        """Records the time to the first view, and stops timing.
+
+        Returns True the first time it is called while the timer is enabled.
+        """
+        if not self.enabled or self.first_view is not None:
+            return False
+        self.first_view = time.perf_counter() - self.origin
+        self.disable()
+        return True
+
+    def report(self, target_ms: float = STARTUP_TARGET_MS, top: int = 20) -> str:
+        """Text report: time to first menu, then load phases and the slowest imports (by cumulative time)."""
+        lines = []
+        if self.first_view is not None:
+            first_view_ms = 1000 * self.first_view
+            verdict = "OK" if first_view_ms <= target_ms else "over target"
+            lines.append(f"Time to first menu: {first_view_ms:.1f} ms (target: {target_ms:.0f} ms, {verdict})")
+        total = sum(t.self_time for t in self.imports.values())
+        lines.append(f"Imports: {1000 * total:.1f} ms ({len(self.imports)} modules)")
+        if self.phases:
+            lines.append("Load phases:")
+            width = max(len(name) for name in self.phases)
+            for name, elapsed in sorted(self.phases.items(), key=lambda x: x[1], reverse=True):
+                lines.append(f"  {name.ljust(width)}  {1000 * elapsed:8.1f} ms")
+        if self.imports:
+            slowest = sorted(self.imports.items(), key=lambda x: x[1].cumulative, reverse=True)[:top]
+            width = max(len(name) for name, _ in slowest)
+            lines.append(f"Slowest imports (top {len(slowest)}):")
+            lines.append(f"  {"module".ljust(width)}  {"self ms":>8}  {"cumul. ms":>9}")
+            for name, timing in slowest:
+                lines.append(f"  {name.ljust(width)}  {1000 * timing.self_time:8.1f}  {1000 * timing.cumulative:9.1f}")
+        return "\n".join(lines)
+
+    def dump(self, report_file: str | Path = None, target_ms: float = STARTUP_TARGET_MS):
+        """Writes the report to a file, or prints it."""
+        report = self.report(target_ms=target_ms)
+        if report_file:
+            with open(report_file, "w", encoding="utf8") as f:
+                f.write(report + "\n")
+        else:
+            print(report)
+
+
+# the app startup timer
+timer = StartupTimer()
@@ -104,25 +104,34 @@ def clear():
         _ = os.system("clear")
 
 
-if app.KEYBOARD_MODULE == "ansio":
-    # define alternative methods to promt for confirmation
-    import app.helpers.ansio_ui as ansio_ui
+def _keyboard_ui():
+    """Returns the module detecting keyboard events (see app.KEYBOARD_MODULE), or None if disabled.
 
-    proceed_any_key = ansio_ui.proceed_any_key
-    confirm = ansio_ui.confirm
-else:
-    # provide default functions
+    The keyboard module is only imported on first use, to keep the app startup fast.
+    """
+    if app.KEYBOARD_MODULE == "ansio":
+        import app.helpers.ansio_ui as ansio_ui
+
+        return ansio_ui
+    return None
+
+
+def proceed_any_key(msg: str = None, timeout: float = None):
+    """Waits for the user to proceed: any key with the keyboard module, enter otherwise."""
+    if keyboard_ui := _keyboard_ui():
+        return keyboard_ui.proceed_any_key(msg or "Press any key to proceed", timeout=timeout)
+    input(ansi.Formatter.format(msg or "Press enter to proceed", ansi.Formatter.CYAN))
 
-    def proceed_any_key(msg="Press enter to proceed", timeout: float = None):
-        """Default implementation of a proceed msg."""
-        input(ansi.Formatter.format(msg, ansi.Formatter.CYAN))
 
-    def confirm(msg="enter Y to confirm", timeout: float = None) -> bool:
-        """Prompts user to confirm an action y entering a specific key ('y').
+def confirm(msg: str = None, timeout: float = None) -> bool:
+    """Prompts user to confirm an action y entering a specific key ('y').
 
-        Returns True if user confirmed, False otherwise."""
-        confirm = input(ansi.Formatter.format(msg, ansi.Formatter.CYAN))
-        return confirm.upper() == "Y"
+    With the keyboard module, a key press is enough.
+    Returns True if user confirmed, False otherwise."""
+    if keyboard_ui := _keyboard_ui():
+        return keyboard_ui.confirm(msg or "press Y to confirm", timeout=timeout)
+    confirm = input(ansi.Formatter.format(msg or "enter Y to confirm", ansi.Formatter.CYAN))
+    return confirm.upper() == "Y"
 
 
 def format_table(
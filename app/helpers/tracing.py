@@ -0,0 +1,165 @@
+"""Lightweight tracing: nested, timed spans across the app layers.
+
+Tracing is disabled by default: spans then cost a flag check.
+Once enabled (see enable()), each span records its name, parent span, thread, start time, duration
+and some attributes. Recorded spans are exported as JSON lines (export_jsonl()),
+or in the Chrome trace-event format (export_chrome()), to be viewed in chrome://tracing or Perfetto.
+
+Usage:
+
+    with span("store tournament", tournament_id=tid):
+        ...
+
+    @traced("load tournament")
+    def load_tournament(self, tournament_id):
+        ...
+"""
+
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from functools import wraps
+from pathlib import Path
+from typing import Callable
+import itertools
+import json
+import os
+import threading
+import time
+
+
+@dataclass(slots=True)
+class Span:
+    """A timed operation. Times are in microseconds, since the tracer was enabled."""
+
+    id: int
+    parent_id: int
+    name: str
+    thread_id: int
+    start_us: float
+    duration_us: float = None
+    attrs: dict = field(default_factory=dict)
+
+    def asdict(self) -> dict:
+        return {
+            "id": self.id,
+            "parent": self.parent_id,
+            "name": self.name,
+            "thread": self.thread_id,
+            "start_us": round(self.start_us, 1),
+            "duration_us": round(self.duration_us, 1) if self.duration_us is not None else None,
+            "attrs": self.attrs,
+        }
+
+
+class Tracer:
+    """Records spans. Spans are nested per thread.
+
+    - max_spans: recording stops once max_spans spans are recorded (0: no limit)
+    """
+
+    def __init__(self, max_spans: int = 0):
+        self.enabled: bool = False
+        self.max_spans: int = max_spans
+        self.spans: list[Span] = []
+        self._ids = itertools.count(1)
+        self._local = threading.local()
+        self._origin_ns: int = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    def enable(self, max_spans: int = None):
+        if max_spans is not None:
+            self.max_spans = max_spans
+        self._origin_ns = time.perf_counter_ns()
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def clear(self):
+        with self._lock:
+            self.spans = []
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        """Records the operation run in the context as a span, nested in the current span of the thread."""
+        if self.max_spans and len(self.spans) >= self.max_spans:
+            yield None
+            return
+        stack: list[Span] = self._local.__dict__.setdefault("stack", [])
+        s = Span(
+            id=next(self._ids),
+            parent_id=stack[-1].id if stack else None,
+            name=name,
+            thread_id=threading.get_ident(),
+            start_us=(time.perf_counter_ns() - self._origin_ns) / 1000,
+            attrs=attrs,
+        )
+        with self._lock:
+            self.spans.append(s)
+        stack.append(s)
+        try:
+            yield s
+        finally:
+            stack.pop()
+            s.duration_us = (time.perf_counter_ns() - self._origin_ns) / 1000 - s.start_us
+
+    def export_jsonl(self, o_file: str | Path):
+        """Writes the spans to a file, one JSON object per line."""
+        with open(o_file, "w", encoding="utf8") as f:
+            for s in self.spans:
+                f.write(json.dumps(s.asdict(), default=str) + "\n")
+
+    def export_chrome(self, o_file: str | Path):
+        """Writes the spans to a file in the Chrome trace-event format (complete events)."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": s.name,
+                "cat": s.name.split(" ", 1)[0],
+                "ph": "X",
+                "ts": s.start_us,
+                "dur": s.duration_us if s.duration_us is not None else 0,
+                "pid": pid,
+                "tid": s.thread_id,
+                "args": s.attrs,
+            }
+            for s in self.spans
+        ]
+        with open(o_file, "w", encoding="utf8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+
+    def export(self, o_file: str | Path):
+        """Writes the spans to a file: Chrome trace-event format for .json files, JSON lines otherwise."""
+        if Path(o_file).suffix == ".json":
+            self.export_chrome(o_file)
+        else:
+            self.export_jsonl(o_file)
+
+
+# the app tracer
+tracer = Tracer()
+
+
+def span(name: str, **attrs):
+    """Context recording a span with the app tracer (does nothing when tracing is disabled)."""
+    if not tracer.enabled:
+        return nullcontext()
+    return tracer.span(name, **attrs)
+
+
+def traced(name: str = None) -> Callable:
+    """Decorator recording each call of a function as a span (named after the function by default)."""
+
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with tracer.span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,81 @@
+"""Tournaments kept in memory during an app session.
+
+Several tournaments may run at the same time (for instance, several sections of the same event).
+Active tournaments are kept loaded, so that switching between them doesn't reload anything from disk.
+"""
+
+from app.models.player_model import Player, NationalPlayerID
+from app.models.tournament_model import Tournament, TournamentRepository
+from app.helpers.memory import deep_sizeof
+
+
+class ActiveTournaments:
+    """Registry of the active tournaments, and of the current one."""
+
+    def __init__(self, tournament_repo: TournamentRepository):
+        self.tournament_repo: TournamentRepository = tournament_repo
+        # tournament ID => tournament, in activation order
+        self._active: dict[str, Tournament] = {}
+        self.current_id: str = None
+
+    def __len__(self) -> int:
+        return len(self._active)
+
+    def __contains__(self, tournament_id: str) -> bool:
+        return tournament_id in self._active
+
+    def activate(self, tournament_id: str) -> Tournament:
+        """Loads a tournament (unless already active) and makes it the current tournament.
+
+        Returns None if the tournament is not found.
+        """
+        if not (tournament := self._active.get(tournament_id)):
+            if not (tournament := self.tournament_repo.find_tournament_by_id(tournament_id)):
+                return None
+            self._active[tournament_id] = tournament
+        self.current_id = tournament_id
+        return tournament
+
+    def switch(self, tournament_id: str) -> Tournament:
+        """Makes an active tournament the current one.
+
+        Fails if the tournament is not active.
+        """
+        if tournament_id not in self._active:
+            raise KeyError(f"Tournament is not active: {tournament_id}")
+        self.current_id = tournament_id
+        return self._active[tournament_id]
+
+    def deactivate(self, tournament_id: str) -> bool:
+        """Releases an active tournament from memory.
+
+        If it was the current tournament, the most recently activated tournament becomes current.
+        """
+        if self._active.pop(tournament_id, None) is None:
+            return False
+        self.tournament_repo.release_tournament(tournament_id)
+        if self.current_id == tournament_id:
+            self.current_id = next(reversed(self._active), None)
+        return True
+
+    def get(self, tournament_id: str) -> Tournament:
+        """Returns an active tournament, or None."""
+        return self._active.get(tournament_id)
+
+    def current(self) -> Tournament:
+        return self._active.get(self.current_id)
+
+    def list_active(self) -> list[Tournament]:
+        return list(self._active.values())
+
+    def memory_usage(self, tournament_id: str = None) -> dict[str, int]:
+        """Memory used by each active tournament, in bytes.
+
+        Players are shared with the player repository and other tournaments: they are not accounted.
+        """
+        ids = [tournament_id] if tournament_id else list(self._active)
+        return {
+            tid: deep_sizeof(self._active[tid], exclude=(Player, NationalPlayerID))
+            for tid in ids
+            if tid in self._active
+        }
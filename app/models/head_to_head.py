@@ -0,0 +1,201 @@
+"""Head-to-head index: results of all meetings between two players, across tournaments.
+
+The index is stored in a single JSON file, keyed by unordered player pair:
+
+    {"AA00001|BB00002": {"<tournament_id>/<round_idx>/<match_idx>": ["2024-05-01", 1.0], ...}, ...}
+
+Each meeting holds the date and the score of the first player of the pair (player IDs in alphabetical order).
+Meetings are keyed by match, so recording a match again (for instance, after an outcome correction)
+replaces the previous result.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Hashable
+from app.adapters.json_storage import JSONStorage
+import logging
+
+logger = logging.getLogger()
+
+
+@dataclass(frozen=True)
+class HeadToHeadRecord:
+    """Record of the meetings between a player and an opponent, from the player's side."""
+
+    player_id: str
+    opponent_id: str
+    wins: int = 0
+    draws: int = 0
+    losses: int = 0
+    last_meeting: date = None
+
+    @property
+    def meetings(self) -> int:
+        return self.wins + self.draws + self.losses
+
+    def asdict(self) -> dict:
+        return {
+            "player_id": self.player_id,
+            "opponent_id": self.opponent_id,
+            "wins": self.wins,
+            "draws": self.draws,
+            "losses": self.losses,
+            "meetings": self.meetings,
+            "last_meeting": self.last_meeting.isoformat() if self.last_meeting else None,
+        }
+
+
+def pair_key(player1_id: Hashable, player2_id: Hashable) -> str:
+    return "|".join(sorted((str(player1_id), str(player2_id))))
+
+
+def match_key(tournament_id: str, round_idx: int, match_idx: int) -> str:
+    return f"{tournament_id}/{round_idx}/{match_idx}"
+
+
+class HeadToHeadIndex:
+    """Persistent head-to-head index.
+
+    Changes are written to file by commit_changes(), or by flush() when deferred (see the unit_of_work module).
+    """
+
+    def __init__(self, index_file: str | Path):
+        self.index_file = Path(index_file)
+        self._storage = JSONStorage(index_file)
+        self.deferred: bool = False
+        self._changed: bool = False
+
+    def file_exists(self) -> bool:
+        return self.index_file.exists()
+
+    def record_match(self, tournament_id: str, round_idx: int, match_idx: int, match) -> bool:
+        """Records the result of an ended match. Returns False if the match has not ended."""
+        if not match.has_ended():
+            return False
+        player1_id, player2_id = str(match.player1().id()), str(match.player2().id())
+        first_id = min(player1_id, player2_id)
+        score = match.player_score(match.player1().id() if first_id == player1_id else match.player2().id())
+        meetings = self._storage.setdefault(pair_key(player1_id, player2_id), {})
+        meetings[match_key(tournament_id, round_idx, match_idx)] = [match.end_time.date().isoformat(), score]
+        return True
+
+    def record_tournament(self, tournament) -> int:
+        """Records all ended matches of a tournament. Returns the number of matches recorded."""
+        count = 0
+        for round_idx, rnd in enumerate(tournament.rounds):
+            if rnd is None:
+                continue
+            for match_idx, match in enumerate(rnd.matches):
+                count += self.record_match(tournament.id(), round_idx, match_idx, match)
+        return count
+
+    def rebuild(self, tournament_repo) -> int:
+        """Rebuilds the index from all tournaments in the repository. Returns the number of matches recorded.
+
+        Tournaments loaded for the rebuild are released once indexed: the archive is not kept in memory.
+        """
+        self._storage.clear()
+        count = 0
+        for meta in tournament_repo.list_tournament_meta():
+            loaded = tournament_repo.is_loaded(meta.id())
+            try:
+                if tournament := tournament_repo.find_tournament_by_id(meta.id()):
+                    count += self.record_tournament(tournament)
+            except Exception as e:
+                logger.error(f"Head-to-head index: skipping tournament {meta.id()}: {e}")
+            finally:
+                if not loaded:
+                    tournament_repo.release_tournament(meta.id())
+        return count
+
+    def record(
+        self, player_id: Hashable, opponent_id: Hashable, since: date = None, exclude_tournament: str = None
+    ) -> HeadToHeadRecord:
+        """Record of a player against an opponent.
+
+        - since: only counts the meetings from this date (for instance, the start of the season)
+        - exclude_tournament: ignores the meetings in this tournament
+        """
+        player_id, opponent_id = str(player_id), str(opponent_id)
+        sign = 1 if player_id <= opponent_id else -1
+        wins = draws = losses = 0
+        last_meeting = None
+        for key, (day, score) in self._meetings(player_id, opponent_id, since, exclude_tournament):
+            score = score if sign > 0 else 1.0 - score
+            if score == 1.0:
+                wins += 1
+            elif score == 0.0:
+                losses += 1
+            else:
+                draws += 1
+            day = date.fromisoformat(day)
+            if last_meeting is None or day > last_meeting:
+                last_meeting = day
+        return HeadToHeadRecord(
+            player_id=player_id,
+            opponent_id=opponent_id,
+            wins=wins,
+            draws=draws,
+            losses=losses,
+            last_meeting=last_meeting,
+        )
+
+    def meetings(
+        self, player_id: Hashable, opponent_id: Hashable, since: date = None, exclude_tournament: str = None
+    ) -> int:
+        """Number of meetings between two players (see record() for parameters)."""
+        return sum(1 for _ in self._meetings(str(player_id), str(opponent_id), since, exclude_tournament))
+
+    def list_meetings(
+        self, player_id: Hashable, opponent_id: Hashable, since: date = None, exclude_tournament: str = None
+    ) -> list[dict]:
+        """Meetings between two players, by date, with the score of player_id (see record() for parameters)."""
+        player_id, opponent_id = str(player_id), str(opponent_id)
+        meetings = []
+        for key, (day, score) in self._meetings(player_id, opponent_id, since, exclude_tournament):
+            tournament_id, round_idx, match_idx = key.rsplit("/", 2)
+            meetings.append(
+                {
+                    "tournament_id": tournament_id,
+                    "round_idx": int(round_idx),
+                    "match_idx": int(match_idx),
+                    "date": day,
+                    "score": score if player_id <= opponent_id else 1.0 - score,
+                }
+            )
+        meetings.sort(key=lambda m: (m["date"], m["round_idx"]))
+        return meetings
+
+    def opponents(self, player_id: Hashable) -> list[str]:
+        """IDs of all the players met by a player."""
+        player_id = str(player_id)
+        opponents = []
+        for key in self._storage:
+            player1_id, player2_id = key.split("|")
+            if player1_id == player_id:
+                opponents.append(player2_id)
+            elif player2_id == player_id:
+                opponents.append(player1_id)
+        return opponents
+
+    def _meetings(self, player_id: str, opponent_id: str, since: date, exclude_tournament: str):
+        prefix = f"{exclude_tournament}/" if exclude_tournament else None
+        since = since.isoformat() if since else None
+        for key, meeting in self._storage.get(pair_key(player_id, opponent_id), {}).items():
+            if prefix and key.startswith(prefix):
+                continue
+            if since and meeting[0] < since:
+                continue
+            yield key, meeting
+
+    def commit_changes(self):
+        self._changed = True
+        if not self.deferred:
+            self.flush()
+
+    def flush(self):
+        """Writes the index to file, even when deferred."""
+        if self._changed:
+            self._storage.write_store()
+            self._changed = False
@@ -3,8 +3,8 @@ from datetime import date
 from app.models.model_baseclasses import EntityABC
 import re
 from app.adapters.json_storage import JSONRepository
-from _collections_abc import Hashable
 import json
+import threading
 from app.helpers import validation
 
 NATIONAL_PLAYER_ID_PATTERN = re.compile(r"^[A-Z]{2}[0-9]{5}$")
@@ -23,25 +23,75 @@ def is_valid_national_player_id(val: str):
             raise e
 
 
-class NationalPlayerID(Hashable):
-    """Subset of the str type specific to national player ID format"""
+class NationalPlayerID(int):
+    """National player ID: 2 capital letters followed by 5 digits.
 
-    def __init__(self, string):
+    IDs are interned: NationalPlayerID("AZ12345") always returns the same object,
+    and the format is only validated the first time an ID is created.
+    The ID is packed into an int (the letters as a base 26 number, followed by the 5 digits),
+    so that IDs compare and sort as ints.
+    An ID is equal to its string form and hashes like it: dicts keyed by IDs may be looked up
+    with ID strings, and the other way round. It is not equal to its packed int.
+    Being an int, an ID is written as a bare number by the json module: encoders write str(player_id).
+    """
+
+    _interned: dict[str, "NationalPlayerID"] = {}
+    # IDs may be created from several threads: the intern table is written under this lock
+    _intern_lock = threading.Lock()
+
+    def __new__(cls, string):
+        if isinstance(string, NationalPlayerID):
+            return string
+        try:
+            return cls._interned[string]
+        except (KeyError, TypeError):
+            pass
         if not is_valid_national_player_id(string):
             raise ValueError("Invalid player ID")
-        self._val: str = string
+        return cls._intern(string)
+
+    @classmethod
+    def _intern(cls, string: str) -> "NationalPlayerID":
+        """Creates and interns the ID of a valid ID string (no format check)."""
+        with cls._intern_lock:
+            if (player_id := cls._interned.get(string)) is not None:
+                return player_id
+            letters = (ord(string[0]) - 65) * 26 + ord(string[1]) - 65
+            player_id = super().__new__(cls, letters * 100000 + int(string[2:]))
+            player_id._val = string
+            cls._interned[string] = player_id
+            return player_id
 
     def __str__(self):
-        return self._val.__str__()
+        return self._val
+
+    def __repr__(self) -> str:
+        return self._val
+
+    def __format__(self, format_spec: str) -> str:
+        return self._val.__format__(format_spec)
 
     def __hash__(self) -> int:
-        return self._val.__hash__()
+        # equal to its string form: hash alike (str objects cache their hash)
+        return hash(self._val)
 
     def __eq__(self, value: object) -> bool:
-        return self._val.__eq__(value)
+        if isinstance(value, NationalPlayerID):
+            return int.__eq__(self, value)
+        if isinstance(value, str):
+            return self._val == value
+        return False
 
-    def __repr__(self) -> str:
-        return self.__str__()
+    def __ne__(self, value: object) -> bool:
+        return not self.__eq__(value)
+
+    def __bool__(self) -> bool:
+        # "AA00000" packs to 0, but is a valid ID
+        return True
+
+    def __reduce__(self):
+        # unpickled IDs go through the intern table
+        return (NationalPlayerID, (self._val,))
 
 
 @dataclass
@@ -49,12 +99,21 @@ class Player(EntityABC):
     """Player Entity
 
     A Player is identified by its unique National Player ID
-    and: surname, name and birthdate
+    and: surname, name and birthdate.
+    The club Elo rating is None until the player has played a rated tournament.
     """
     national_player_id: NationalPlayerID = None
     surname: str = None
     name: str = None
     birthdate: date = None
+    rating: float = None
+
+    def __post_init__(self):
+        # IDs decoded from JSON or typed in by the user are plain strings.
+        # Invalid ID strings are kept as is: the player is then reported as invalid by is_valid(),
+        # which is how the player editor validates user input (see PlayerManager).
+        if isinstance(self.national_player_id, str) and is_valid_national_player_id(self.national_player_id):
+            self.national_player_id = NationalPlayerID(self.national_player_id)
 
     def id(self) -> NationalPlayerID:
         return self.national_player_id
@@ -79,11 +138,12 @@ class Player(EntityABC):
         """Copies all data from one player ot a new Player object."""
         return cls(
             national_player_id=(
-                NationalPlayerID(str(other_player.id())) if other_player.id() else None
+                NationalPlayerID(other_player.id()) if other_player.id() else None
             ),
             surname=other_player.surname,
             name=other_player.name,
             birthdate=other_player.birthdate,
+            rating=other_player.rating,
         )
 
     def asdict(self) -> dict:
@@ -92,6 +152,7 @@ class Player(EntityABC):
             "surname": self.surname,
             "name": self.name,
             "birthdate": self.birthdate,
+            "rating": self.rating,
         }
 
 
@@ -100,12 +161,16 @@ class PlayerJSONEncoder(json.JSONEncoder):
 
     def default(self, o: Player):
         if isinstance(o, Player):
-            return {
+            dct = {
                 "national_player_id": str(o.national_player_id),
                 "surname": o.surname,
                 "name": o.name,
                 "birthdate": o.birthdate.isoformat(),
             }
+            # unrated players are stored without rating
+            if o.rating is not None:
+                dct["rating"] = o.rating
+            return dct
         else:
             return super().default(o)
 
@@ -124,26 +189,74 @@ class PlayerJSONDecoder(json.JSONDecoder):
             surname=dct["surname"],
             name=dct["name"],
             birthdate=date.fromisoformat(dct["birthdate"]),
+            rating=dct.get("rating"),
         )
 
+    # compact form of the decoded players, for the warm-start cache (see the warm_cache module)
+
+    @staticmethod
+    def warm_pack(players: dict[str, Player]) -> list[tuple]:
+        return [
+            (key, str(p.national_player_id), p.surname, p.name, p.birthdate.toordinal(), p.rating)
+            for key, p in players.items()
+        ]
+
+    @staticmethod
+    def warm_unpack(rows: list[tuple]) -> dict[str, Player]:
+        # cached IDs were validated when first decoded: intern them without format check
+        interned, intern = NationalPlayerID._interned, NationalPlayerID._intern
+        fromordinal = date.fromordinal
+        return {
+            key: Player(
+                national_player_id=interned.get(player_id) or intern(player_id),
+                surname=surname,
+                name=name,
+                birthdate=fromordinal(birthdate),
+                rating=rating,
+            )
+            for key, player_id, surname, name, birthdate, rating in rows
+        }
+
 
 class PlayerRepository(JSONRepository[Player]):
     """Store player data to a JSON file."""
 
-    def __init__(self, filename):
+    def __init__(self, filename, lazy: bool = False, warm_cache: bool = False):
         super().__init__(
-            file=filename, encoder=PlayerJSONEncoder, decoder=PlayerJSONDecoder
+            file=filename, encoder=PlayerJSONEncoder, decoder=PlayerJSONDecoder, lazy=lazy, warm_cache=warm_cache
         )
 
     def find_by_id(self, id: NationalPlayerID | str) -> Player:
         """Finds a player by his National Player ID.
-        If parameter is a string, performs a format check first.
+        If parameter is a string, performs a format check first
+        (only once per ID, see NationalPlayerID).
         """
-        if isinstance(id, NationalPlayerID):
-            id_str = str(id)
-        elif not is_valid_national_player_id(id):
-            # first check ID is valid
-            raise ValueError("Invalid ID - expecting Player National ID Format")
-        else:
-            id_str = id
-        return super().find_by_id(id_str)
+        if not isinstance(id, NationalPlayerID):
+            try:
+                id = NationalPlayerID(id)
+            except ValueError:
+                raise ValueError("Invalid ID - expecting Player National ID Format")
+        return super().find_by_id(id)
+
+    def ratings(self) -> dict[str, float]:
+        """Returns the ratings of all rated players, indexed by player ID."""
+        return {str(p.id()): p.rating for p in self.list_all() if p.rating is not None}
+
+    def update_ratings(self, ratings: dict[str, float], commit: bool = True):
+        """Sets the rating of several players at once.
+        Unknown player IDs are ignored.
+        """
+        for player_id, rating in ratings.items():
+            if player := self.find_by_id(str(player_id)):
+                if player.rating != rating:
+                    player.rating = rating
+                    self.update(player)
+        if commit:
+            self.commit_changes()
+
+    def reset_ratings(self):
+        """Clears the ratings of all players (changes are not committed)."""
+        for player in self.list_all():
+            if player.rating is not None:
+                player.rating = None
+                self.update(player)
@@ -0,0 +1,331 @@
+"""Projection of the final standings of a running tournament.
+
+Given the current scores and the matches still to be played, computes the range of final ranks
+each player can still reach, and whether a player has clinched first place or is out of the race.
+
+Ranks are based on scores only, since tie-breaks can't be known in advance:
+when computing the best rank of a player, ties are resolved in the player's favour,
+and against the player when computing the worst rank.
+
+The rank ranges only cover the current round. When rounds are left to play after it,
+a player has clinched first place (or is out of the race) only if no result of the current round
+and no result of the next rounds (at most one point per round) can change it.
+
+When few outcomes remain, all 3^k outcomes of the k remaining matches are explored exactly,
+with a branch and bound search per player. The searches only branch on the players of the remaining matches:
+the other players keep their scores, and are counted once. Players not playing anymore
+with the same score share the same search. The projection is exact when both k and the number of searches
+times 3^k are small enough. Otherwise, outcomes are sampled at random and the rank ranges are estimates.
+
+The project doesn't depend on numpy: sampling is not vectorized, it works on plain lists
+and draws the outcomes of all matches at once in each sample.
+"""
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from _collections_abc import Hashable
+import random
+
+# Up to this number of remaining matches, the projection explores all outcomes.
+MAX_EXACT_MATCHES = 8
+# Up to this number of explored outcomes (number of searches x 3^k), the projection is exact.
+MAX_EXACT_OUTCOMES = 32 * 3 ** MAX_EXACT_MATCHES
+DEFAULT_SAMPLES = 5000
+# (player 1 points, player 2 points)
+OUTCOMES = ((1.0, 0.0), (0.5, 0.5), (0.0, 1.0))
+
+
+@dataclass(frozen=True)
+class PlayerProjection:
+    """Range of final ranks a player can still reach in the current round.
+
+    clinched: the player finishes first, whatever the outcome of the remaining matches and rounds.
+    eliminated: the player can't finish first anymore.
+    """
+
+    player_id: Hashable
+    score: float
+    best_rank: int
+    worst_rank: int
+    clinched: bool = False
+    eliminated: bool = False
+
+    def asdict(self) -> dict:
+        return {
+            "player_id": str(self.player_id),
+            "score": self.score,
+            "best_rank": self.best_rank,
+            "worst_rank": self.worst_rank,
+            "clinched": self.clinched,
+            "eliminated": self.eliminated,
+        }
+
+
+@dataclass(frozen=True)
+class StandingsProjection:
+    """Projected standings of all players.
+
+    exact is False when rank ranges were estimated by sampling outcomes.
+    rounds_left counts the rounds not set up yet, which can't be projected.
+    """
+
+    remaining_matches: int
+    exact: bool
+    samples: int = 0
+    rounds_left: int = 0
+    players: list[PlayerProjection] = field(default_factory=list)
+
+    def player(self, player_id: Hashable) -> PlayerProjection:
+        for p in self.players:
+            if p.player_id == player_id:
+                return p
+        return None
+
+
+def project_standings(
+    scores: dict[Hashable, float],
+    remaining_matches: list[tuple[Hashable, Hashable]],
+    max_exact: int = MAX_EXACT_MATCHES,
+    samples: int = DEFAULT_SAMPLES,
+    rounds_left: int = 0,
+    rng: random.Random = None,
+    max_exact_outcomes: int = MAX_EXACT_OUTCOMES,
+) -> StandingsProjection:
+    """Projects the final standings.
+
+    - scores: current score of each player
+    - remaining_matches: pairs of player IDs
+    - rounds_left: number of rounds to play after the current one
+    - max_exact, max_exact_outcomes: limits of the exact projection (see the module doc)
+    """
+    playing = {p for match in remaining_matches for p in match}
+    searches = len(playing) + len({s for p, s in scores.items() if p not in playing})
+    exact = len(remaining_matches) <= max_exact and searches * 3 ** len(remaining_matches) <= max_exact_outcomes
+    if exact:
+        rank_ranges = _exact_rank_ranges(scores, remaining_matches, playing)
+    else:
+        rank_ranges = _sampled_rank_ranges(scores, remaining_matches, samples, rng or random.Random())
+    if rounds_left:
+        clinched, eliminated = _first_place_bounds(scores, remaining_matches, rounds_left)
+    else:
+        clinched = {p for p, (_, worst) in rank_ranges.items() if worst == 1}
+        eliminated = {p for p, (best, _) in rank_ranges.items() if best > 1}
+    players = [
+        PlayerProjection(
+            player_id=p,
+            score=scores[p],
+            best_rank=best,
+            worst_rank=worst,
+            clinched=p in clinched,
+            eliminated=p in eliminated,
+        )
+        for p, (best, worst) in rank_ranges.items()
+    ]
+    players.sort(key=lambda p: (p.best_rank, p.worst_rank, -p.score))
+    return StandingsProjection(
+        remaining_matches=len(remaining_matches),
+        exact=exact,
+        samples=0 if exact else samples,
+        rounds_left=rounds_left,
+        players=players,
+    )
+
+
+def _first_place_bounds(
+    scores: dict[Hashable, float], matches: list[tuple[Hashable, Hashable]], rounds_left: int
+) -> tuple[set[Hashable], set[Hashable]]:
+    """Players who clinched first place, and players out of the race, when rounds are left after the current one.
+
+    The pairings of the next rounds are unknown: each player may score up to one point per round left,
+    on top of its remaining matches of the current round.
+    """
+    max_scores = {p: s + rounds_left for p, s in scores.items()}
+    for player1, player2 in matches:
+        max_scores[player1] += 1.0
+        max_scores[player2] += 1.0
+    # compare each player with the best of the others: the best of all players, or the second best
+    top_max = _top_two(max_scores)
+    top_score = _top_two(scores)
+    clinched = set()
+    eliminated = set()
+    for p, score in scores.items():
+        if _best_of_others(top_max, p) < score:
+            clinched.add(p)
+        if _best_of_others(top_score, p) > max_scores[p]:
+            eliminated.add(p)
+    return clinched, eliminated
+
+
+def _top_two(values: dict[Hashable, float]) -> list[tuple[float, Hashable]]:
+    return sorted(((v, p) for p, v in values.items()), key=lambda t: t[0], reverse=True)[:2]
+
+
+def _best_of_others(top_two: list[tuple[float, Hashable]], player_id: Hashable) -> float:
+    for value, p in top_two:
+        if p != player_id:
+            return value
+    return float("-inf")
+
+
+def _exact_rank_ranges(
+    scores: dict[Hashable, float], matches: list[tuple[Hashable, Hashable]], playing: set[Hashable]
+) -> dict[Hashable, tuple[int, int]]:
+    """Best and worst final rank of each player, over all outcomes of the remaining matches.
+
+    Players who don't play anymore keep their score: they are counted by bisecting their sorted scores,
+    and those with the same score get the same rank range.
+    """
+    idle_scores = sorted(s for p, s in scores.items() if p not in playing)
+    idle_ranges: dict[float, tuple[int, int]] = {}
+    rank_ranges = {}
+    for p, score in scores.items():
+        if p in playing:
+            rank_ranges[p] = _exact_rank_range(scores, matches, p, playing, idle_scores)
+        else:
+            if score not in idle_ranges:
+                idle_ranges[score] = _exact_rank_range(scores, matches, p, playing, idle_scores)
+            rank_ranges[p] = idle_ranges[score]
+    return rank_ranges
+
+
+def _exact_rank_range(
+    scores: dict[Hashable, float],
+    matches: list[tuple[Hashable, Hashable]],
+    player_id: Hashable,
+    playing: set[Hashable],
+    idle_scores: list[float],
+) -> tuple[int, int]:
+    """Best and worst final rank of a player, over all outcomes of the remaining matches.
+
+    idle_scores: sorted scores of the players who don't play anymore (player_id included, if idle).
+    """
+    # Winning its own matches is always best for the player, and losing them always worst:
+    # only the outcomes of the other matches need to be explored.
+    other_matches = [m for m in matches if player_id not in m]
+    best_scores = {p: scores[p] for p in playing}
+    best_scores[player_id] = scores[player_id]
+    worst_scores = dict(best_scores)
+    for player1, player2 in matches:
+        if player_id == player1:
+            best_scores[player1] += 1.0
+            worst_scores[player2] += 1.0
+        elif player_id == player2:
+            best_scores[player2] += 1.0
+            worst_scores[player1] += 1.0
+    idle_ahead = len(idle_scores) - bisect_right(idle_scores, best_scores[player_id])
+    idle_level = len(idle_scores) - bisect_left(idle_scores, worst_scores[player_id]) - (player_id not in playing)
+    ahead = _min_players_ahead(best_scores, other_matches, player_id)
+    level_or_ahead = _max_players_level(worst_scores, other_matches, player_id)
+    return 1 + idle_ahead + ahead, 1 + idle_level + level_or_ahead
+
+
+def _min_players_ahead(
+    scores: dict[Hashable, float], matches: list[tuple[Hashable, Hashable]], player_id: Hashable
+) -> int:
+    """Smallest number of players finishing with a higher score than player_id.
+
+    Scores only grow, so players already ahead stay ahead:
+    a branch is pruned as soon as it can't beat the best outcome found so far.
+    """
+    threshold = scores[player_id]
+    best = [len(scores)]
+
+    def search(i: int, ahead: int):
+        if ahead >= best[0]:
+            return
+        if i == len(matches):
+            best[0] = ahead
+            return
+        player1, player2 = matches[i]
+        for points1, points2 in (OUTCOMES[1], OUTCOMES[0], OUTCOMES[2]):
+            passing = (scores[player1] <= threshold < scores[player1] + points1) + (
+                scores[player2] <= threshold < scores[player2] + points2
+            )
+            scores[player1] += points1
+            scores[player2] += points2
+            search(i + 1, ahead + passing)
+            scores[player1] -= points1
+            scores[player2] -= points2
+
+    search(0, sum(1 for p, s in scores.items() if p != player_id and s > threshold))
+    return best[0]
+
+
+def _max_players_level(
+    scores: dict[Hashable, float], matches: list[tuple[Hashable, Hashable]], player_id: Hashable
+) -> int:
+    """Largest number of players finishing with a score equal to or higher than player_id.
+
+    A branch is pruned when, even if every player who still can catch up does so,
+    it can't beat the worst outcome found so far.
+    The upper bound (the number of players who can still reach the threshold) is updated
+    for the two players of each match only.
+    """
+    threshold = scores[player_id]
+    max_gain = {p: 0.0 for p in scores}
+    for player1, player2 in matches:
+        max_gain[player1] += 1.0
+        max_gain[player2] += 1.0
+    worst = [-1]
+
+    def search(i: int, upper_bound: int):
+        if upper_bound <= worst[0]:
+            return
+        if i == len(matches):
+            worst[0] = upper_bound
+            return
+        player1, player2 = matches[i]
+        reaching = (scores[player1] + max_gain[player1] >= threshold) + (
+            scores[player2] + max_gain[player2] >= threshold
+        )
+        max_gain[player1] -= 1.0
+        max_gain[player2] -= 1.0
+        for points1, points2 in OUTCOMES:
+            scores[player1] += points1
+            scores[player2] += points2
+            search(
+                i + 1,
+                upper_bound - reaching
+                + (scores[player1] + max_gain[player1] >= threshold)
+                + (scores[player2] + max_gain[player2] >= threshold),
+            )
+            scores[player1] -= points1
+            scores[player2] -= points2
+        max_gain[player1] += 1.0
+        max_gain[player2] += 1.0
+
+    search(0, sum(1 for p in scores if p != player_id and scores[p] + max_gain[p] >= threshold))
+    return worst[0]
+
+
+def _sampled_rank_ranges(
+    scores: dict[Hashable, float],
+    matches: list[tuple[Hashable, Hashable]],
+    samples: int,
+    rng: random.Random,
+) -> dict[Hashable, tuple[int, int]]:
+    """Estimates the rank ranges by sampling outcomes of the remaining matches uniformly.
+
+    Works on plain lists indexed by player, and draws the outcomes of all matches at once in each sample.
+    """
+    player_ids = list(scores)
+    index = {p: i for i, p in enumerate(player_ids)}
+    base_scores = [scores[p] for p in player_ids]
+    pairs = [(index[player1], index[player2]) for player1, player2 in matches]
+    n = len(player_ids)
+    best = [n] * n
+    worst = [1] * n
+    for _ in range(samples):
+        final = base_scores.copy()
+        for (i1, i2), (points1, points2) in zip(pairs, rng.choices(OUTCOMES, k=len(pairs))):
+            final[i1] += points1
+            final[i2] += points2
+        ordered = sorted(final)
+        for i, s in enumerate(final):
+            best_rank = 1 + n - bisect_right(ordered, s)
+            worst_rank = n - bisect_left(ordered, s)
+            if best_rank < best[i]:
+                best[i] = best_rank
+            if worst_rank > worst[i]:
+                worst[i] = worst_rank
+    return {p: (best[i], worst[i]) for i, p in enumerate(player_ids)}
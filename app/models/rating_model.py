@@ -0,0 +1,210 @@
+"""Club Elo ratings.
+
+Ratings are computed by replaying the ended matches of all stored tournaments
+in chronological order. Each round of a tournament is handled as a rating period:
+the expected scores of all its matches are computed from the ratings before the round,
+then all rating changes are applied at once.
+
+When rebuilding from the whole archive, tournament files are decoded in parallel
+by worker processes. Tournaments are then replayed one after the other, in the order they ended,
+as they are when each tournament is rated at its end (see RatingUpdater.update()).
+Tournaments may overlap in time: interleaving their matches would split their rounds.
+
+Ratings are stored with the player data (see Player.rating),
+and tournaments already taken into account are flagged in their metadata (see TournamentMetaData.rated).
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import chain, groupby
+from typing import Iterable, NamedTuple
+from pathlib import Path
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger()
+
+DEFAULT_RATING = 1500.0
+K_FACTOR = 20
+
+
+class MatchRecord(NamedTuple):
+    """Compact record of an ended match, used when replaying the match history."""
+
+    end_time: datetime
+    tournament_id: str
+    round_idx: int
+    player1_id: str
+    player2_id: str
+    player1_score: float
+
+
+def tournament_match_records(data: dict) -> list[MatchRecord]:
+    """Reduces the data of a tournament (as decoded from its JSON file)
+    to the records of its ended matches, sorted by round, then by end time.
+    """
+    tournament_id = data.get("tournament_id")
+    records = []
+    for round_idx, round_data in enumerate(data.get("rounds") or []):
+        if not round_data:
+            continue
+        for match_data in round_data.get("matches", []):
+            if not match_data.get("end_time"):
+                continue
+            (player1_id, player1_score), (player2_id, _) = match_data.get("players")
+            records.append(
+                MatchRecord(
+                    end_time=datetime.fromisoformat(match_data["end_time"]),
+                    tournament_id=tournament_id,
+                    round_idx=round_idx,
+                    player1_id=player1_id,
+                    player2_id=player2_id,
+                    player1_score=float(player1_score),
+                )
+            )
+    records.sort(key=lambda r: (r.round_idx, r.end_time))
+    return records
+
+
+def load_tournament_match_records(tournament_file: str | Path) -> list[MatchRecord]:
+    """Loads the records of ended matches from a tournament JSON file."""
+    with open(tournament_file, "r", encoding="utf8") as json_file:
+        return tournament_match_records(json.load(json_file))
+
+
+def load_match_history(tournament_files: list[str | Path], workers: int = None) -> Iterable[MatchRecord]:
+    """Loads the ended matches of several tournament files, as a single stream of records:
+    tournament after tournament, in the order of their last end time.
+
+    Each file is decoded and reduced to compact records independently:
+    files are spread over a pool of worker processes, then the record lists are ordered.
+    Set workers=1 to load the files sequentially, in the current process.
+    """
+    tournament_files = [str(f) for f in tournament_files]
+    workers = min(workers or os.cpu_count() or 1, len(tournament_files))
+    if workers <= 1:
+        streams = [load_tournament_match_records(f) for f in tournament_files]
+    else:
+        # a few chunks per worker: keeps inter-process traffic low while balancing the load
+        chunksize = max(1, len(tournament_files) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            streams = list(executor.map(load_tournament_match_records, tournament_files, chunksize=chunksize))
+    streams = sorted(
+        (records for records in streams if records),
+        key=lambda records: (max(r.end_time for r in records), records[0].tournament_id),
+    )
+    return chain.from_iterable(streams)
+
+
+def expected_score(rating: float, opponent_rating: float) -> float:
+    """Expected score of a player against an opponent, according to the Elo model."""
+    return 1.0 / (1.0 + 10.0 ** ((opponent_rating - rating) / 400.0))
+
+
+def throughput(count: int, duration: float) -> float:
+    """Number of items processed per second."""
+    return count / duration if duration > 0 else 0.0
+
+
+class EloRatingEngine:
+    """Computes Elo ratings from a stream of match records."""
+
+    def __init__(self, ratings: dict[str, float] = None, k_factor: float = K_FACTOR):
+        self.ratings: dict[str, float] = dict(ratings or {})
+        self.k_factor: float = k_factor
+
+    def rating(self, player_id: str) -> float:
+        return self.ratings.get(str(player_id), DEFAULT_RATING)
+
+    def apply_records(self, records: Iterable[MatchRecord]) -> int:
+        """Applies a stream of match records, ordered by tournament and round (see load_match_history()).
+
+        Consecutive records of the same round are applied as one batch.
+        Returns the number of matches applied.
+        """
+        match_count = 0
+        for _, round_records in groupby(records, key=lambda r: (r.tournament_id, r.round_idx)):
+            match_count += self._apply_round(list(round_records))
+        return match_count
+
+    def _apply_round(self, records: list[MatchRecord]) -> int:
+        """Applies all matches of a round, using the ratings from before the round."""
+        ratings = self.ratings
+        expected1 = [
+            expected_score(ratings.get(r.player1_id, DEFAULT_RATING), ratings.get(r.player2_id, DEFAULT_RATING))
+            for r in records
+        ]
+        # player 2 scores (1 - score1) and expects (1 - expected1):
+        # what player 1 wins, player 2 loses.
+        changes: dict[str, float] = {}
+        for r, e1 in zip(records, expected1):
+            delta = self.k_factor * (r.player1_score - e1)
+            changes[r.player1_id] = changes.get(r.player1_id, 0.0) + delta
+            changes[r.player2_id] = changes.get(r.player2_id, 0.0) - delta
+        for player_id, change in changes.items():
+            ratings[player_id] = ratings.get(player_id, DEFAULT_RATING) + change
+        return len(records)
+
+
+class RatingUpdater:
+    """Updates player ratings stored in the player repository,
+    basing on tournaments stored in the tournament repository.
+    """
+
+    def __init__(self, tournament_repo):
+        # TournamentRepository, not imported to avoid circular imports
+        self.tournament_repo = tournament_repo
+        self.player_repo = tournament_repo.player_repo
+
+    def _ended_tournaments(self) -> list:
+        return [m for m in self.tournament_repo.list_tournament_meta() if m.status == "ended"]
+
+    def _store_ratings(self, engine: EloRatingEngine):
+        self.player_repo.update_ratings(
+            {pid: round(rating, 1) for pid, rating in engine.ratings.items()}
+        )
+
+    def rebuild(self, workers: int = None) -> tuple[int, float]:
+        """Recomputes all player ratings from the whole tournament archive.
+
+        Tournament files are decoded in parallel by a pool of worker processes (see load_match_history()).
+        Returns the number of matches replayed and the duration of the rebuild, in seconds.
+        """
+        start = time.perf_counter()
+        tournaments = self._ended_tournaments()
+        tournament_files = [
+            f for f in (self.tournament_repo.tournament_file(meta) for meta in tournaments) if f.exists()
+        ]
+        engine = EloRatingEngine()
+        match_count = 0
+        history = load_match_history(tournament_files, workers=workers)
+        for _, records in groupby(history, key=lambda r: r.tournament_id):
+            match_count += engine.apply_records(records)
+            # update() starts from the rounded ratings stored after the previous tournament: round them alike
+            engine.ratings = {pid: round(rating, 1) for pid, rating in engine.ratings.items()}
+        self.player_repo.reset_ratings()
+        self._store_ratings(engine)
+        for meta in tournaments:
+            self.tournament_repo.set_rated(meta.id())
+        duration = time.perf_counter() - start
+        logger.debug(
+            f"Rebuilt ratings from {len(tournament_files)} tournaments: {match_count} matches in {duration:.3f}s"
+            + f" ({throughput(match_count, duration):.0f} matches/s)"
+        )
+        return match_count, duration
+
+    def update(self, tournament) -> int:
+        """Updates the player ratings with the matches of a tournament that just ended.
+
+        Does nothing if the tournament has not ended or was already rated.
+        Returns the number of matches applied.
+        """
+        if not tournament.has_ended() or tournament.metadata.rated:
+            return 0
+        engine = EloRatingEngine(ratings=self.player_repo.ratings())
+        match_count = engine.apply_records(tournament_match_records(tournament.asdict()))
+        self._store_ratings(engine)
+        self.tournament_repo.set_rated(tournament.id())
+        return match_count
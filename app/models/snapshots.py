@@ -0,0 +1,141 @@
+"""Immutable snapshots of a tournament state.
+
+Reports and scoreboards read a snapshot of the tournament (see Tournament.snapshot())
+instead of the live Tournament object, so they can run while results are being entered.
+
+Snapshots offer the read-only part of the Tournament, Round and Match interfaces.
+Each round keeps its latest snapshot until it changes: successive tournament snapshots
+share the snapshots of the rounds that did not change.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from types import MappingProxyType
+from typing import Hashable, Mapping
+from app.models.tiebreak import TieBreakScores
+
+
+@dataclass(frozen=True, slots=True)
+class MatchSnapshot:
+    """Read-only view of a Match."""
+
+    players: tuple[tuple[object, float], tuple[object, float]]
+    start_time: datetime = None
+    end_time: datetime = None
+
+    @classmethod
+    def of(cls, match) -> "MatchSnapshot":
+        return cls(players=match.players, start_time=match.start_time, end_time=match.end_time)
+
+    def player1(self):
+        return self.players[0][0]
+
+    def player2(self):
+        return self.players[1][0]
+
+    def player_score(self, player_id: Hashable) -> float:
+        if player_id is None:
+            return self.players
+        for player, score in self.players:
+            if player.id() == player_id:
+                return score
+        raise KeyError("Trying to retrieve match score with a wrong Player ID.")
+
+    def scores(self) -> tuple:
+        return self.players
+
+    def has_started(self) -> bool:
+        return self.start_time is not None
+
+    def has_ended(self) -> bool:
+        return self.end_time is not None
+
+    def asdict(self) -> dict:
+        return {
+            "start_time": self.start_time.isoformat() if self.start_time is not None else None,
+            "end_time": self.end_time.isoformat() if self.end_time is not None else None,
+            "players": [[str(player.id()), score] for player, score in self.players],
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class RoundSnapshot:
+    """Read-only view of a Round."""
+
+    name: str
+    matches: tuple[MatchSnapshot, ...] = ()
+
+    @classmethod
+    def of(cls, rnd) -> "RoundSnapshot":
+        return cls(name=rnd.name, matches=tuple(MatchSnapshot.of(m) for m in rnd.matches))
+
+    def has_started(self) -> bool:
+        return len(self.matches) > 0
+
+    def has_ended(self) -> bool:
+        return all(m.has_ended() for m in self.matches)
+
+    def find_player_match(self, player_id: Hashable) -> MatchSnapshot:
+        for m in self.matches:
+            if player_id in [m.player1().id(), m.player2().id()]:
+                return m
+        return None
+
+    def latest_end_time(self) -> datetime:
+        end_times = [m.end_time for m in self.matches if m.has_ended()]
+        return max(end_times) if end_times else None
+
+    def asdict(self) -> dict:
+        return {"name": str(self.name), "matches": [m.asdict() for m in self.matches]}
+
+
+@dataclass(frozen=True)
+class TournamentSnapshot:
+    """Read-only view of a Tournament, at a given version.
+
+    metadata is a private copy of the tournament metadata: it must not be modified.
+    """
+
+    metadata: object
+    participants: tuple = ()
+    rounds: tuple[RoundSnapshot, ...] = ()
+    current_round_idx: int = None
+    version: tuple = None
+    ranking: tuple[tuple[Hashable, int, float], ...] = ()
+    player_ranks: Mapping[Hashable, tuple[int, float]] = field(default_factory=lambda: MappingProxyType({}))
+    tie_break_scores: Mapping[Hashable, object] = field(default_factory=lambda: MappingProxyType({}))
+
+    def id(self) -> str:
+        return self.metadata.id()
+
+    def start_date(self) -> date:
+        return self.metadata.start_date
+
+    def end_date(self) -> date:
+        return self.metadata.end_date
+
+    def has_started(self) -> bool:
+        return bool(self.rounds) and self.rounds[0] is not None and self.rounds[0].has_started()
+
+    def has_ended(self) -> bool:
+        return bool(self.rounds) and self.rounds[-1] is not None and self.rounds[-1].has_ended()
+
+    def status(self) -> str:
+        if not self.has_started():
+            return "open"
+        return "ended" if self.has_ended() else "running"
+
+    def current_round(self) -> RoundSnapshot:
+        if self.has_ended() or not self.has_started():
+            return None
+        return self.rounds[self.current_round_idx]
+
+    def ranking_list(self) -> list[tuple[Hashable, int, float]]:
+        return list(self.ranking)
+
+    def player_rank(self, player_id: Hashable) -> int:
+        return self.player_ranks.get(player_id, (None, None))[0]
+
+    def tie_breaks(self, player_id: Hashable) -> TieBreakScores:
+        scores = self.tie_break_scores.get(player_id)
+        return scores if scores is not None else TieBreakScores()
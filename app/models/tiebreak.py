@@ -0,0 +1,181 @@
+"""Tie-break scores used to order players with equal points in a tournament.
+
+Supported tie-breaks:
+  - Buchholz: sum of the scores of all opponents met so far.
+  - Median Buchholz: Buchholz without the best and the worst opponent scores.
+  - Sonneborn-Berger: sum of the scores of defeated opponents,
+    plus half the scores of the opponents who drew.
+  - Cumulative (progressive) score: sum of the running scores after each round.
+
+The TieBreakBoard is updated incrementally each time a match ends:
+only the two players of the match and their opponents are touched.
+"""
+
+from dataclasses import dataclass
+from _collections_abc import Hashable
+
+# Order in which tie-breaks are applied when two players have the same score.
+TIE_BREAK_ORDER = ("buchholz", "median_buchholz", "sonneborn_berger", "cumulative")
+
+
+@dataclass(frozen=True)
+class TieBreakScores:
+    """Tie-break scores of one player."""
+
+    buchholz: float = 0.0
+    median_buchholz: float = 0.0
+    sonneborn_berger: float = 0.0
+    cumulative: float = 0.0
+
+    def sort_key(self) -> tuple[float, ...]:
+        """Returns the tie-break values in the order they should be applied."""
+        return tuple(getattr(self, tb) for tb in TIE_BREAK_ORDER)
+
+    def asdict(self) -> dict:
+        return {
+            "buchholz": self.buchholz,
+            "median_buchholz": self.median_buchholz,
+            "sonneborn_berger": self.sonneborn_berger,
+            "cumulative": self.cumulative,
+        }
+
+
+class TieBreakBoard:
+    """Keeps track of match results and tie-break scores of all players in a tournament.
+
+    Results are recorded per match, identified by its round index and match index.
+    Recording a match that has already been recorded replaces its previous outcome
+    (when fixing a mistake, for instance).
+    """
+
+    def __init__(self):
+        self._scores: dict[Hashable, float] = {}
+        self._buchholz: dict[Hashable, float] = {}
+        self._sonneborn_berger: dict[Hashable, float] = {}
+        # per player, results of ended matches: (round_idx, match_idx) => (opponent_id, own score)
+        self._results: dict[Hashable, dict[tuple[int, int], tuple[Hashable, float]]] = {}
+        # per player, score obtained in each round
+        self._round_scores: dict[Hashable, dict[int, float]] = {}
+
+    def add_player(self, player_id: Hashable):
+        """Registers a player with empty scores (no effect if already registered)."""
+        if player_id not in self._scores:
+            self._scores[player_id] = 0.0
+            self._buchholz[player_id] = 0.0
+            self._sonneborn_berger[player_id] = 0.0
+            self._results[player_id] = {}
+            self._round_scores[player_id] = {}
+
+    def clear(self):
+        """Forgets all recorded results, but keeps the registered players."""
+        for player_id in list(self._scores):
+            del self._scores[player_id]
+            self.add_player(player_id)
+
+    def rebuild(self, rounds: list):
+        """Recomputes all tie-breaks from scratch, given a list of rounds."""
+        self.clear()
+        for round_idx, rnd in enumerate(rounds):
+            if rnd is None:
+                continue
+            for match_idx, match in enumerate(rnd.matches):
+                if match.has_ended():
+                    self.record_match(round_idx, match_idx, match)
+
+    def record_match(self, round_idx: int, match_idx: int, match) -> None:
+        """Records the outcome of an ended match and updates the tie-breaks.
+
+        If this match has already been recorded, its previous outcome is discarded first.
+        """
+        (player1, score1), (player2, score2) = match.scores()
+        self.record_result(
+            round_idx=round_idx,
+            match_idx=match_idx,
+            player1_id=player1.id(),
+            player1_score=float(score1 or 0.0),
+            player2_id=player2.id(),
+            player2_score=float(score2 or 0.0),
+        )
+
+    def record_result(
+        self,
+        round_idx: int,
+        match_idx: int,
+        player1_id: Hashable,
+        player1_score: float,
+        player2_id: Hashable,
+        player2_score: float,
+    ):
+        """Records a match outcome given as raw player IDs and scores."""
+        self.add_player(player1_id)
+        self.add_player(player2_id)
+        key = (round_idx, match_idx)
+        self._discard_result(key, player1_id, player2_id)
+        # a lost round still counts in the cumulative score
+        self._round_scores[player1_id].setdefault(round_idx, 0.0)
+        self._round_scores[player2_id].setdefault(round_idx, 0.0)
+        # first update the players' scores (this also updates their former opponents),
+        # then link both players.
+        self._add_to_score(player1_id, round_idx, player1_score)
+        self._add_to_score(player2_id, round_idx, player2_score)
+        self._link(key, player1_id, player1_score, player2_id)
+        self._link(key, player2_id, player2_score, player1_id)
+
+    def _discard_result(self, key: tuple[int, int], *player_ids: Hashable):
+        """Removes a previously recorded match outcome, if any."""
+        previous = {}
+        for player_id in player_ids:
+            if key in self._results[player_id]:
+                previous[player_id] = self._results[player_id][key]
+        if not previous:
+            return
+        for player_id, (opponent_id, score) in previous.items():
+            self._unlink(key, player_id, score, opponent_id)
+        for player_id, (_, score) in previous.items():
+            self._add_to_score(player_id, key[0], -score)
+
+    def _link(self, key: tuple[int, int], player_id: Hashable, score: float, opponent_id: Hashable):
+        self._results[player_id][key] = (opponent_id, score)
+        self._buchholz[player_id] += self._scores[opponent_id]
+        self._sonneborn_berger[player_id] += score * self._scores[opponent_id]
+
+    def _unlink(self, key: tuple[int, int], player_id: Hashable, score: float, opponent_id: Hashable):
+        del self._results[player_id][key]
+        self._buchholz[player_id] -= self._scores[opponent_id]
+        self._sonneborn_berger[player_id] -= score * self._scores[opponent_id]
+
+    def _add_to_score(self, player_id: Hashable, round_idx: int, delta: float):
+        """Changes the score of a player and propagates the change
+        to the tie-breaks of all the opponents he met."""
+        if not delta:
+            return
+        self._scores[player_id] += delta
+        self._round_scores[player_id][round_idx] += delta
+        for key, (opponent_id, _) in self._results[player_id].items():
+            opponent_score = self._results[opponent_id][key][1]
+            self._buchholz[opponent_id] += delta
+            self._sonneborn_berger[opponent_id] += opponent_score * delta
+
+    def score(self, player_id: Hashable) -> float:
+        return self._scores.get(player_id, 0.0)
+
+    def tie_breaks(self, player_id: Hashable) -> TieBreakScores:
+        """Returns the current tie-break scores of a player."""
+        if player_id not in self._scores:
+            return TieBreakScores()
+        opponent_scores = sorted(
+            self._scores[opponent_id] for opponent_id, _ in self._results[player_id].values()
+        )
+        buchholz = self._buchholz[player_id]
+        median_buchholz = sum(opponent_scores[1:-1]) if len(opponent_scores) > 2 else buchholz
+        cumulative = 0.0
+        running_score = 0.0
+        for round_idx in sorted(self._round_scores[player_id]):
+            running_score += self._round_scores[player_id][round_idx]
+            cumulative += running_score
+        return TieBreakScores(
+            buchholz=round(buchholz, 2),
+            median_buchholz=round(median_buchholz, 2),
+            sonneborn_berger=round(self._sonneborn_berger[player_id], 2),
+            cumulative=round(cumulative, 2),
+        )
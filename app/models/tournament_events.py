@@ -0,0 +1,129 @@
+"""Event log of a tournament.
+
+In event-sourcing mode (see TournamentRepository), the changes made to a tournament are appended
+to a JSON lines file as events, instead of rewriting the whole tournament data file:
+
+- participant_registered: {player_id}
+- round_started: {round_idx, start_date, pairs}
+- match_started: {round_idx, match_idx, start_time}
+- match_ended: {round_idx, match_idx, winner_id, end_time}
+- outcome_corrected: same as match_ended, for a match that had already ended
+
+Each event gets a sequence number when appended to the log.
+The tournament data file is then only written from time to time, as a snapshot of the tournament state
+which records the sequence number and the log offset of the last event it includes.
+Loading a tournament replays the events that follow its latest snapshot.
+"""
+
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Iterator
+import json
+
+PARTICIPANT_REGISTERED = "participant_registered"
+ROUND_STARTED = "round_started"
+MATCH_STARTED = "match_started"
+MATCH_ENDED = "match_ended"
+OUTCOME_CORRECTED = "outcome_corrected"
+
+
+class TournamentEventLog:
+    """Append-only log of tournament events, stored as one JSON object per line."""
+
+    def __init__(self, log_file: str | Path):
+        self._file = Path(log_file).resolve()
+
+    def file(self) -> Path:
+        return self._file
+
+    def size(self) -> int:
+        """Size of the log in bytes, used as offset of the next event."""
+        return self._file.stat().st_size if self._file.exists() else 0
+
+    def append(self, events: list[dict], last_seq: int) -> int:
+        """Appends events to the log, numbered after last_seq.
+
+        An incomplete last line (interrupted write, ignored by read()) is removed first.
+        Returns the sequence number of the last event appended.
+        """
+        lines = []
+        for event in events:
+            last_seq += 1
+            lines.append(json.dumps({"seq": last_seq, **event}, ensure_ascii=False) + "\n")
+        if lines:
+            self._drop_incomplete_line()
+            with open(self._file, "a", encoding="utf8") as log_file:
+                log_file.writelines(lines)
+        return last_seq
+
+    def _drop_incomplete_line(self, chunk_size: int = 4096):
+        """Truncates the log after its last complete line."""
+        if not self._file.exists():
+            return
+        with open(self._file, "r+b") as log_file:
+            end = log_file.seek(0, 2)
+            position = end
+            while position > 0:
+                start = max(0, position - chunk_size)
+                log_file.seek(start)
+                chunk = log_file.read(position - start)
+                if (newline := chunk.rfind(b"\n")) >= 0:
+                    position = start + newline + 1
+                    break
+                position = start
+            if position < end:
+                log_file.truncate(position)
+
+    def read(self, offset: int = 0, after_seq: int = 0) -> Iterator[dict]:
+        """Reads the events found after the byte offset, and numbered after after_seq.
+
+        An incomplete last line (interrupted write) is ignored.
+        """
+        if not self._file.exists():
+            return
+        with open(self._file, "rb") as log_file:
+            log_file.seek(offset)
+            for line in log_file:
+                if not line.endswith(b"\n"):
+                    break
+                event = json.loads(line)
+                if event.get("seq", 0) > after_seq:
+                    yield event
+
+
+def apply_event(tournament, event: dict, find_player: Callable):
+    """Replays an event on a tournament.
+
+    - tournament: the Tournament to update
+    - event: the event data, as read from the log
+    - find_player: finds a Player by its ID (only used for participant registrations)
+    """
+    match event.get("type"):
+        case "participant_registered":
+            if not (player := find_player(event["player_id"])):
+                raise KeyError(f"Player ID not found in repository: '{event['player_id']}'")
+            tournament.add_participant(player)
+        case "round_started":
+            participants = {str(p.id()): p for p in tournament.participants}
+            pairs = [(participants[p1], participants[p2]) for p1, p2 in event["pairs"]]
+            tournament.start_next_round(player_pairs=pairs, start_date=date.fromisoformat(event["start_date"]))
+        case "match_started":
+            _check_round(tournament, event)
+            tournament.start_a_match(event["match_idx"], start_time=datetime.fromisoformat(event["start_time"]))
+        case "match_ended" | "outcome_corrected":
+            _check_round(tournament, event)
+            tournament.end_a_match(
+                event["match_idx"],
+                winner_id=event.get("winner_id"),
+                end_time=datetime.fromisoformat(event["end_time"]),
+            )
+        case _:
+            raise ValueError(f"Unknown tournament event: {event.get('type')}")
+
+
+def _check_round(tournament, event: dict):
+    if tournament.current_round_idx != event["round_idx"]:
+        raise ValueError(
+            f"Event {event.get('seq')} refers to round {event['round_idx']},"
+            + f" but current round is {tournament.current_round_idx}."
+        )
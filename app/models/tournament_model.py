@@ -1,25 +1,83 @@
-from dataclasses import dataclass
-from datetime import date, datetime
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timedelta
+from contextlib import contextmanager, nullcontext
 from app.models.model_baseclasses import EntityABC
 from app.adapters.json_storage import JSONRepository
+from app.adapters import warm_cache as warm_cache_files
 from _collections_abc import Hashable
+from typing import Callable
 import json
 from app.models.player_model import Player, NationalPlayerID, PlayerRepository
+from app.models.tiebreak import TieBreakBoard, TieBreakScores
+from app.models.tournament_events import (
+    TournamentEventLog,
+    apply_event,
+    PARTICIPANT_REGISTERED,
+    ROUND_STARTED,
+    MATCH_STARTED,
+    MATCH_ENDED,
+    OUTCOME_CORRECTED,
+)
+from app.helpers.locks import SharedExclusiveLock, KeyedLocks
+from app.helpers.tracing import traced
+from app.models.snapshots import RoundSnapshot, TournamentSnapshot
+from app.models.projection import StandingsProjection, project_standings, MAX_EXACT_MATCHES, DEFAULT_SAMPLES
 import random
 import logging
 from pathlib import Path
+import threading
+from types import MappingProxyType
 import uuid
+import itertools
 
 logger = logging.getLogger()
 
+# number of random draws tried for the first round, to avoid pairs that met in other tournaments
+PAST_MEETINGS_DRAWS = 20
+
+
+# Matches store their times as integer microseconds since this (naive) epoch.
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+# Matches store their scores as integer half-points. This stands for a missing score.
+_NO_SCORE = -1
+# Rounds draw their versions from this counter: matches of a round may notify it from several threads.
+_round_versions = itertools.count(1)
+
+
+def _to_timestamp(dt: datetime) -> int:
+    """Converts a naive datetime to integer microseconds since the epoch."""
+    return None if dt is None else (dt - _EPOCH) // _MICROSECOND
+
+
+def _from_timestamp(timestamp: int) -> datetime:
+    return None if timestamp is None else _EPOCH + timedelta(microseconds=timestamp)
+
+
+def _to_half_points(score: float) -> int:
+    return _NO_SCORE if score is None else round(score * 2)
+
+
+def _from_half_points(half_points: int) -> float:
+    return None if half_points == _NO_SCORE else half_points / 2
+
 
 class Match:
     """A Match between opposing two players.
 
     Each player has a score (0, .5 or 1 depending in the outcome).
     Records the match start and end times.
+
+    Archives hold many matches: to keep them small, matches use slots,
+    scores are stored as integer half-points and times as integer timestamps.
+    The players, start_time and end_time attributes are rebuilt on access.
+
+    A match keeps a reference to its Round, which it notifies when it changes.
+    Its version is bumped on every change.
     """
 
+    __slots__ = ("_player1", "_player2", "_score1", "_score2", "_start", "_end", "_round", "_index", "_version")
+
     def __init__(
         self,
         player1: tuple[Player, float],
@@ -35,24 +93,65 @@ class Match:
             raise TypeError(
                 f"Expecting Player object for player2, got {type(player1[0])}"
             )
-        self.players: tuple[tuple[Player, float]] = (
-            (player1[0], player1[1]),
-            (player2[0], player2[1]),
+        self._round: Round = None
+        self._index: int = None
+        self._version: int = 0
+        self.players = (player1, player2)
+        self.start_time = start_time
+        self.end_time = end_time
+
+    @property
+    def players(self) -> tuple[tuple[Player, float], tuple[Player, float]]:
+        return (
+            (self._player1, _from_half_points(self._score1)),
+            (self._player2, _from_half_points(self._score2)),
         )
-        self.start_time: datetime = start_time
-        self.end_time: datetime = end_time
+
+    @players.setter
+    def players(self, players: tuple[tuple[Player, float], tuple[Player, float]]):
+        (self._player1, score1), (self._player2, score2) = players
+        self._score1 = _to_half_points(score1)
+        self._score2 = _to_half_points(score2)
+        self._changed()
+
+    @property
+    def start_time(self) -> datetime:
+        return _from_timestamp(self._start)
+
+    @start_time.setter
+    def start_time(self, start_time: datetime):
+        self._start = _to_timestamp(start_time)
+        self._changed()
+
+    @property
+    def end_time(self) -> datetime:
+        return _from_timestamp(self._end)
+
+    @end_time.setter
+    def end_time(self, end_time: datetime):
+        self._end = _to_timestamp(end_time)
+        self._changed()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def _changed(self):
+        self._version += 1
+        if self._round is not None:
+            self._round._update_match_state(self._index)
 
     def player1(self) -> Player:
-        return self.players[0][0]
+        return self._player1
 
     def player2(self) -> Player:
-        return self.players[1][0]
+        return self._player2
 
     def start(self, start_time: datetime = None) -> bool:
         """Start the match.
         Sets the start_time (defaults to now).
         Fails if the match has already started."""
-        if self.start_time is not None:
+        if self._start is not None:
             raise ValueError("Match has already started")
         if start_time is None:
             self.start_time = datetime.now()
@@ -77,27 +176,32 @@ class Match:
         but it is still possible to change the outcome of a match that has
         already ended (in order to fix a mistake, for instance).
         """
-        if not self.has_started():
-            raise Exception("Can't end a match that has not started yet.")
-        if end_time is None and self.end_time is None:
+        self.check_end(winner=winner, end_time=end_time)
+        if end_time is None and self._end is None:
             self.end_time = datetime.now()
         elif end_time is not None:
-            if end_time <= self.start_time:
-                raise ValueError("Trying to end a match with inconsistent end time.")
             self.end_time = end_time
 
         if winner is None:
             # draw: 0.5 for each player.
-            self.players = ((self.player1(), 0.5), (self.player2(), 0.5))
-        elif self.player1().id() == winner:
-            self.players = ((self.player1(), 1.0), (self.player2(), 0))
-        elif self.player2().id() == winner:
-            self.players = ((self.player1(), 0.0), (self.player2(), 1.0))
+            self._score1, self._score2 = 1, 1
+        elif self._player1.id() == winner:
+            self._score1, self._score2 = 2, 0
         else:
-            raise KeyError("Trying to end a match with wrong Player ID.")
+            self._score1, self._score2 = 0, 2
+        self._changed()
 
         return self.scores()
 
+    def check_end(self, winner: NationalPlayerID = None, end_time: datetime = None):
+        """Raises the exception end() would raise with the same parameters, without changing the match."""
+        if not self.has_started():
+            raise Exception("Can't end a match that has not started yet.")
+        if end_time is not None and _to_timestamp(end_time) <= self._start:
+            raise ValueError("Trying to end a match with inconsistent end time.")
+        if winner is not None and winner != self._player1.id() and winner != self._player2.id():
+            raise KeyError("Trying to end a match with wrong Player ID.")
+
     def player_score(self, player_id: NationalPlayerID) -> float:
         """Returns the score of a player for this match,
         or None if the match is still running.
@@ -105,10 +209,10 @@ class Match:
         """
         if player_id is None:
             return self.players
-        elif player_id == self.player1().id():
-            return self.players[0][1]
-        elif player_id == self.player2().id():
-            return self.players[1][1]
+        elif player_id == self._player1.id():
+            return _from_half_points(self._score1)
+        elif player_id == self._player2.id():
+            return _from_half_points(self._score2)
         else:
             raise KeyError("Trying to retrieve match score with a wrong Player ID.")
 
@@ -120,11 +224,11 @@ class Match:
         """Returns True if this match has started.
         (it may have also ended if True...)
         """
-        return self.start_time is not None
+        return self._start is not None
 
     def has_ended(self) -> bool:
         """Returns True if this match has ended."""
-        return self.end_time is not None
+        return self._end is not None
 
     def asdict(self) -> dict:
         """Copies the data of this Macth in a new dict object.
@@ -133,40 +237,108 @@ class Match:
         """
         return {
             "start_time": (
-                self.start_time.isoformat() if self.start_time is not None else None
+                self.start_time.isoformat() if self._start is not None else None
             ),
             "end_time": (
-                self.end_time.isoformat() if self.end_time is not None else None
+                self.end_time.isoformat() if self._end is not None else None
             ),
             "players": [
-                [str(score[0].id()), float(score[1]) if score[1] is not None else None]
-                for score in self.players
+                [str(player.id()), float(score) if score is not None else None]
+                for player, score in self.players
             ],
         }
 
 
 class Round:
-    """A Round in a tournament."""
+    """A Round in a tournament.
+
+    The round keeps track of the indexes of its pending, running and ended matches,
+    so that status queries don't have to scan all the matches.
+    Its version is bumped each time the round or one of its matches changes.
+    """
+
+    __slots__ = ("_name", "_matches", "_pending", "_running", "_ended", "_version", "_dict_cache", "_snapshot")
 
     def __init__(self, name: str = "", matches: list[Match] = None):
-        self.name: str = name
-        self.matches: list[Match] = matches or []
+        self._version: int = 0
+        self._dict_cache: tuple[int, dict] = None
+        self._snapshot: tuple[int, RoundSnapshot] = None
+        self.name = name
+        self.matches = matches or []
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, name: str):
+        self._name: str = name
+        self._version = next(_round_versions)
+
+    @property
+    def matches(self) -> list[Match]:
+        return self._matches
+
+    @matches.setter
+    def matches(self, matches: list[Match]):
+        self._version = next(_round_versions)
+        self._matches: list[Match] = list(matches)
+        self._pending: set[int] = set()
+        self._running: set[int] = set()
+        self._ended: set[int] = set()
+        for idx, match in enumerate(self._matches):
+            match._round = self
+            match._index = idx
+            self._update_match_state(idx)
+
+    def _update_match_state(self, idx: int):
+        """Files a match under its current state (called by the match each time it changes)."""
+        self._pending.discard(idx)
+        self._running.discard(idx)
+        self._ended.discard(idx)
+        match = self._matches[idx]
+        if match.has_ended():
+            self._ended.add(idx)
+        elif match.has_started():
+            self._running.add(idx)
+        else:
+            self._pending.add(idx)
+        self._version = next(_round_versions)
 
     def setup(self, match_list: list[tuple[Player, Player]]):
         """Setup a Round that has not started yet.
         Parameter is a list of pairs of players.
         """
-        self.matches = []
-        for pair in match_list:
-            self.matches.append(Match(player1=(pair[0], 0.0), player2=(pair[1], 0.0)))
+        self.matches = [Match(player1=(pair[0], 0.0), player2=(pair[1], 0.0)) for pair in match_list]
 
     def has_started(self) -> bool:
         """A Round has started if all matches are set up."""
-        return len(self.matches) > 0
+        return len(self._matches) > 0
 
     def has_ended(self) -> bool:
         """Returns True if all matches have ended."""
-        return 0 == len(list(filter(lambda x: x.has_ended() is False, self.matches)))
+        return not self._pending and not self._running
+
+    def pending_indexes(self) -> list[int]:
+        """Indexes of the matches that have not started yet."""
+        return sorted(self._pending)
+
+    def running_indexes(self) -> list[int]:
+        """Indexes of the matches that have started but not ended."""
+        return sorted(self._running)
+
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def running_count(self) -> int:
+        return len(self._running)
+
+    def ended_count(self) -> int:
+        return len(self._ended)
 
     def find_player_match(self, player_id: NationalPlayerID) -> Match:
         """Finds match with player player_id"""
@@ -178,8 +350,22 @@ class Round:
     def asdict(self) -> dict:
         """Copies the data of this Round in a new dict object.
         Useful when dumping to JSON, fo instance.
+
+        The dict is cached until the round changes, and shared between callers:
+        it must not be modified.
         """
-        return {"name": str(self.name), "matches": [m.asdict() for m in self.matches]}
+        if self._dict_cache is None or self._dict_cache[0] != self._version:
+            self._dict_cache = (
+                self._version,
+                {"name": str(self.name), "matches": [m.asdict() for m in self.matches]},
+            )
+        return self._dict_cache[1]
+
+    def snapshot(self) -> RoundSnapshot:
+        """Returns an immutable view of this Round, kept until the round changes."""
+        if self._snapshot is None or self._snapshot[0] != self._version:
+            self._snapshot = (self._version, RoundSnapshot.of(self))
+        return self._snapshot[1]
 
     def latest_end_time(self) -> datetime:
         """Returns the date and time where the last running match of this round ended.
@@ -205,6 +391,8 @@ class TournamentMetaData(EntityABC):
     data_file: str = ""
     round_count: int = 4
     status: str = "open"
+    # True once the matches of this tournament count in the player ratings.
+    rated: bool = False
 
     def set_id(self, id: Hashable):
         self.tournament_id = id
@@ -226,6 +414,7 @@ class TournamentMetaData(EntityABC):
             "data_file": str(self.data_file),
             "round_count": self.round_count,
             "status": self.status,
+            "rated": self.rated,
         }
 
 
@@ -236,6 +425,7 @@ class Tournament:
         participants: list[Player] = None,
         rounds: list[Round] = None,
         current_round: int = None,
+        thread_safe: bool = False,
     ):
         """Create a Tournament.
 
@@ -243,6 +433,7 @@ class Tournament:
         - particpants:
         - rounds:
         - current_round:
+        - thread_safe: see set_thread_safe()
         """
         if rounds is not None and len(rounds) != metadata.round_count:
             raise ValueError("Round count mismatch.")
@@ -250,14 +441,36 @@ class Tournament:
         self.rounds: list[Round] = rounds or [None for _ in range(metadata.round_count)]
         self.current_round_idx: int = current_round
         self.participants: list[Player] = participants or []
+        # bumped on each change of the tournament itself (rounds have their own version).
+        self._version: int = 0
+        # version of the tournament when its state was last updated (see _update_state())
+        self._state_version: tuple = None
+        # When set, changes are recorded as events, until collected with pop_events()
+        # (see the tournament_events module).
+        self.record_events: bool = False
+        self._pending_events: list[dict] = []
+        # locks, when thread safety is enabled (see set_thread_safe())
+        self.thread_safe: bool = False
+        self._transition_lock: SharedExclusiveLock = None
+        self._match_locks: KeyedLocks = None
+        self._state_lock: threading.RLock = None
+        self.set_thread_safe(thread_safe)
+        self._snapshot: TournamentSnapshot = None
 
         # utility: keep track of oppenents met during the tournament to avoid
         # repetitive matches.
         self._player_opponents: dict[NationalPlayerID, list[NationalPlayerID]] = {}
         for p in self.participants:
             self._player_opponents[p.id()] = []
+        # optional: number of past meetings of two players, in other tournaments
+        # (for instance, HeadToHeadIndex.meetings). Pairing avoids repeating them too.
+        self.past_meetings: Callable[[NationalPlayerID, NationalPlayerID], int] = None
         # utility
         self.player_ranks: dict[NationalPlayerID, tuple[int, float]] = {}
+        # tie-breaks are updated each time a match ends
+        self._tie_breaks: TieBreakBoard = TieBreakBoard()
+        for p in self.participants:
+            self._tie_breaks.add_player(p.id())
 
         # update _player_opponents_data
         for rnd in self.rounds:
@@ -266,6 +479,7 @@ class Tournament:
             for mtch in rnd.matches:
                 self._player_opponents[mtch.player1().id()].append(mtch.player2().id())
                 self._player_opponents[mtch.player2().id()].append(mtch.player1().id())
+        self._tie_breaks.rebuild(self.rounds)
 
         self._update_state()
         if participants and self.has_started() and len(participants) % 2 > 0:
@@ -284,16 +498,20 @@ class Tournament:
 
         Fails if the tournament has already started.
         """
-        if self.has_started():
-            raise Exception(
-                "Trying to add a participant when tournament has already started."
-            )
-        if player not in self.participants:
-            self.participants.append(player)
-            self._player_opponents[player.id()] = []
-            return True
-        else:
-            return False
+        with self._round_transition():
+            if self.has_started():
+                raise Exception(
+                    "Trying to add a participant when tournament has already started."
+                )
+            if player not in self.participants:
+                self.participants.append(player)
+                self._player_opponents[player.id()] = []
+                self._tie_breaks.add_player(player.id())
+                self._version += 1
+                self._record_event(PARTICIPANT_REGISTERED, player_id=str(player.id()))
+                return True
+            else:
+                return False
 
     def player_is_registered(self, player_id: str) -> bool:
         """Checks if a player is already registered in this tournament."""
@@ -304,15 +522,17 @@ class Tournament:
 
         Fails if the tournament has already started or ended.
         """
-        if self.has_started():
-            raise Exception(
-                "Trying to changing Round count when tournament has aldready started."
-            )
-        round_count = int(round_count)
-        if round_count <= 0:
-            raise ValueError("Invalid rounds count.")
-        self.metadata.round_count = round_count
-        self.rounds = [None for _ in range(self.metadata.round_count)]
+        with self._round_transition():
+            if self.has_started():
+                raise Exception(
+                    "Trying to changing Round count when tournament has aldready started."
+                )
+            round_count = int(round_count)
+            if round_count <= 0:
+                raise ValueError("Invalid rounds count.")
+            self.metadata.round_count = round_count
+            self.rounds = [None for _ in range(self.metadata.round_count)]
+            self._version += 1
 
     def set_start_date(self, new_date: date):
         """Sets the start date. Fails if the tournament has started."""
@@ -354,12 +574,86 @@ class Tournament:
             return "ended"
         return "(status unknown)"
 
+    def set_thread_safe(self, enabled: bool = True):
+        """Enables or disables locking, for tournaments updated by several threads at once.
+
+        - participant registrations and round transitions lock the whole tournament,
+        - starting or ending a match locks this match, and waits for running round transitions,
+        - the recording of events and tie-breaks, and the score board update, are serialized by a state lock,
+        - consistent reads (asdict(), snapshot(), stores) lock the whole tournament (see consistent_read()).
+
+        Matches of the current round may then be started and ended concurrently:
+        only the short updates of the shared state wait for each other.
+        Do not change this setting while other threads use the tournament.
+        """
+        self.thread_safe = bool(enabled)
+        if self.thread_safe and self._transition_lock is None:
+            self._transition_lock = SharedExclusiveLock()
+            self._match_locks = KeyedLocks()
+            self._state_lock = threading.RLock()
+
+    def _round_transition(self):
+        """Context for changes of the participants or rounds: excludes all other updates."""
+        return self._transition_lock.exclusive() if self.thread_safe else nullcontext()
+
+    @contextmanager
+    def _match_operation(self, match_index: int):
+        """Context for updates of a match in the current round: excludes round transitions
+        and other updates of the same match."""
+        if not self.thread_safe:
+            yield
+            return
+        with self._transition_lock.shared(), self._match_locks[(self.current_round_idx, match_index)]:
+            yield
+
+    def _state_update(self):
+        """Context for updates of the state shared by all matches."""
+        return self._state_lock if self.thread_safe else nullcontext()
+
+    @contextmanager
+    def consistent_read(self):
+        """Context for reads of a consistent state: waits for running round transitions and match updates,
+        and excludes them until the read ends."""
+        if not self.thread_safe:
+            yield
+            return
+        with self._transition_lock.exclusive(), self._state_lock:
+            yield
+
+    def _refresh_state(self):
+        """Updates the state of this tournament if it changed since the last update."""
+        with self._state_update():
+            if self._state_version != self.version():
+                self._update_state()
+
+    def _record_event(self, event_type: str, **data):
+        if self.record_events:
+            self._pending_events.append({"type": event_type, **data})
+
+    def pop_events(self) -> list[dict]:
+        """Returns and forgets the events recorded since the last call."""
+        events, self._pending_events = self._pending_events, []
+        return events
+
+    def version(self) -> tuple:
+        """Version of this tournament: changes each time the tournament or one of its rounds changes."""
+        return (
+            self._version,
+            len(self.participants),
+            self.current_round_idx,
+            tuple((id(rnd), rnd.version) if rnd is not None else None for rnd in self.rounds),
+        )
+
+    @traced("model update_state")
     def _update_state(self):
         """Update state and meta-data of this tournament:
         scoreboard, status, end_date..."""
+        # read the version first: matches ended meanwhile will trigger another update
+        version = self.version()
         self.update_score_board()
         self.update_end_date()
         self.metadata.status = self.status()
+        self._state_version = version
 
     def update_end_date(self):
         """Update the end date of this tournament."""
@@ -379,14 +673,81 @@ class Tournament:
                 total += m.player_score(player_id) or 0.0
         return total
 
+    def tie_breaks(self, player_id: NationalPlayerID) -> TieBreakScores:
+        """Returns the tie-break scores of one player."""
+        return self._tie_breaks.tie_breaks(player_id)
+
     def ranking_list(self) -> list[tuple[NationalPlayerID, int, float]]:
-        """Returns the current ranking list"""
-        if self.has_started():
-            return [
-                (pid, rank, score) for (pid, (rank, score)) in self.player_ranks.items()
-            ]
-        else:
+        """Returns the current ranking list, sorted by rank.
+
+        Players with equal scores are ranked by their tie-break scores
+        (see the tiebreak module). Players remain tied only when all their
+        tie-break scores are equal.
+        """
+        if not self.has_started():
             return [(p, 1, 0.0) for p in self.participants]
+        sort_keys = {
+            pid: (score,) + self._tie_breaks.tie_breaks(pid).sort_key()
+            for (pid, (_, score)) in self.player_ranks.items()
+        }
+        ranked_ids = sorted(sort_keys, key=lambda pid: sort_keys[pid], reverse=True)
+        ranking_list = []
+        rank = 0
+        previous_key = None
+        for pid in ranked_ids:
+            if sort_keys[pid] != previous_key:
+                rank += 1
+                previous_key = sort_keys[pid]
+            ranking_list.append((pid, rank, self.player_ranks[pid][1]))
+        return ranking_list
+
+    def snapshot(self) -> TournamentSnapshot:
+        """Returns an immutable view of the current state of this tournament (see the snapshots module).
+
+        Snapshots are cached until the tournament or its metadata change,
+        and share the snapshots of unchanged rounds.
+        """
+        with self.consistent_read():
+            version = self.version()
+            cached = self._snapshot
+            if cached is not None and cached.version == version and cached.metadata == self.metadata:
+                return cached
+            if self._state_version != version:
+                self._update_state()
+            self._snapshot = TournamentSnapshot(
+                metadata=replace(self.metadata),
+                participants=tuple(self.participants),
+                rounds=tuple(rnd.snapshot() if rnd is not None else None for rnd in self.rounds),
+                current_round_idx=self.current_round_idx,
+                version=version,
+                ranking=tuple(self.ranking_list()),
+                player_ranks=MappingProxyType(dict(self.player_ranks)),
+                tie_break_scores=MappingProxyType({p.id(): self.tie_breaks(p.id()) for p in self.participants}),
+            )
+            return self._snapshot
+
+    def project_standings(
+        self, max_exact: int = MAX_EXACT_MATCHES, samples: int = DEFAULT_SAMPLES, seed: int = None
+    ) -> StandingsProjection:
+        """Projects the final standings, given the matches remaining in the current round
+        (see the projection module).
+
+        Rounds that are not set up yet can't be projected: the projection
+        is only final during the last round.
+        """
+        remaining = (self.running_matches() or []) + (self.pending_matches() or [])
+        if self.current_round_idx is None:
+            rounds_left = len(self.rounds)
+        else:
+            rounds_left = len(self.rounds) - self.current_round_idx - 1
+        return project_standings(
+            scores={p.id(): self.player_ranks.get(p.id(), (None, 0.0))[1] for p in self.participants},
+            remaining_matches=[(m.player1().id(), m.player2().id()) for _, m in remaining],
+            max_exact=max_exact,
+            samples=samples,
+            rounds_left=rounds_left,
+            rng=random.Random(seed),
+        )
 
     def can_start(self) -> bool:
         """Return True if calling the start_next_round is valid."""
@@ -404,39 +765,51 @@ class Tournament:
             return False
         return True
 
-    def start_next_round(self, player_pairs: list[tuple[Player, Player]] = None) -> Round:
+    def start_next_round(
+        self, player_pairs: list[tuple[Player, Player]] = None, start_date: date = None
+    ) -> Round:
         """Fails if the current Round is still open or if the last Round
         has started or ended.
-        """
-        if self.current_round_idx == len(self.rounds) - 1:
-            raise Exception("Trying to start new Round after last Round.")
-        if (self.current_round_idx or 0) > 0 and not self.rounds[
-            self.current_round_idx
-        ].has_ended():
-            raise Exception("Trying to start new Round when current Round has not ended.")
-        if self.has_ended():
-            raise Exception("Trying to start new Round after tournament has ended.")
-        if len(self.participants) % 2 > 0:
-            raise ValueError("Even participant number required.")
 
-        self.current_round_idx = (
-            self.current_round_idx + 1 if self.current_round_idx is not None else 0
-        )
-        # staring a torunament:
-        # update start date with actual date where first Round got started.
-        if self.current_round_idx == 0:
-            self.metadata.start_date = date.today()
-            self._update_state()
-        self.rounds[self.current_round_idx] = Round(
-            name=f"Round {self.current_round_idx + 1}"
-        )
-        if player_pairs is None:
-            player_pairs = self._make_player_pairs()
-        self.rounds[self.current_round_idx].setup(player_pairs)
-        for p1, p2 in player_pairs:
-            self._player_opponents[p1.id()].append(p2.id())
-            self._player_opponents[p2.id()].append(p1.id())
-        return self.current_round()
+        When starting the first round, the tournament start date is set to start_date (defaults to today).
+        """
+        with self._round_transition():
+            if self.current_round_idx == len(self.rounds) - 1:
+                raise Exception("Trying to start new Round after last Round.")
+            if (self.current_round_idx or 0) > 0 and not self.rounds[
+                self.current_round_idx
+            ].has_ended():
+                raise Exception("Trying to start new Round when current Round has not ended.")
+            if self.has_ended():
+                raise Exception("Trying to start new Round after tournament has ended.")
+            if len(self.participants) % 2 > 0:
+                raise ValueError("Even participant number required.")
+
+            self.current_round_idx = (
+                self.current_round_idx + 1 if self.current_round_idx is not None else 0
+            )
+            # staring a torunament:
+            # update start date with actual date where first Round got started.
+            if self.current_round_idx == 0:
+                self.metadata.start_date = start_date or date.today()
+                self._update_state()
+            self.rounds[self.current_round_idx] = Round(
+                name=f"Round {self.current_round_idx + 1}"
+            )
+            self._version += 1
+            if player_pairs is None:
+                player_pairs = self._make_player_pairs()
+            self.rounds[self.current_round_idx].setup(player_pairs)
+            for p1, p2 in player_pairs:
+                self._player_opponents[p1.id()].append(p2.id())
+                self._player_opponents[p2.id()].append(p1.id())
+            self._record_event(
+                ROUND_STARTED,
+                round_idx=self.current_round_idx,
+                start_date=self.metadata.start_date.isoformat(),
+                pairs=[[str(p1.id()), str(p2.id())] for p1, p2 in player_pairs],
+            )
+            return self.current_round()
 
     def current_round(self) -> Round:
         """Returns the current Round, if any.
@@ -453,11 +826,7 @@ class Tournament:
                 return None
             if current_round.has_ended():
                 return None
-            return [
-                (m, match)
-                for m, match in enumerate(current_round.matches)
-                if not match.has_started()
-            ]
+            return [(m, current_round.matches[m]) for m in current_round.pending_indexes()]
         else:
             return None
 
@@ -466,13 +835,7 @@ class Tournament:
         in this tournament's current round.
         """
         if current_round := self.current_round():
-            if not current_round.has_started():
-                return False
-            if current_round.has_ended():
-                return False
-            for m in current_round.matches:
-                if not m.has_started():
-                    return True
+            return current_round.pending_count() > 0
         return False
 
     def start_a_match(self, match_index: int, start_time: datetime = None) -> Match:
@@ -482,23 +845,31 @@ class Tournament:
         Fails if start_time is inconsistent with other tournament dates and times:
         - start times of round n+1 must be greater than all end_times of round n.
         """
-        if current_round := self.current_round():
-            if not current_round.has_started():
-                raise Exception("No matches are set up in this round.")
-            if current_round.has_ended():
-                raise Exception("Current round has already ended.")
-            if self.current_round_idx > 0 and start_time < self.rounds[self.current_round_idx-1].latest_end_time():
-                raise ValueError("Invalid start_time (should be greater than latest end time in previous round).")
-            current_round.matches[match_index].start(start_time=start_time)
-            #
-            # if the tournament just started, also update the start date
-            #
-            if self.current_round_idx == 0:
-                if self.start_date().strftime("%Y-%m-%d") != start_time.strftime("%Y-%m-%d"):
-                    self.metadata.start_date = date.fromisoformat(start_time.strftime("%Y-%m-%d"))
-            return current_round.matches[match_index]
-        else:
-            raise Exception("No current running round.")
+        with self._match_operation(match_index):
+            if current_round := self.current_round():
+                if not current_round.has_started():
+                    raise Exception("No matches are set up in this round.")
+                if current_round.has_ended():
+                    raise Exception("Current round has already ended.")
+                if self.current_round_idx > 0 and start_time < self.rounds[self.current_round_idx-1].latest_end_time():
+                    raise ValueError("Invalid start_time (should be greater than latest end time in previous round).")
+                current_round.matches[match_index].start(start_time=start_time)
+                with self._state_update():
+                    self._record_event(
+                        MATCH_STARTED,
+                        round_idx=self.current_round_idx,
+                        match_idx=match_index,
+                        start_time=current_round.matches[match_index].start_time.isoformat(),
+                    )
+                    #
+                    # if the tournament just started, also update the start date
+                    #
+                    if self.current_round_idx == 0:
+                        if self.start_date().strftime("%Y-%m-%d") != start_time.strftime("%Y-%m-%d"):
+                            self.metadata.start_date = date.fromisoformat(start_time.strftime("%Y-%m-%d"))
+                return current_round.matches[match_index]
+            else:
+                raise Exception("No current running round.")
 
     def running_matches(self) -> list[tuple[int, Match]]:
         """Returns a list of pending matches and their index in the current round."""
@@ -507,46 +878,70 @@ class Tournament:
                 return None
             if current_round.has_ended():
                 return None
-            return [
-                (m, match)
-                for m, match in enumerate(current_round.matches)
-                if (match.has_started() and not match.has_ended())
-            ]
+            return [(m, current_round.matches[m]) for m in current_round.running_indexes()]
         else:
             return None
 
     def has_running_matches(self) -> bool:
         """Returns True if macthes are waiting to be ended in this tournament's curren round."""
         if current_round := self.current_round():
-            if not current_round.has_started():
-                return False
-            if current_round.has_ended():
-                return False
-            for match in current_round.matches:
-                if match.has_started() and not match.has_ended():
-                    return True
-        else:
-            return False
+            return current_round.running_count() > 0
+        return False
 
     def end_a_match(
-        self, match_index: int, winner_id: str, end_time: datetime = None
+        self, match_index: int, winner_id: str, end_time: datetime = None, update_state: bool = True
     ) -> tuple[tuple[Player, float], tuple[Player, float]]:
         """Ends a match in the current Round.
         Returns the result, None otherwise.
 
         Fails if end_time is inconsistent or winner_id is unknown.
+        Set update_state to False to defer the update of the score board (see end_matches()).
         """
-        if current_round := self.current_round():
-            if not current_round.has_started():
-                return None
-            if current_round.has_ended():
+        with self._match_operation(match_index):
+            if current_round := self.current_round():
+                if not current_round.has_started():
+                    return None
+                if current_round.has_ended():
+                    return None
+                match = current_round.matches[match_index]
+                event_type = OUTCOME_CORRECTED if match.has_ended() else MATCH_ENDED
+                result = match.end(winner=winner_id, end_time=end_time)
+                with self._state_update():
+                    self._record_event(
+                        event_type,
+                        round_idx=self.current_round_idx,
+                        match_idx=match_index,
+                        winner_id=str(winner_id) if winner_id is not None else None,
+                        end_time=match.end_time.isoformat(),
+                    )
+                    self._tie_breaks.record_match(self.current_round_idx, match_index, match)
+                if update_state:
+                    self._refresh_state()
+                return result
+            else:
                 return None
-            match = current_round.matches[match_index]
-            result = match.end(winner=winner_id, end_time=end_time)
-            self._update_state()
-            return result
-        else:
-            return None
+
+    def end_matches(
+        self, results: list[tuple[int, str, datetime]]
+    ) -> list[tuple[tuple[Player, float], tuple[Player, float]]]:
+        """Ends several matches of the current Round at once.
+
+        results lists the match index, winner_id and end_time of each match.
+        All results are checked first: if one of them is invalid, no match is ended.
+        The score board is updated once, after all matches have ended.
+        """
+        if current_round := self.current_round():
+            for match_index, winner_id, end_time in results:
+                current_round.matches[match_index].check_end(winner=winner_id, end_time=end_time)
+        ended = []
+        try:
+            for match_index, winner_id, end_time in results:
+                ended.append(
+                    self.end_a_match(match_index, winner_id=winner_id, end_time=end_time, update_state=False)
+                )
+        finally:
+            self._refresh_state()
+        return ended
 
     def update_score_board(self) -> list[tuple[Player, int, float]]:
         """Maintain a scores board and score ranks."""
@@ -577,6 +972,7 @@ class Tournament:
         """
         return self.player_ranks.get(player_id, (None, None))[0]
 
+    @traced("model pairing")
     def _make_player_pairs(self) -> list[tuple[Player, Player]]:
         """Makes the player pairs for the next Round, basing on their current scores.
 
@@ -585,11 +981,22 @@ class Tournament:
         """
         if not self.has_started():
             player_order = [p for p in self.participants]
-            random.shuffle(player_order)
-            return [
-                (player_order[p], player_order[p + 1])
-                for p in range(0, len(player_order), 2)
-            ]
+            best_pairs, best_repeats = None, None
+            # with past meetings known, draw a few times and keep the draw with the fewest repeated pairs
+            for _ in range(PAST_MEETINGS_DRAWS if self.past_meetings is not None else 1):
+                random.shuffle(player_order)
+                pairs = [
+                    (player_order[p], player_order[p + 1])
+                    for p in range(0, len(player_order), 2)
+                ]
+                if self.past_meetings is None:
+                    return pairs
+                repeats = sum(1 for p1, p2 in pairs if self.past_meetings(p1.id(), p2.id()) > 0)
+                if best_repeats is None or repeats < best_repeats:
+                    best_pairs, best_repeats = pairs, repeats
+                if repeats == 0:
+                    break
+            return best_pairs
 
         logger.debug(f"Making player pairs for Round {self.current_round_idx}...")
         # we just base on ranking list to start with
@@ -607,7 +1014,9 @@ class Tournament:
                              quality = {self._can_play(player.id(), matching_player.id())}"
                 )
                 pairs.append((player, matching_player))
-                if matching_player.id() in self._player_opponents.get(player.id()):
+                if matching_player.id() in self._player_opponents.get(player.id()) or (
+                    self.past_meetings is not None and self.past_meetings(player.id(), matching_player.id()) > 0
+                ):
                     # these two players already met before, we'll try to fix this later
                     # (see below)
                     recurring_matches.append(len(pairs) - 1)
@@ -679,7 +1088,8 @@ class Tournament:
         """Check if two players may play together.
         Return 0 if the players ranks ar incompatible.
         returns an float value above 0 otherwise.
-        value is below 0 if both players have already played before.
+        value is below 1 if both players have already played before.
+        Meetings in other tournaments (see past_meetings) weigh half as much as meetings in this tournament.
         """
         player1_rank = self.player_rank(player1_id)
         player2_rank = self.player_rank(player2_id)
@@ -692,6 +1102,8 @@ class Tournament:
                     if x == player1_id
                 ]
             )
+            if self.past_meetings is not None:
+                encounters += 0.5 * self.past_meetings(player1_id, player2_id)
             return 1 / (1 + encounters)
         else:
             return 0
@@ -702,23 +1114,29 @@ class Tournament:
     def end_date(self) -> date:
         return self.metadata.end_date
 
+    @traced("model tournament asdict")
     def asdict(self) -> dict:
         """Copies all the data of this tournament into a new dict object.
         Useful when exporting to JSON.
         Player objects are converted to their National Player ID.
+
+        Round data is cached by each round (see Round.asdict()):
+        only the rounds that changed since the last call are serialized again.
         """
-        self._update_state()
-        return {
-            "tournament_id": self.id(),
-            "metadata": self.metadata.asdict(),
-            "participants": [str(p.id()) for p in self.participants],
-            "current_round_idx": (
-                int(self.current_round_idx)
-                if self.current_round_idx is not None
-                else None
-            ),
-            "rounds": [t.asdict() if t is not None else None for t in self.rounds],
-        }
+        with self.consistent_read():
+            if self._state_version != self.version():
+                self._update_state()
+            return {
+                "tournament_id": self.id(),
+                "metadata": self.metadata.asdict(),
+                "participants": [str(p.id()) for p in self.participants],
+                "current_round_idx": (
+                    int(self.current_round_idx)
+                    if self.current_round_idx is not None
+                    else None
+                ),
+                "rounds": [t.asdict() if t is not None else None for t in self.rounds],
+            }
 
 
 class TournamentMetaDataJSONEncoder(json.JSONEncoder):
@@ -757,6 +1175,7 @@ class TournamentMetaDataJSONDecoder(json.JSONDecoder):
             data_file=dct["data_file"],
             round_count=int(dct["round_count"]),
             status=dct["status"],
+            rated=bool(dct.get("rated", False)),
         )
 
 
@@ -766,18 +1185,71 @@ class TournamentRepository:
     data/tournaments/tournament_<tournament_id>.json stores the participants,
     Round and match data for tournament tournament_id.
 
+    With event_sourcing, changes are appended to data/tournaments/tournament_<tournament_id>.events.jsonl
+    (see the tournament_events module), and the tournament data file is only rewritten as a snapshot
+    every snapshot_interval events.
+
+    With thread_safe, tournaments are loaded or stored with locking enabled (see Tournament.set_thread_safe()),
+    and stores are serialized.
+
+    While deferred is set, stored tournaments are only updated in memory, and written to file by flush()
+    (see the unit_of_work module).
+
+    With lazy set, the tournament index is only decoded when first needed.
+
+    With warm_cache set, the decoded tournament index and tournament files are kept in a warm-start cache
+    (see the warm_cache module). Tournaments themselves are rebuilt from the cached data,
+    as they share their players with the player repository.
     """
 
-    def __init__(self, metadata_file: str | Path, player_repo: PlayerRepository):
+    def __init__(
+        self,
+        metadata_file: str | Path,
+        player_repo: PlayerRepository,
+        event_sourcing: bool = False,
+        snapshot_interval: int = 50,
+        thread_safe: bool = False,
+        lazy: bool = False,
+        warm_cache: bool = False,
+    ):
         self._tournament_dir = Path(Path(metadata_file).parent).resolve()
         self._metadata_repo = JSONRepository(
             file=metadata_file,
             encoder=TournamentMetaDataJSONEncoder,
             decoder=TournamentMetaDataJSONDecoder,
+            lazy=lazy,
+            warm_cache=warm_cache,
         )
+        self.warm_cache: bool = warm_cache
         # link to json file storing tournament details
         self.player_repo: PlayerRepository = player_repo
         self._tournament_data: dict[str, Tournament] = {}
+        # version and metadata of each tournament, as last stored or loaded.
+        self._stored_versions: dict[str, tuple[tuple, dict]] = {}
+        self.event_sourcing: bool = event_sourcing
+        self.snapshot_interval: int = max(1, int(snapshot_interval))
+        # sequence number of the last event logged, and of the last event included in the snapshot
+        self._event_seqs: dict[str, tuple[int, int]] = {}
+        self.thread_safe: bool = thread_safe
+        self._store_lock = threading.RLock() if thread_safe else nullcontext()
+        # tournaments stored while deferred, not written to file yet
+        self._deferred_stores: dict[str, Tournament] = {}
+
+    @property
+    def deferred(self) -> bool:
+        return self._metadata_repo.deferred
+
+    @deferred.setter
+    def deferred(self, deferred: bool):
+        self._metadata_repo.deferred = deferred
+
+    def flush(self):
+        """Writes the tournaments stored while deferred, and the tournament index."""
+        with self._store_lock:
+            deferred_stores, self._deferred_stores = self._deferred_stores, {}
+            for tournament in deferred_stores.values():
+                self._write_tournament(tournament)
+            self._metadata_repo.flush()
 
     def list_tournament_meta(self) -> list[TournamentMetaData]:
         return self._metadata_repo.list_all()
@@ -793,29 +1265,118 @@ class TournamentRepository:
             metadata.set_id(self.gen_tournament_id())
         self._metadata_repo.add(metadata)
 
+    def tournament_file(self, metadata: TournamentMetaData) -> Path:
+        """Path to the file storing the data of a tournament."""
+        return Path(self._tournament_dir, metadata.data_file)
+
+    def event_log(self, metadata: TournamentMetaData) -> TournamentEventLog:
+        """Event log of a tournament, stored next to its data file."""
+        data_file = self.tournament_file(metadata)
+        return TournamentEventLog(data_file.with_name(data_file.stem + ".events.jsonl"))
+
+    def set_rated(self, tournament_id: str):
+        """Flags a tournament as taken into account in the player ratings."""
+        if metadata := self.find_tournament_metadata_by_id(tournament_id):
+            if not metadata.rated:
+                metadata.rated = True
+                self._metadata_repo.update(metadata)
+                self._metadata_repo.commit_changes()
+
+    @traced("repository store_tournament")
     def store_tournament(self, tournament: Tournament) -> bool:
         """Store a tournament.
         Tournament metadata is stored in a unique file with all other tournament metadata objects,
         while tournament rounds data is stored in separate files in the data/tournaments folder.
         Tournament Round data files are named after the tournament id.
+
+        Storing a tournament that has not changed since it was last stored or loaded does nothing.
+
+        With event sourcing, the events recorded since the last store are appended to the tournament's event log,
+        and a snapshot of the tournament is written on first store, then every snapshot_interval events.
         """
+        with self._store_lock:
+            return self._store_tournament(tournament)
+
+    def _store_tournament(self, tournament: Tournament) -> bool:
+        if self.thread_safe and not tournament.thread_safe:
+            tournament.set_thread_safe()
         if not tournament.id() or not tournament.metadata.id():
             tournament.set_id(self.gen_tournament_id())
         if not tournament.metadata.data_file:
             tournament.metadata.data_file = tournament.id() + ".json"
+        if self._is_stored(tournament):
+            return True
         if not tournament.id() in self._tournament_data:
             self._tournament_data[tournament.id()] = tournament
+        stored_metadata = self._stored_versions.get(tournament.id(), (None, None))[1]
         if not self.find_tournament_metadata_by_id(tournament.metadata.id()):
             self._metadata_repo.add(tournament.metadata)
-        else:
+            self._metadata_repo.commit_changes()
+        elif tournament.metadata.asdict() != stored_metadata or not self.event_sourcing:
             self._metadata_repo.update(tournament.metadata)
-        self._metadata_repo.commit_changes()
-        tournament_dump_data = tournament.asdict()
-        o_file = Path(self._tournament_dir, tournament.metadata.data_file)
-        with open(o_file, "w", encoding="utf8") as json_file:
-            json.dump(tournament_dump_data, json_file, indent=True)
+            self._metadata_repo.commit_changes()
+        if self.deferred:
+            self._deferred_stores[tournament.id()] = tournament
+        else:
+            self._write_tournament(tournament)
         return True
 
+    def _write_tournament(self, tournament: Tournament):
+        with tournament.consistent_read():
+            self._write_consistent_tournament(tournament)
+
+    def _write_consistent_tournament(self, tournament: Tournament):
+        if self.event_sourcing:
+            self._store_events(tournament)
+        else:
+            self._write_tournament_file(tournament, tournament.asdict())
+        self._stored_versions[tournament.id()] = (tournament.version(), tournament.metadata.asdict())
+
+    def _store_events(self, tournament: Tournament):
+        """Appends the pending events of a tournament to its log, and takes a snapshot when due.
+
+        A snapshot is also taken when the tournament changed without recording events
+        (for instance, when events were not recorded yet).
+        """
+        events = tournament.pop_events()
+        tournament.record_events = True
+        log = self.event_log(tournament.metadata)
+        last_seq, snapshot_seq = self._event_seqs.get(tournament.id(), (0, None))
+        last_seq = log.append(events, last_seq)
+        if (
+            snapshot_seq is None
+            or not events
+            or last_seq - snapshot_seq >= self.snapshot_interval
+            or not self.tournament_file(tournament.metadata).exists()
+        ):
+            snapshot = {**tournament.asdict(), "event_seq": last_seq, "event_offset": log.size()}
+            self._write_tournament_file(tournament, snapshot)
+            snapshot_seq = last_seq
+        self._event_seqs[tournament.id()] = (last_seq, snapshot_seq)
+
+    @traced("storage write_tournament_file")
+    def _write_tournament_file(self, tournament: Tournament, data: dict):
+        """Writes the tournament data file, through a temporary file so that a crash never leaves it half-written."""
+        o_file = self.tournament_file(tournament.metadata)
+        tmp_file = o_file.with_name(o_file.name + ".tmp")
+        if self.warm_cache:
+            content = json.dumps(data, indent=True).encode("utf8")
+            with open(tmp_file, "wb") as json_file:
+                json_file.write(content)
+            tmp_file.replace(o_file)
+            warm_cache_files.store_cached(o_file, content, data)
+            return
+        with open(tmp_file, "w", encoding="utf8") as json_file:
+            json.dump(data, json_file, indent=True)
+        tmp_file.replace(o_file)
+
+    def _is_stored(self, tournament: Tournament) -> bool:
+        """True if the tournament has not changed since it was last stored or loaded."""
+        return (
+            self._stored_versions.get(tournament.id()) == (tournament.version(), tournament.metadata.asdict())
+            and self.tournament_file(tournament.metadata).exists()
+        )
+
     def gen_tournament_id(self) -> str:
         """Generates a UUID to identify a tournament."""
         return str(uuid.uuid4())
@@ -827,20 +1388,40 @@ class TournamentRepository:
         else:
             return self.load_tournament(tournament_id)
 
+    def is_loaded(self, tournament_id) -> bool:
+        """True if the data of a tournament is held in memory."""
+        return tournament_id in self._tournament_data
+
+    def release_tournament(self, tournament_id):
+        """Forgets the in-memory data of a tournament: it will be loaded again from file when needed.
+
+        Changes that were not stored are lost. Deferred stores of the tournament are written first.
+        """
+        with self._store_lock:
+            if tournament := self._deferred_stores.pop(tournament_id, None):
+                self._write_tournament(tournament)
+        self._tournament_data.pop(tournament_id, None)
+        self._stored_versions.pop(tournament_id, None)
+        self._event_seqs.pop(tournament_id, None)
+
+    @traced("repository load_tournament")
     def load_tournament(self, tournament_id) -> Tournament:
         """Loads a tournament from file (if found)"""
         meta = self.find_tournament_metadata_by_id(tournament_id=tournament_id)
         if not meta:
             return None
-        tournament_file = Path(self._tournament_dir, meta.data_file)
+        tournament_file = self.tournament_file(meta)
         if not tournament_file.exists():
             # Empty tournament
-            self._tournament_data[tournament_id] = Tournament(metadata=meta)
+            self._tournament_data[tournament_id] = Tournament(metadata=meta, thread_safe=self.thread_safe)
             return self._tournament_data[tournament_id]
 
         # load data from a JSON:
-        with open(tournament_file, "r", encoding="utf8") as json_file:
-            data: dict = json.load(json_file)
+        if self.warm_cache:
+            data: dict = warm_cache_files.read_decoded(tournament_file, json.loads)
+        else:
+            with open(tournament_file, "r", encoding="utf8") as json_file:
+                data: dict = json.load(json_file)
         if data.get("tournament_id") != tournament_id:
             raise KeyError(
                 "Unexpected or missing tournament id while loading tournament data file."
@@ -860,13 +1441,28 @@ class TournamentRepository:
                 rounds.append(
                     self._load_round(data=t, participants_index=participants_index)
                 )
-        self._tournament_data[tournament_id] = Tournament(
+        tournament = Tournament(
             metadata=meta,
             participants=list(participants_index.values()),
             rounds=rounds,
             current_round=current_round,
+            thread_safe=self.thread_safe,
         )
-        return self._tournament_data[tournament_id]
+        if self.event_sourcing:
+            self._replay_events(tournament, data)
+        self._tournament_data[tournament_id] = tournament
+        self._stored_versions[tournament_id] = (tournament.version(), data.get("metadata"))
+        return tournament
+
+    def _replay_events(self, tournament: Tournament, snapshot: dict):
+        """Replays the events logged after a snapshot of the tournament."""
+        snapshot_seq = int(snapshot.get("event_seq", 0))
+        last_seq = snapshot_seq
+        for event in self.event_log(tournament.metadata).read(int(snapshot.get("event_offset", 0)), snapshot_seq):
+            apply_event(tournament, event, self.player_repo.find_by_id)
+            last_seq = event["seq"]
+        tournament.record_events = True
+        self._event_seqs[tournament.id()] = (last_seq, snapshot_seq)
 
     def _load_round(self, data: dict, participants_index: dict[str, Player]):
         """Load a Round data from a dict."""
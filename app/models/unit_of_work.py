@@ -0,0 +1,56 @@
+"""Deferred persistence for bulk operations.
+
+By default, repositories write their data to file on each change.
+Within a unit of work, the writes are deferred: changes are kept in memory,
+and written at once when the unit of work is flushed (at the end, or every flush_every steps).
+"""
+
+import logging
+
+logger = logging.getLogger()
+
+
+class UnitOfWork:
+    """Defers the writes of several repositories.
+
+    Repositories (or other stores) must have a deferred attribute and a flush() method
+    (see JSONRepository, TournamentRepository and HeadToHeadIndex).
+
+    Usage:
+
+        with UnitOfWork(player_repo, tournament_repo, flush_every=100) as uow:
+            for cmd in commands:
+                cmd.execute()
+                uow.step()
+    """
+
+    def __init__(self, *stores: object, flush_every: int = 0):
+        self.stores: list[object] = [s for s in stores if s is not None]
+        self.flush_every: int = max(0, int(flush_every or 0))
+        self.steps: int = 0
+        self.flushes: int = 0
+
+    def __enter__(self) -> "UnitOfWork":
+        for store in self.stores:
+            store.deferred = True
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            self.flush()
+        finally:
+            for store in self.stores:
+                store.deferred = False
+
+    def step(self):
+        """Counts a unit of work (for instance, a command), and flushes every flush_every steps."""
+        self.steps += 1
+        if self.flush_every and self.steps % self.flush_every == 0:
+            self.flush()
+
+    def flush(self):
+        """Writes the pending changes of all repositories."""
+        logger.debug(f"Flushing {len(self.stores)} repositories after {self.steps} steps")
+        for store in self.stores:
+            store.flush()
+        self.flushes += 1
@@ -39,12 +39,14 @@ class PlayersReportHTML(HTMLBaseView):
                     line("th", "Player ID")
                     line("th", "Name")
                     line("th", "Birthdate")
+                    line("th", "Rating")
             with tag("tbody"):
                 for row in player_list:
                     with tag("tr"):
                         line("td", row.get("national_player_id"))
                         line("td", f"{row.get('surname', "-").upper()} {row.get('name', "-").capitalize()}")
                         line("td", formatdate(row.get('birthdate'), "%d/%m/%Y", "-"))
+                        line("td", f"{row['rating']:.0f}" if row.get('rating') is not None else "-")
         return doc.getvalue()
 
 
@@ -265,8 +267,12 @@ class TournamentReportHTML(HTMLBaseView):
                             line("th", "Rank")
                             line("th", "Player")
                             line("th", "Score")
+                            line("th", "Buchholz")
+                            line("th", "Median Buchholz")
+                            line("th", "Sonneborn-Berger")
+                            line("th", "Cumulative")
                     with tag("tbody"):
-                        for p_rank, player, p_score in ranking_list:
+                        for p_rank, player, p_score, tie_breaks in ranking_list:
                             player_str = player.get("national_player_id")
                             player_str += f" {player.get("surname", "").upper()}"
                             player_str += f" {player.get("name", "").capitalize()}"
@@ -274,6 +280,10 @@ class TournamentReportHTML(HTMLBaseView):
                                 line("td", str(p_rank))
                                 line("td", player_str)
                                 line("td", str(p_score))
+                                line("td", str(tie_breaks.get("buchholz", "-")))
+                                line("td", str(tie_breaks.get("median_buchholz", "-")))
+                                line("td", str(tie_breaks.get("sonneborn_berger", "-")))
+                                line("td", str(tie_breaks.get("cumulative", "-")))
         #
         # matches
         #
@@ -11,6 +11,7 @@ class MenuOption:
     - command: command to execute when this option is selected
     - alt_key: optional key to select this option. This will set
             a "permanent" key to select this item from the parent menu.
+    - hidden: hidden options are not displayed, but can still be selected with their alt_key.
 
     Note: option keys and alt_keys are case insensitive, ie 'x' and 'X'
     are the same.
@@ -22,11 +23,13 @@ class MenuOption:
         option_value=None,
         command: CommandInterface = None,
         alt_key: str = None,
+        hidden: bool = False,
     ):
         self.text = option_text
         self.value = option_value
         self.command = command
         self.alt_key: str = alt_key.upper() if alt_key is not None else None
+        self.hidden: bool = hidden and self.alt_key is not None
 
 
 class Menu(BaseView):
@@ -71,6 +74,10 @@ class Menu(BaseView):
         opt_lines = []
         for o in range(len(self.options)):
             opt = self.options[o]
+            if opt.hidden:
+                opt_keys[opt.alt_key.upper()] = o
+                opt_keys[opt.alt_key.lower()] = o
+                continue
             opt_key = f"{o + 1}" if opt.alt_key is None else f"{opt.alt_key.upper()}"
             opt_marker = f"({opt_key}) "
             opt_indent = " " * self.indent
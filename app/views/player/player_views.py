@@ -27,6 +27,11 @@ class PlayerView(AbstractView):
         cells = [id_tpl, name_tpl, date_tpl]
         return cells if as_cells else " - ".join(cells)
 
+    @staticmethod
+    def rating_template(playerdata: dict) -> str:
+        rating = playerdata.get('rating')
+        return f"{rating:.0f}" if rating is not None else "-"
+
 
 class PlayerListView(BaseView):
     """View a list of players
@@ -46,8 +51,11 @@ class PlayerListView(BaseView):
 
     @staticmethod
     def player_list_str(players: list[dict]) -> str:
-        p_lines = [PlayerView.player_template(p, as_cells=True) for p in players]
-        return format_table([["Player ID", "Name", "Birthdate"]] + p_lines)
+        p_lines = [
+            PlayerView.player_template(p, as_cells=True) + [PlayerView.rating_template(p)]
+            for p in players
+        ]
+        return format_table([["Player ID", "Name", "Birthdate", "Rating"]] + p_lines)
 
 
 class PlayerEditor(AbstractView):
@@ -1,10 +1,11 @@
 from app.views.views_abc import BaseView, CommandManagerInterface
 from app.views import dialogs
-from app.views.tournament.running_tournament import RoundView
+from app.views.tournament.running_tournament import RoundView, RankingView
 from app.views.tournament.tournament_views import TournamentInfoView
 from app.helpers.text_ui import prompt_v, format_table
 from pathlib import Path
 from app.helpers.validation import is_writable_path
+from app.models.player_model import is_valid_national_player_id
 
 
 class ExportToHTMLDialog(dialogs.Dialog):
@@ -61,12 +62,7 @@ class TournamentReportView(BaseView):
             print("\nParticipants and rankings")
             print("===========================\n")
 
-            table_data = [["Rank", "Participant", "Score"]]
-            for player_rank, player, player_score in ranking_list:
-                player_tpl = f"{player.get("surname").upper()} {player.get("name").capitalize()}\n"
-                player_tpl += f"{player.get("national_player_id")}"
-                table_data.append([str(player_rank), player_tpl, str(player_score)])
-            print(format_table(table_data))
+            print(RankingView.ranking_table_template(ranking_list))
 
         rounds: list[dict] = self.tournament_data.get("rounds", [])
         if len(rounds) > 0:
@@ -81,3 +77,65 @@ class TournamentReportView(BaseView):
                 print(RoundView.matches_table_template(round_data.get("matches", {})))
         elif (self.tournament_data.get("metadata", {}).get("status") == "open"):
             print("(Tournament has not started yet, no round details available)")
+
+
+class HeadToHeadForm(BaseView):
+    """Prompts for the IDs of two players."""
+
+    def __init__(self,
+                 cmd_manager: CommandManagerInterface,
+                 confirm_cmd: dialogs.CommandInterface = None,
+                 cancel_cmd: dialogs.CommandInterface = None):
+        super().__init__(cmd_manager=cmd_manager, title="Head-to-head record",
+                         text="Enter the national IDs of two players (<Enter> to abandon).")
+        self.confirm_cmd = confirm_cmd
+        self.cancel_cmd = cancel_cmd
+
+    def render(self):
+        super().render()
+        player_ids = []
+        for n in (1, 2):
+            player_id = prompt_v(prompt=f"Player {n} ID > ", validator=is_valid_national_player_id, skip_blank=True)
+            if player_id is None:
+                self.issuecmd(self.cancel_cmd)
+                return
+            player_ids.append(player_id)
+        if self.confirm_cmd:
+            self.confirm_cmd.set_command_params(player1_id=player_ids[0], player2_id=player_ids[1])
+            self.issuecmd(self.confirm_cmd)
+
+
+class HeadToHeadView(BaseView):
+    """Displays the record of a player against an opponent, and the list of their meetings."""
+
+    def __init__(
+        self,
+        record_data: dict,
+        meetings_data: list[dict],
+        cmd_manager: CommandManagerInterface = None,
+        title: str = "Head-to-head record",
+    ):
+        super().__init__(cmd_manager=cmd_manager, title=title)
+        self.record_data = record_data
+        self.meetings_data = meetings_data
+
+    def render(self):
+        super().render()
+        player = self.record_data.get("player", {})
+        opponent = self.record_data.get("opponent", {})
+        print(f"{player.get("surname", "").upper()} {player.get("name", "").capitalize()}"
+              f" ({self.record_data.get("player_id")})"
+              f" vs {opponent.get("surname", "").upper()} {opponent.get("name", "").capitalize()}"
+              f" ({self.record_data.get("opponent_id")})\n")
+        table = [["Meetings", "Wins", "Draws", "Losses", "Last meeting"]]
+        table.append([str(self.record_data.get(k) or "-")
+                      for k in ("meetings", "wins", "draws", "losses", "last_meeting")])
+        print(format_table(table))
+        if self.meetings_data:
+            print("\nMeetings")
+            print("========\n")
+            table = [["Date", "Tournament", "Round", "Score"]]
+            for meeting in self.meetings_data:
+                table.append([meeting.get("date"), meeting.get("tournament"),
+                              str(meeting.get("round")), str(meeting.get("score"))])
+            print(format_table(table))
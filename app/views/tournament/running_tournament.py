@@ -269,14 +269,81 @@ class EndMatchForm(BaseView):
             self.issuecmd(self.confirm_cmd)
 
 
+class EndMatchesForm(BaseView):
+    """Displays a form to end several matches at once.
+
+    Prompts for a common end time, then for the outcome of each running match (blank to skip a match).
+    """
+    def __init__(self,
+                 cmd_manager: CommandManagerInterface,
+                 running_matches_data: dict,
+                 confirm_cmd: CommandInterface = None,
+                 cancel_cmd: CommandInterface = None):
+        super().__init__(cmd_manager=cmd_manager, title="End several Matches",
+                         text="Set the end date and time, then the winner of each match.",
+                         clear_scr=True)
+        self.running_matches_data = running_matches_data
+        self.confirm_cmd = confirm_cmd
+        self.cancel_cmd = cancel_cmd
+
+    def render(self):
+        super().render()
+        print(RoundView.matches_table_template(self.running_matches_data))
+        end_time = datetime.now()
+        print(f"Match end time defaults to current time: ({end_time.strftime("%d/%m/%Y %H:%M:%S")}")
+        prompt_str = "hit <Enter> to use default or set custom time ([YYYY-MM-DD ]HH:MM:SS):\nEnd Time > "
+        if u_end_time := prompt_v(prompt=prompt_str,
+                                  validator=lambda x: is_valid_datetime(x) or is_valid_time(x),
+                                  skip_blank=True):
+            if is_valid_datetime(u_end_time):
+                end_time = datetime.fromisoformat(u_end_time)
+            else:
+                today = date.today()
+                end_time = datetime.fromisoformat(f"{today.isoformat()} {u_end_time}")
+        #
+        # Match results:
+        # 1 => player 1 wins
+        # 2 => player 2 wins
+        # 0 => draw
+        # None => skip this match
+        #
+        results = []
+        for match_idx, match_data in self.running_matches_data.items():
+            player1: dict[str, str] = match_data.get("player1")
+            player2: dict[str, str] = match_data.get("player2")
+            winner_prompt = f"Match {int(match_idx)+1}: who won ?"
+            winner_prompt += f" 1 => {player1.get("surname").upper()} {player1.get("name").capitalize()},"
+            winner_prompt += f" 2 => {player2.get("surname").upper()} {player2.get("name").capitalize()},"
+            winner_prompt += " 0 => Draw (<Enter> to skip)\nWinner > "
+            winner_choice = prompt_v(
+                prompt=winner_prompt,
+                validator=lambda x: x in ["0", "1", "2"],
+                skip_blank=True
+            )
+            if winner_choice is None:
+                continue
+            winner = None
+            if int(winner_choice) == 1:
+                winner = player1.get("national_player_id")
+            elif int(winner_choice) == 2:
+                winner = player2.get("national_player_id")
+            results.append({"match_idx": int(match_idx), "winner_id": winner})
+        if not results:
+            self.issuecmd(self.cancel_cmd)
+        elif self.confirm_cmd:
+            self.confirm_cmd.set_command_params(results=results, end_time=end_time)
+            self.issuecmd(self.confirm_cmd)
+
+
 class RankingView(BaseView):
     """Display player scores
 
-    rank_info is a list of tuples holdig the score and rank info for each player.
+    rank_info is a list of tuples holdig the rank, player data, score and tie-break scores
+    for each player.
     This display assumes the list has already been sorted.
     """
     def __init__(self, cmd_manager: CommandManagerInterface,
-                 rank_data: list[tuple[int, dict[str, str], float]],
+                 rank_data: list[tuple[int, dict[str, str], float, dict[str, float]]],
                  title: str,
                  text: str = None,
                  clear_scr: bool = False):
@@ -288,9 +355,71 @@ class RankingView(BaseView):
 
     def render(self):
         super().render()
-        table_data = [["Rank", "Participant", "Score"]]
-        for player_rank, player, player_score in self.rank_data:
+        print(self.ranking_table_template(self.rank_data))
+
+    @staticmethod
+    def ranking_table_template(rank_data: list[tuple[int, dict[str, str], float, dict[str, float]]]) -> str:
+        table_data = [["Rank", "Participant", "Score", "Buchholz", "Median B.", "S-B", "Cumul."]]
+        for player_rank, player, player_score, tie_breaks in rank_data:
+            player_tpl = f"{player.get("surname").upper()} {player.get("name").capitalize()}\n"
+            player_tpl += f"{player.get("national_player_id")}"
+            table_data.append([
+                str(player_rank),
+                player_tpl,
+                str(player_score),
+                str(tie_breaks.get("buchholz", "-")),
+                str(tie_breaks.get("median_buchholz", "-")),
+                str(tie_breaks.get("sonneborn_berger", "-")),
+                str(tie_breaks.get("cumulative", "-")),
+            ])
+        return format_table(table_data)
+
+
+class ProjectionView(BaseView):
+    """Display the range of final ranks each player can still reach.
+
+    projection_data is a list of tuples holding the player data and projection data of each player.
+    """
+    def __init__(self, cmd_manager: CommandManagerInterface,
+                 projection_data: list[tuple[dict[str, str], dict]],
+                 remaining_matches: int,
+                 exact: bool,
+                 rounds_left: int = 0,
+                 title: str = None,
+                 clear_scr: bool = False):
+        text = f"{remaining_matches} match{"es" if remaining_matches > 1 else ""} to go in this round."
+        if not exact:
+            text += "\nToo many outcomes to explore: ranks are estimated from random samples."
+        if rounds_left:
+            text += f"\n{rounds_left} more round{"s" if rounds_left > 1 else ""} to play after this one:"
+            text += " final ranks may differ."
+        super().__init__(cmd_manager=cmd_manager,
+                         title=title or "Standings projection",
+                         text=text,
+                         clear_scr=clear_scr)
+        self.projection_data = projection_data
+
+    def render(self):
+        super().render()
+        print(self.projection_table_template(self.projection_data))
+
+    @staticmethod
+    def projection_table_template(projection_data: list[tuple[dict[str, str], dict]]) -> str:
+        table_data = [["Participant", "Score", "Best rank", "Worst rank", "Status"]]
+        for player, projection in projection_data:
             player_tpl = f"{player.get("surname").upper()} {player.get("name").capitalize()}\n"
             player_tpl += f"{player.get("national_player_id")}"
-            table_data.append([str(player_rank), player_tpl, str(player_score)])
-        print(format_table(table_data))
+            if projection.get("clinched"):
+                status = "Clinched 1st place"
+            elif projection.get("eliminated"):
+                status = "Can't win"
+            else:
+                status = "Can still win"
+            table_data.append([
+                player_tpl,
+                str(projection.get("score")),
+                str(projection.get("best_rank")),
+                str(projection.get("worst_rank")),
+                status,
+            ])
+        return format_table(table_data)
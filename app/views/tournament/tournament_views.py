@@ -107,6 +107,49 @@ class TournamentsListView(BaseView):
         return format_table(table_data=[headers] + lines)
 
 
+class ActiveTournamentsView(BaseView):
+    """Lists the active tournaments with their memory usage, and prompts for the tournament to switch to."""
+
+    def __init__(
+        self,
+        cmd_manager: commands_abc.CommandManagerInterface,
+        tournament_list: list[dict],
+        confirm_cmd: commands_abc.CommandInterface = None,
+        cancel_cmd: commands_abc.CommandInterface = None,
+    ):
+        super().__init__(cmd_manager=cmd_manager, title="Active Tournaments",
+                         text="Tournaments kept in memory during this session (* = current tournament)")
+        self.tournament_list = tournament_list
+        self.confirm_cmd = confirm_cmd
+        self.cancel_cmd = cancel_cmd
+
+    def render(self):
+        super().render()
+        print(self.list_tpl(self.tournament_list))
+        indexes = [str(i + 1) for i in range(len(self.tournament_list))]
+        choice = prompt_v(
+            prompt="Enter the index of the tournament to switch to (<Enter> to skip)\nTournament index > ",
+            validator=lambda x: x in indexes,
+            skip_blank=True,
+        )
+        if choice is None:
+            self.issuecmd(self.cancel_cmd)
+        elif self.confirm_cmd:
+            self.confirm_cmd.set_command_params(tournament_id=self.tournament_list[int(choice) - 1]["tournament_id"])
+            self.issuecmd(self.confirm_cmd)
+
+    @staticmethod
+    def list_tpl(tournament_list: list[dict]) -> str:
+        lines = [
+            [f"{i + 1}{"*" if t.get("current") else ""}"]
+            + TournamentMetaView.tournament_meta_template(data=t, as_cells=True)
+            + [f"{t.get("memory_usage", 0) / 1024:.1f} KiB"]
+            for i, t in enumerate(tournament_list)
+        ]
+        headers = ["#", "Tournament_id", "location", "status", "start date", "end date", "memory"]
+        return format_table(table_data=[headers] + lines)
+
+
 class SelectTournamentIDView(AbstractView):
     """Prompts user for a tournament ID to load as current tournament."""
 
@@ -0,0 +1,6 @@
+"""Benchmarks and stress tests for the chessclub data model.
+
+Benchmarks are standalone scripts, run as modules from the project root:
+
+    python -m benchmarks.tournament_simulator -h
+"""
@@ -0,0 +1,112 @@
+"""Command dispatch throughput.
+
+Replays the demo scripts (players, then open, running and ended tournaments) against a temporary data folder,
+without the main menu and with the app output discarded, and reports the number of commands executed per second.
+The scripts are replayed --repeat times, each time into a fresh data folder.
+With --batch, the scripts are replayed in batch mode (no views, data files written once at the end).
+The demo scripts are compiled once (see app.commands.script_compiler), unless --no-cache is set:
+then each replay parses the scripts again.
+
+Also reports the raw throughput of the dispatcher, with --commands no-op commands.
+
+Usage (from the project root):
+
+    python -m benchmarks.command_dispatch --repeat 10 [--batch]
+"""
+
+from app.commands.commands_abc import CommandInterface
+from app.commands.dispatcher import CommandDispatcher
+from app.commands.script_compiler import load_script_file
+from contextlib import redirect_stdout
+from pathlib import Path
+import app
+import argparse
+import io
+import tempfile
+import time
+
+DEMO_SCRIPTS = (
+    "create_players_script.txt",
+    "create_tournament_open_script.txt",
+    "create_tournament_running_script.txt",
+    "create_tournament_ended_script.txt",
+)
+
+
+class NoOpCommand(CommandInterface):
+    def execute(self):
+        pass
+
+
+def load_demo_scripts(demo_dir: Path, compiled: bool = True) -> list:
+    """Returns the lines of the demo scripts, or their compiled commands."""
+    from app.controllers.chessclubapp import AssetLoader
+
+    script = []
+    for script_name in DEMO_SCRIPTS:
+        if compiled:
+            script.extend(load_script_file(Path(demo_dir, script_name), resolve=AssetLoader.resolve))
+        else:
+            with open(Path(demo_dir, script_name), encoding="utf8") as sf:
+                script.extend(sf.readlines())
+    return script
+
+
+def replay(script: list, data_dir: Path, batch: bool = False) -> tuple[int, float]:
+    """Replays a script in a new app, storing data into data_dir.
+
+    Returns the number of executed commands and the elapsed time in seconds.
+    """
+    from app.controllers.chessclubapp import ChessclubApp, AppConfig
+
+    cfg = AppConfig(
+        player_repository_file=Path(data_dir, "players.json"),
+        tournament_data_dir=Path(data_dir, "tournaments"),
+        tournament_repository_file=Path(data_dir, "tournaments", "tournament_index.json"),
+        head_to_head_file=Path(data_dir, "head_to_head.json"),
+    )
+    chessclub_app = ChessclubApp(config=cfg)
+    with redirect_stdout(io.StringIO()):
+        if batch:
+            start = time.perf_counter()
+            executed = chessclub_app.run_batch(script)
+            return executed, time.perf_counter() - start
+        commands = chessclub_app.interpret_script(script)
+        start = time.perf_counter()
+        chessclub_app.receive(*reversed(commands))
+        executed = chessclub_app.dispatch()
+        elapsed = time.perf_counter() - start
+    return executed, elapsed
+
+
+def dispatch_noop(count: int) -> float:
+    """Returns the time spent dispatching count no-op commands."""
+    dispatcher = CommandDispatcher()
+    dispatcher.push(*(NoOpCommand() for _ in range(count)))
+    start = time.perf_counter()
+    dispatcher.dispatch()
+    return time.perf_counter() - start
+
+
+def parse_args():
+    parser = argparse.ArgumentParser("command_dispatch", description="Command dispatch throughput")
+    parser.add_argument("--repeat", type=int, default=10, help="number of replays of the demo scripts")
+    parser.add_argument("--batch", action="store_true", help="replay the demo scripts in batch mode")
+    parser.add_argument("--no-cache", action="store_true", help="parse the demo scripts on each replay")
+    parser.add_argument("--commands", type=int, default=100000, help="number of no-op commands")
+    parser.add_argument("--demo-dir", default=Path(app.APPDIR.parent, "demo"))
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    elapsed = dispatch_noop(args.commands)
+    print(f"dispatcher: {args.commands} no-op commands in {elapsed:.3f}s ({args.commands / elapsed:,.0f} commands/s)")
+    script = load_demo_scripts(args.demo_dir, compiled=not args.no_cache)
+    executed, elapsed = 0, 0.0
+    for _ in range(args.repeat):
+        with tempfile.TemporaryDirectory() as data_dir:
+            n, t = replay(script, Path(data_dir), batch=args.batch)
+            executed += n
+            elapsed += t
+    print(f"demo scripts: {executed} commands in {elapsed:.3f}s ({executed / elapsed:,.0f} commands/s)")
@@ -0,0 +1,91 @@
+"""Memory footprint of matches.
+
+Measures the memory allocated per match when building a large archive of ended matches,
+using the compact Match class (slots, half-point scores and integer timestamps)
+and a copy of the previous representation (instance dict, nested score tuples and datetime objects).
+
+Usage (from the project root):
+
+    python -m benchmarks.match_memory --matches 100000
+"""
+
+from app.models.player_model import Player, NationalPlayerID
+from app.models.tournament_model import Match
+from datetime import date, datetime, timedelta
+import argparse
+import gc
+import tracemalloc
+
+
+class LegacyMatch:
+    """The previous Match representation, kept here as a baseline."""
+
+    def __init__(self, player1: tuple[Player, float], player2: tuple[Player, float],
+                 start_time: datetime = None, end_time: datetime = None):
+        self.players = ((player1[0], player1[1]), (player2[0], player2[1]))
+        self.start_time = start_time
+        self.end_time = end_time
+
+    def end(self, winner=None, end_time: datetime = None):
+        self.end_time = end_time
+        if winner is None:
+            self.players = ((self.players[0][0], 0.5), (self.players[1][0], 0.5))
+        elif self.players[0][0].id() == winner:
+            self.players = ((self.players[0][0], 1.0), (self.players[1][0], 0))
+        else:
+            self.players = ((self.players[0][0], 0.0), (self.players[1][0], 1.0))
+
+
+def make_players(count: int) -> list[Player]:
+    return [
+        Player(
+            national_player_id=NationalPlayerID(f"BM{n:0>5}"),
+            surname=f"Player{n}",
+            name="Bench",
+            birthdate=date(1990, 1, 1),
+        )
+        for n in range(count)
+    ]
+
+
+def build_matches(match_cls, players: list[Player], count: int) -> list:
+    """Builds a list of ended matches, with distinct start and end times."""
+    start = datetime(2024, 1, 1, 9, 0)
+    matches = []
+    for n in range(count):
+        player1 = players[n % len(players)]
+        player2 = players[(n + 1) % len(players)]
+        match = match_cls(player1=(player1, 0.0), player2=(player2, 0.0))
+        match.start_time = start + timedelta(seconds=n)
+        match.end(winner=(player1.id() if n % 3 == 0 else None), end_time=start + timedelta(seconds=n, hours=1))
+        matches.append(match)
+    return matches
+
+
+def measure(match_cls, players: list[Player], count: int) -> int:
+    """Returns the number of bytes allocated to build count matches."""
+    gc.collect()
+    tracemalloc.start()
+    matches = build_matches(match_cls, players, count)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del matches
+    return size
+
+
+def parse_args():
+    parser = argparse.ArgumentParser("match_memory", description="Memory footprint of matches")
+    parser.add_argument("--matches", type=int, default=100000)
+    parser.add_argument("--players", type=int, default=1000)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    players = make_players(args.players)
+    legacy = measure(LegacyMatch, players, args.matches)
+    compact = measure(Match, players, args.matches)
+    print(f"{args.matches} ended matches between {args.players} players:")
+    print(f"  previous representation: {legacy / 2**20:8.2f} MiB ({legacy / args.matches:6.1f} bytes/match)")
+    print(f"  compact Match:           {compact / 2**20:8.2f} MiB ({compact / args.matches:6.1f} bytes/match)")
+    print(f"  saved: {100.0 * (legacy - compact) / legacy:.1f}%")
@@ -0,0 +1,77 @@
+"""Parallel script execution.
+
+Creates the demo players, then runs --scripts copies of the demo tournament scripts (open, running and ended
+tournaments, in turn) through script_runner.run_scripts(), first in a single worker process,
+then in each number of --processes. Each run starts from a fresh data folder.
+Reports the elapsed time of each run, and its speedup over the single process.
+
+Usage (from the project root):
+
+    python -m benchmarks.parallel_scripts --scripts 12 --processes 2 4
+"""
+
+from contextlib import redirect_stdout
+from pathlib import Path
+import app
+import argparse
+import io
+import itertools
+import os
+import tempfile
+import time
+
+TOURNAMENT_SCRIPTS = (
+    "create_tournament_open_script.txt",
+    "create_tournament_running_script.txt",
+    "create_tournament_ended_script.txt",
+)
+
+
+def run(script_files: list[Path], players_script: Path, processes: int) -> float:
+    """Runs the scripts in a fresh data folder, after the players script.
+
+    Returns the elapsed time of the parallel run in seconds.
+    """
+    from app.controllers.chessclubapp import AppConfig, ChessclubApp
+    from app.controllers.script_runner import run_scripts
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        cfg = AppConfig(
+            player_repository_file=Path(data_dir, "players.json"),
+            tournament_data_dir=Path(data_dir, "tournaments"),
+            tournament_repository_file=Path(data_dir, "tournaments", "tournament_index.json"),
+            head_to_head_file=Path(data_dir, "head_to_head.json"),
+        )
+        cfg.tournament_data_dir.mkdir(mode=0o777, parents=True, exist_ok=True)
+        chessclub_app = ChessclubApp(config=cfg)
+        with redirect_stdout(io.StringIO()):
+            chessclub_app.run_batch(chessclub_app.load_script_file(players_script))
+        start = time.perf_counter()
+        results = run_scripts(script_files, cfg=cfg, processes=processes)
+        elapsed = time.perf_counter() - start
+    if failed := [r.script_file for r in results if r.error]:
+        raise RuntimeError(f"{len(failed)} scripts failed, first one: {failed[0]}")
+    return elapsed
+
+
+def parse_args():
+    parser = argparse.ArgumentParser("parallel_scripts", description="Parallel script execution")
+    parser.add_argument("--scripts", type=int, default=12, help="number of tournament scripts to run")
+    parser.add_argument(
+        "--processes", type=int, nargs="+", default=[os.cpu_count()], help="numbers of worker processes to compare"
+    )
+    parser.add_argument("--demo-dir", default=Path(app.APPDIR.parent, "demo"))
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    demo_dir = Path(args.demo_dir)
+    script_names = itertools.islice(itertools.cycle(TOURNAMENT_SCRIPTS), args.scripts)
+    script_files = [Path(demo_dir, name) for name in script_names]
+    players_script = Path(demo_dir, "create_players_script.txt")
+    sequential = run(script_files, players_script, processes=1)
+    print(f"{args.scripts} scripts, 1 process: {sequential:.3f}s")
+    for processes in args.processes:
+        elapsed = run(script_files, players_script, processes=processes)
+        print(f"{args.scripts} scripts, {processes} processes: {elapsed:.3f}s (speedup x{sequential / elapsed:.2f})")
@@ -0,0 +1,55 @@
+"""Overhead of the sampling profiler.
+
+Plays the same simulated tournaments (see benchmarks.tournament_simulator) without the sampling profiler,
+then with the profiler sampling the main thread at each --intervals value, and reports the slowdown,
+the number of samples and the share of time spent sampling.
+
+Usage (from the project root):
+
+    python -m benchmarks.sampling_overhead --players 100 --rounds 4 --runs 20 --intervals 1 5 10
+"""
+
+from app.helpers.sampling_profiler import SamplingProfiler
+from benchmarks.tournament_simulator import make_players, simulate_tournament
+import argparse
+import random
+import time
+
+
+def play(player_count: int, round_count: int, runs: int, seed: int) -> float:
+    """Plays runs tournaments and returns the elapsed time, in seconds."""
+    rng = random.Random(seed)
+    players = make_players(player_count, rng)
+    start = time.perf_counter()
+    for _ in range(runs):
+        simulate_tournament(players, round_count, "rating", rng)
+    return time.perf_counter() - start
+
+
+def parse_args():
+    parser = argparse.ArgumentParser("sampling_overhead", description="Overhead of the sampling profiler")
+    parser.add_argument("--players", type=int, default=100, help="tournament size")
+    parser.add_argument("--rounds", type=int, default=4, help="rounds per tournament")
+    parser.add_argument("--runs", type=int, default=20, help="tournaments played per measure")
+    parser.add_argument(
+        "--intervals", type=float, nargs="+", default=[1.0, 5.0, 10.0], help="sampling intervals, in milliseconds"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    # warm up, then measure the reference time
+    play(args.players, args.rounds, 1, args.seed)
+    baseline = play(args.players, args.rounds, args.runs, args.seed)
+    print(f"no profiler: {baseline:.3f}s")
+    for interval in args.intervals:
+        profiler = SamplingProfiler(interval=interval / 1000)
+        profiler.start()
+        elapsed = play(args.players, args.rounds, args.runs, args.seed)
+        profiler.stop()
+        print(
+            f"every {interval:g} ms: {elapsed:.3f}s ({100 * (elapsed / baseline - 1):+.1f}%), "
+            f"{profiler.samples} samples, {100 * profiler.overhead():.2f}% of the time spent sampling"
+        )
@@ -0,0 +1,239 @@
+"""Monte Carlo tournament simulator.
+
+Plays complete tournaments between synthetic players, many times over,
+in order to stress the Tournament model, its pairing algorithm and the tournament repository.
+
+Match outcomes are either uniformly random (win, draw or loss) or drawn from the players' ratings
+(see app.models.rating_model.expected_score).
+
+For each tournament size, the simulator reports:
+  - pairing quality: number of rematches and distribution of the score difference between paired players,
+  - average time spent per round, pairing included,
+  - average time spent storing the tournament (with --store).
+
+Usage (from the project root):
+
+    python -m benchmarks.tournament_simulator --players 10 100 1000 --rounds 4 --runs 100
+"""
+
+from app.models.player_model import Player, NationalPlayerID, PlayerRepository
+from app.models.tournament_model import Tournament, TournamentMetaData, TournamentRepository
+from app.models.rating_model import expected_score, DEFAULT_RATING
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+OUTCOMES = ("random", "rating")
+# Probability of a draw between two players of equal strength, in rating-based outcomes.
+DRAW_RATE = 0.3
+
+
+@dataclass
+class SimulationStats:
+    """Statistics gathered over one or several simulated tournaments."""
+
+    players: int = 0
+    rounds: int = 0
+    runs: int = 0
+    matches: int = 0
+    rematches: int = 0
+    # score difference between paired players => number of matches
+    score_diffs: Counter = field(default_factory=Counter)
+    round_times: list[float] = field(default_factory=list)
+    store_times: list[float] = field(default_factory=list)
+
+    def merge(self, other: "SimulationStats"):
+        self.players = other.players
+        self.rounds = other.rounds
+        self.runs += other.runs
+        self.matches += other.matches
+        self.rematches += other.rematches
+        self.score_diffs.update(other.score_diffs)
+        self.round_times.extend(other.round_times)
+        self.store_times.extend(other.store_times)
+
+    def mean_score_diff(self) -> float:
+        total = sum(self.score_diffs.values())
+        return sum(diff * count for diff, count in self.score_diffs.items()) / total if total else 0.0
+
+
+def make_players(player_count: int, rng: random.Random) -> list[Player]:
+    """Creates synthetic players, with random ratings."""
+    players = []
+    for n in range(player_count):
+        prefix = chr(65 + (n // 100000) // 26) + chr(65 + (n // 100000) % 26)
+        players.append(
+            Player(
+                national_player_id=NationalPlayerID(f"{prefix}{n % 100000:0>5}"),
+                surname=f"Player{n}",
+                name="Sim",
+                birthdate=date(1990, 1, 1),
+                rating=round(rng.gauss(DEFAULT_RATING, 200), 1),
+            )
+        )
+    return players
+
+
+def draw_winner(player1: Player, player2: Player, outcome: str, rng: random.Random):
+    """Draws the outcome of a match: returns the winner's ID, or None for a draw."""
+    if outcome == "rating":
+        expected1 = expected_score(player1.rating, player2.rating)
+        draw = DRAW_RATE * (1.0 - abs(2.0 * expected1 - 1.0))
+        p1_wins = expected1 - draw / 2.0
+    else:
+        draw = p1_wins = 1.0 / 3.0
+    x = rng.random()
+    if x < p1_wins:
+        return player1.id()
+    if x < p1_wins + draw:
+        return None
+    return player2.id()
+
+
+def simulate_tournament(
+    players: list[Player],
+    round_count: int,
+    outcome: str,
+    rng: random.Random,
+    repo: TournamentRepository = None,
+) -> SimulationStats:
+    """Plays a full tournament and returns its statistics.
+
+    When a repository is given, the tournament is stored after each round.
+    """
+    stats = SimulationStats(players=len(players), rounds=round_count, runs=1)
+    tournament = Tournament(
+        metadata=TournamentMetaData(round_count=round_count, description="Simulation"),
+        participants=list(players),
+    )
+    clock = datetime(2024, 1, 1, 9, 0)
+    met: set[frozenset] = set()
+    for _ in range(round_count):
+        start = time.perf_counter()
+        current_round = tournament.start_next_round()
+        for m, match in enumerate(current_round.matches):
+            pair = frozenset((match.player1().id(), match.player2().id()))
+            if pair in met:
+                stats.rematches += 1
+            met.add(pair)
+            score1 = tournament.player_ranks[match.player1().id()][1]
+            score2 = tournament.player_ranks[match.player2().id()][1]
+            stats.score_diffs[abs(score1 - score2)] += 1
+            tournament.start_a_match(m, start_time=clock)
+            tournament.end_a_match(
+                m,
+                winner_id=draw_winner(match.player1(), match.player2(), outcome, rng),
+                end_time=clock + timedelta(hours=1),
+            )
+        stats.round_times.append(time.perf_counter() - start)
+        stats.matches += len(current_round.matches)
+        clock += timedelta(hours=2)
+        if repo is not None:
+            start = time.perf_counter()
+            repo.store_tournament(tournament)
+            stats.store_times.append(time.perf_counter() - start)
+    return stats
+
+
+def run_simulations(
+    player_count: int, round_count: int, runs: int, outcome: str, seed: int, store: bool = False
+) -> SimulationStats:
+    """Plays several tournaments with the same players.
+
+    This is the unit of work sent to worker processes.
+    """
+    rng = random.Random(seed)
+    # pairing randomness comes from the random module
+    random.seed(seed)
+    players = make_players(player_count, rng)
+    stats = SimulationStats(players=player_count, rounds=round_count)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        repo = None
+        if store:
+            player_repo = PlayerRepository(Path(tmp_dir, "players.json"))
+            for p in players:
+                player_repo.add(p)
+            player_repo.commit_changes()
+            repo = TournamentRepository(Path(tmp_dir, "tournaments", "index.json"), player_repo)
+        for _ in range(runs):
+            stats.merge(simulate_tournament(players, round_count, outcome, rng, repo))
+    return stats
+
+
+def benchmark(
+    player_count: int,
+    round_count: int,
+    runs: int,
+    outcome: str = "random",
+    workers: int = None,
+    store: bool = False,
+    seed: int = 0,
+) -> SimulationStats:
+    """Spreads the simulated tournaments over a pool of worker processes and merges their statistics."""
+    workers = max(1, min(workers or os.cpu_count() or 1, runs))
+    batches = [runs // workers + (1 if w < runs % workers else 0) for w in range(workers)]
+    stats = SimulationStats(players=player_count, rounds=round_count)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(run_simulations, player_count, round_count, batch, outcome, seed + w, store)
+            for w, batch in enumerate(batches)
+            if batch
+        ]
+        for future in futures:
+            stats.merge(future.result())
+    return stats
+
+
+def report(stats: SimulationStats) -> str:
+    """Text report of a benchmark."""
+    lines = [
+        f"{stats.players} players, {stats.rounds} rounds, {stats.runs} tournaments, {stats.matches} matches",
+        f"  rematches: {stats.rematches} ({100.0 * stats.rematches / max(1, stats.matches):.2f}% of matches)",
+        f"  score difference between paired players: mean {stats.mean_score_diff():.3f}",
+    ]
+    total = sum(stats.score_diffs.values())
+    for diff in sorted(stats.score_diffs):
+        count = stats.score_diffs[diff]
+        lines.append(f"    {diff:>5.1f}: {count:>8} ({100.0 * count / total:6.2f}%)")
+    if stats.round_times:
+        lines.append(
+            f"  time per round: mean {1000 * statistics.fmean(stats.round_times):.2f}ms,"
+            + f" max {1000 * max(stats.round_times):.2f}ms"
+        )
+    if stats.store_times:
+        lines.append(f"  time per store: mean {1000 * statistics.fmean(stats.store_times):.2f}ms")
+    return "\n".join(lines)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser("tournament_simulator", description="Monte Carlo tournament simulator")
+    parser.add_argument("--players", type=int, nargs="+", default=[10, 100, 1000], help="tournament sizes")
+    parser.add_argument("--rounds", type=int, default=4, help="rounds per tournament")
+    parser.add_argument("--runs", type=int, default=100, help="tournaments played for each size")
+    parser.add_argument("--outcome", choices=OUTCOMES, default="random", help="how match outcomes are drawn")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (defaults to CPU count)")
+    parser.add_argument("--store", action="store_true", help="also store tournaments to a temporary folder")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    for player_count in args.players:
+        if player_count % 2:
+            print(f"Skipping {player_count} players: even participant number required.")
+            continue
+        start = time.perf_counter()
+        stats = benchmark(
+            player_count, args.rounds, args.runs, args.outcome, args.workers, args.store, args.seed
+        )
+        print(report(stats))
+        print(f"  total: {time.perf_counter() - start:.2f}s\n")
@@ -1,8 +1,15 @@
-from app.controllers.chessclubapp import ChessclubApp
 import argparse
+import time
 import logging
+import typing
 from pathlib import Path
 import app
+from app.helpers.startup_timing import timer as startup_timer
+
+# the app modules are imported once the command line is parsed, so that --startup-timing can time their imports
+if typing.TYPE_CHECKING:
+    from app.controllers.chessclubapp import ChessclubApp
+    from app.commands.script_compiler import ScriptCommand
 logger = logging.getLogger()
 
 
@@ -10,6 +17,82 @@ def parse_args():
     """Parse command line arguments"""
     parser = argparse.ArgumentParser("chessclub_app")
     parser.add_argument("--script", help="Execute a sequence of commands from a file")
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Execute the script headless (no menus nor views) and exit. Data files are written at the end.",
+    )
+    parser.add_argument(
+        "--parallel",
+        nargs="+",
+        metavar="SCRIPT",
+        help="Execute independent scripts headless, in parallel processes (after --script, if set), and exit.",
+    )
+    parser.add_argument(
+        "--processes", type=int, help="Number of processes used by --parallel (default: one per CPU core)."
+    )
+    parser.add_argument(
+        "--instrument",
+        nargs="?",
+        const="-",
+        metavar="REPORT_FILE",
+        help="Record timings of each command and controller method, and report them at exit "
+        "(to REPORT_FILE, or to the console). The report is also available from the main menu (hidden option P).",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PROFILE_DIR",
+        help="Run each command under cProfile and write a .prof file per command to PROFILE_DIR "
+        "(implies --instrument).",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="TRACE_FILE",
+        help="Record nested timing spans (controllers, repositories, storage, pairing, HTML rendering) "
+        "and write them at exit to TRACE_FILE: Chrome trace-event format for a .json file, JSON lines otherwise.",
+    )
+    parser.add_argument(
+        "--sample-profile",
+        nargs="?",
+        const="logs/profile.collapsed",
+        metavar="PROFILE_FILE",
+        help="Sample the main thread stack in the background, and write the samples at exit to PROFILE_FILE "
+        "(default: logs/profile.collapsed), in the collapsed-stack format read by flamegraph tools. "
+        "The profiler can also be toggled from the main menu (hidden option S).",
+    )
+    parser.add_argument(
+        "--sample-interval",
+        type=float,
+        default=10.0,
+        metavar="MS",
+        help="Time between two samples of the sampling profiler, in milliseconds (default: 10).",
+    )
+    parser.add_argument(
+        "--startup-timing",
+        nargs="?",
+        const="-",
+        metavar="REPORT_FILE",
+        help="Time the imports and data loads until the main menu is displayed, and report them "
+        "(to REPORT_FILE, or to the console) against the time-to-first-menu target.",
+    )
+    parser.add_argument(
+        "--startup-target",
+        type=float,
+        metavar="MS",
+        help="Time-to-first-menu target of --startup-timing, in milliseconds (default: 250).",
+    )
+    parser.add_argument(
+        "--no-warm-cache",
+        action="store_true",
+        help="Decode the data files from scratch, without the warm-start cache (<data file>.warm).",
+    )
+    parser.add_argument("--batch-log", help="In batch mode, write status messages to this file.")
+    parser.add_argument(
+        "--flush-every",
+        type=int,
+        default=0,
+        help="In batch mode, also write data files every N commands (default: only at the end).",
+    )
     parser.add_argument(
         "--debug",
         "-D",
@@ -22,20 +105,30 @@ def parse_args():
         default="logs/debug.log",
         help="Set the logfile path. Defaults to logs/debug.log. Set to 0 or empty string to disable logging."
     )
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.batch and not args.script:
+        parser.error("--batch requires --script")
+    return args
 
 
-def load_script(script_path: str = None) -> list[str]:
-    """Loads a script from a path"""
+def load_script(chessclub_app: "ChessclubApp", script_path: str = None) -> list["ScriptCommand"]:
+    """Loads a script from a path, compiled (the compiled script is cached next to the script file)."""
     if not (script_path and Path(script_path).exists()):
         return None
-    script = None
-    try:
-        with open(script_path) as sf:
-            script = sf.readlines()
-    except Exception as e:
-        logger.error(f"Failed to open script file {script_path}: {e}")
-    return script
+    return chessclub_app.load_script_file(script_path)
+
+
+def run_parallel(script_files: list[str], processes: int = None, flush_every: int = 0):
+    """Runs independent scripts in parallel processes, and reports the outcome of each script."""
+    from app.controllers.script_runner import run_scripts
+
+    start = time.perf_counter()
+    for result in run_scripts(script_files, processes=processes, flush_every=flush_every):
+        if result.error:
+            print(f"{result.script_file}: FAILED ({result.error})")
+        else:
+            print(f"{result.script_file}: {result.executed} commands in {result.elapsed:.2f}s")
+    print(f"Ran {len(script_files)} scripts in {time.perf_counter() - start:.2f}s.")
 
 
 def setup_logging(logfile: str = None, debug: bool = False):
@@ -54,10 +147,9 @@ def setup_logging(logfile: str = None, debug: bool = False):
 
 
 if __name__ == "__main__":
-    # parse command line arguments and load script
+    # parse command line arguments
     #
     args = parse_args()
-    script = load_script(args.script)
 
     # setup logging: write logs to logs/debug.log
     #
@@ -65,5 +157,31 @@ if __name__ == "__main__":
 
     # now launch the app
     #
-    chessclub_app = ChessclubApp()
-    chessclub_app.run(cmd_script=script)
+    if args.startup_timing:
+        startup_timer.enable()
+    with startup_timer.phase("import app"):
+        from app.controllers.chessclubapp import AppConfig, ChessclubApp
+    with startup_timer.phase("create app"):
+        chessclub_app = ChessclubApp(
+            config=AppConfig(sampling_interval=args.sample_interval / 1000, warm_cache=not args.no_warm_cache)
+        )
+    if args.startup_timing:
+        report_file = args.startup_timing if args.startup_timing != "-" else None
+        chessclub_app.enable_startup_timing(report_file=report_file, target_ms=args.startup_target)
+    if args.sample_profile:
+        chessclub_app.start_sampling_profiler(Path(app.APPDIR.parent, args.sample_profile))
+    if args.trace:
+        chessclub_app.enable_tracing(args.trace)
+    if args.instrument or args.profile:
+        report_file = args.instrument if args.instrument not in (None, "-") else None
+        chessclub_app.enable_instrumentation(profile_dir=args.profile, report_file=report_file)
+    with startup_timer.phase("load script"):
+        script = load_script(chessclub_app, args.script)
+    if args.parallel:
+        if script:
+            chessclub_app.run_batch(cmd_script=script, log_file=args.batch_log, flush_every=args.flush_every)
+        run_parallel(args.parallel, processes=args.processes, flush_every=args.flush_every)
+    elif args.batch:
+        chessclub_app.run_batch(cmd_script=script or [], log_file=args.batch_log, flush_every=args.flush_every)
+    else:
+        chessclub_app.run(cmd_script=script)
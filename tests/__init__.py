@@ -1,6 +1,30 @@
 import pathlib
+from datetime import date, datetime
 TEST_TMP_DIR = pathlib.Path(pathlib.Path(__file__).parent.resolve(), "tmp")
 
 if not TEST_TMP_DIR.exists():
     # broad permission to allow manual removal, just in case...
     TEST_TMP_DIR.mkdir(mode=0o777, parents=True)
+
+
+def make_players(*player_ids: str) -> list:
+    """Makes a test player for each national player ID string."""
+    from app.models.player_model import NationalPlayerID, Player
+
+    return [
+        Player(
+            national_player_id=NationalPlayerID(pid),
+            name="Test",
+            surname=f"Player{n}",
+            birthdate=date(1980, 1, 1),
+        )
+        for n, pid in enumerate(player_ids)
+    ]
+
+
+def play_round(tournament, pairs, winners, day: int):
+    """Starts a round with fixed pairs and ends all matches with the given winners (in board order)."""
+    tournament.start_next_round(player_pairs=pairs)
+    for m, winner in enumerate(winners):
+        tournament.start_a_match(m, start_time=datetime(2024, 6, day, 10, 0))
+        tournament.end_a_match(m, winner_id=winner, end_time=datetime(2024, 6, day, 11, m))
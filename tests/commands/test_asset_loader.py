@@ -0,0 +1,93 @@
+import unittest
+import shutil
+from pathlib import Path
+from app.controllers.chessclubapp import AppConfig, AssetLoader, ChessclubApp, COMMAND, SINGLETON
+import tests
+
+
+class TestAssetLoader(unittest.TestCase):
+    """Test the lifetimes of the controllers and repositories loaded by the AssetLoader.
+
+    Writes to the tests/tmp directory.
+    """
+
+    def setUp(self) -> None:
+        self.test_dir = Path(tests.TEST_TMP_DIR, "test_asset_loader")
+        Path(self.test_dir, "tournaments").mkdir(mode=0o777, parents=True, exist_ok=True)
+        self.cfg = AppConfig(
+            player_repository_file=Path(self.test_dir, "players.json"),
+            tournament_data_dir=Path(self.test_dir, "tournaments"),
+            tournament_repository_file=Path(self.test_dir, "tournaments", "tournament_index.json"),
+            head_to_head_file=Path(self.test_dir, "head_to_head.json"),
+            warm_cache=False,
+        )
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_lazy_construction(self):
+        loader = AssetLoader(cfg=self.cfg, app=None)
+        self.assertFalse(loader.loaded("PlayerRepository"))
+        loader.load("PlayerManager")
+        self.assertTrue(loader.loaded("PlayerRepository"))
+        self.assertFalse(loader.loaded("ReportsManager"))
+
+    def test_singleton(self):
+        loader = AssetLoader(cfg=self.cfg, app=None)
+        repo = loader.load_player_repository()
+        manager = loader.load("TournamentManager")
+        loader.end_session()
+        self.assertIs(loader.load("PlayerRepository"), repo)
+        self.assertIs(loader.load_tournament_manager(), manager)
+        self.assertIs(loader.load_reports_manager().player_repo, repo)
+
+    def test_session(self):
+        loader = AssetLoader(cfg=self.cfg, app=None)
+        reports = loader.load_reports_manager()
+        self.assertIs(loader.load("ReportsManager"), reports)
+        loader.end_session()
+        self.assertFalse(loader.loaded("ReportsManager"))
+        self.assertIsNot(loader.load("ReportsManager"), reports)
+        # managers of the new session share the singleton registry of active tournaments
+        active_tournaments = loader.load_active_tournaments()
+        self.assertIs(loader.load_tournament_manager().active_tournaments, active_tournaments)
+        self.assertIs(loader.load_running_tournament_manager().active_tournaments, active_tournaments)
+        self.assertIs(loader.load_reports_manager().active_tournaments, active_tournaments)
+
+    def test_shared_active_tournaments(self):
+        """All tournament managers share the (still empty) registry of active tournaments."""
+        loader = AssetLoader(cfg=self.cfg, app=None)
+        active_tournaments = loader.load_active_tournaments()
+        self.assertEqual(len(active_tournaments), 0)
+        for manager in (
+            loader.load_tournament_manager(),
+            loader.load_running_tournament_manager(),
+            loader.load_reports_manager(),
+        ):
+            self.assertIs(manager.active_tournaments, active_tournaments)
+
+    def test_main_menu_lazy(self):
+        """Drawing the main menu doesn't load the tournaments."""
+        chessclub_app = ChessclubApp(config=self.cfg)
+        chessclub_app.main_menu()
+        chessclub_app.main_menu()
+        self.assertFalse(chessclub_app._loader.loaded("ActiveTournaments"))
+        self.assertFalse(chessclub_app._loader.loaded("TournamentRepository"))
+
+    def test_lifetime_config(self):
+        self.cfg.controller_lifetimes = {"PlayerManager": COMMAND, "ReportsManager": SINGLETON}
+        loader = AssetLoader(cfg=self.cfg, app=None)
+        self.assertIsNot(loader.load("PlayerManager"), loader.load("PlayerManager"))
+        self.assertFalse(loader.loaded("PlayerManager"))
+        reports = loader.load("ReportsManager")
+        loader.end_session()
+        self.assertIs(loader.load("ReportsManager"), reports)
+        self.cfg.controller_lifetimes = {"PlayerManager": "forever"}
+        with self.assertRaises(ValueError):
+            AssetLoader(cfg=self.cfg, app=None)
+        with self.assertRaises(ValueError):
+            loader.load("UnknownManager")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import threading
+from app.commands.commands_abc import CommandInterface
+from app.commands.dispatcher import CommandDispatcher
+
+
+class RecordCommand(CommandInterface):
+    """Appends its name to a log when executed, and optionally pushes follow-up commands."""
+
+    def __init__(self, name: str, log: list, dispatcher: CommandDispatcher = None,
+                 follow_up: list = None, cycle: bool | int = False) -> None:
+        super().__init__(cycle)
+        self.name = name
+        self.log = log
+        self.dispatcher = dispatcher
+        self.follow_up = follow_up or []
+
+    def execute(self):
+        self.log.append(self.name)
+        if self.follow_up:
+            self.dispatcher.push(*self.follow_up)
+
+
+class TestCommandDispatcher(unittest.TestCase):
+    """Test the command dispatcher of the app main loop."""
+
+    def test_stack_order(self):
+        dispatcher = CommandDispatcher()
+        log = []
+        follow_up = [RecordCommand("c2", log), RecordCommand("c1", log)]
+        dispatcher.push(RecordCommand("b", log), RecordCommand("a", log, dispatcher, follow_up))
+        self.assertEqual(dispatcher.dispatch(), 4)
+        self.assertEqual(log, ["a", "c1", "c2", "b"])
+        self.assertEqual(len(dispatcher), 0)
+
+    def test_cycle(self):
+        """Cycling commands are repeated after the commands they issue."""
+        dispatcher = CommandDispatcher()
+        log = []
+        menu = RecordCommand("menu", log, dispatcher, [RecordCommand("option", log)], cycle=2)
+        dispatcher.push(menu)
+        dispatcher.dispatch()
+        self.assertEqual(log, ["menu", "option"] * 3)
+
+    def test_stop(self):
+        dispatcher = CommandDispatcher()
+        log = []
+
+        class StopCmd(CommandInterface):
+            def execute(self):
+                dispatcher.stop()
+
+        dispatcher.push(RecordCommand("never", log), StopCmd(), RecordCommand("first", log))
+        self.assertEqual(dispatcher.dispatch(), 2)
+        self.assertEqual(log, ["first"])
+        self.assertTrue(dispatcher.stopped())
+
+    def test_producer(self):
+        """While a producer is attached, the dispatcher waits for its commands."""
+        dispatcher = CommandDispatcher()
+        log = []
+        produced = threading.Event()
+
+        def produce():
+            with dispatcher.producer():
+                produced.set()
+                for n in range(100):
+                    dispatcher.push(RecordCommand(n, log))
+
+        with dispatcher.producer():
+            thread = threading.Thread(target=produce)
+            thread.start()
+            produced.wait(timeout=5)
+        dispatcher.dispatch()
+        thread.join(timeout=5)
+        self.assertEqual(sorted(log), list(range(100)))
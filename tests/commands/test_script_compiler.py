@@ -0,0 +1,96 @@
+import unittest
+from datetime import date, datetime
+from pathlib import Path
+from app.commands import script_compiler
+from app.commands.script_compiler import ScriptError, compile_script, load_script_file, cache_file
+import shutil
+import tests
+
+
+class SampleManager:
+    def register_player(self, player_id: str = None, start_date: date = None):
+        pass
+
+    def default(self):
+        pass
+
+
+def resolve(cls_name: str) -> type:
+    return SampleManager if cls_name == "SampleManager" else None
+
+
+SCRIPT = """#
+# sample script
+#
+SampleManager.register_player({"player_id": "AB12345", "start_date": "2024-05-01", "note": "(not a date)"})
+
+SampleManager.register_player({"start_date": "2024-05-01T10:30:00", "count": 4, "confirmed": false})
+SampleManager.default()
+"""
+
+
+class TestScriptCompiler(unittest.TestCase):
+    """Test the compilation and caching of scripts."""
+
+    def setUp(self) -> None:
+        self.test_dir = Path(tests.TEST_TMP_DIR, "test_script_compiler")
+        self.test_dir.mkdir(mode=0o777, parents=True, exist_ok=True)
+        self.script_file = Path(self.test_dir, "script.txt")
+        self.script_file.write_text(SCRIPT, encoding="utf8")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_compile(self):
+        script = compile_script(SCRIPT.splitlines(), resolve)
+        self.assertEqual([cmd.line for cmd in script], [4, 6, 7])
+        self.assertIs(script[0].cls, SampleManager)
+        self.assertIs(script[0].method, SampleManager.register_player)
+        self.assertEqual(
+            script[0].params, {"player_id": "AB12345", "start_date": date(2024, 5, 1), "note": "(not a date)"}
+        )
+        self.assertEqual(
+            script[1].params, {"start_date": datetime(2024, 5, 1, 10, 30), "count": 4, "confirmed": False}
+        )
+        self.assertEqual(script[2].params, {})
+
+    def test_errors(self):
+        for line, msg in (
+            ("UnknownManager.default()", "unknown controller"),
+            ("SampleManager.unknown()", "unknown method"),
+            ('SampleManager.default({"a": })', "invalid parameters"),
+            ("SampleManager", "expecting"),
+        ):
+            with self.assertRaises(ScriptError) as ctx:
+                compile_script(["# comment", line], resolve)
+            self.assertEqual(ctx.exception.line, 2)
+            self.assertIn(msg, str(ctx.exception))
+
+    def test_cache(self):
+        calls = []
+
+        def counting_resolve(cls_name: str) -> type:
+            calls.append(cls_name)
+            return resolve(cls_name)
+
+        script = load_script_file(self.script_file, counting_resolve)
+        self.assertTrue(cache_file(self.script_file).exists())
+        self.assertEqual(len(calls), 3)
+        # unchanged script: loaded from the cache, without parsing
+        self.assertEqual(load_script_file(self.script_file, counting_resolve), script)
+        self.assertEqual(len(calls), 3)
+        # changed script: compiled again
+        self.script_file.write_text(SCRIPT + "SampleManager.default()\n", encoding="utf8")
+        self.assertEqual(len(load_script_file(self.script_file, counting_resolve)), 4)
+        self.assertEqual(len(calls), 7)
+
+    def test_cache_format(self):
+        load_script_file(self.script_file, resolve)
+        format_ = script_compiler.COMPILED_FORMAT
+        try:
+            script_compiler.COMPILED_FORMAT = format_ + 1
+            calls = []
+            load_script_file(self.script_file, lambda name: calls.append(name) or resolve(name))
+            self.assertEqual(len(calls), 3)
+        finally:
+            script_compiler.COMPILED_FORMAT = format_
@@ -0,0 +1,99 @@
+import unittest
+import json
+import shutil
+from pathlib import Path
+from app.controllers.chessclubapp import AppConfig, AssetLoader, ChessclubApp
+from app.controllers.script_runner import run_scripts
+from app.models.rating_model import RatingUpdater
+import app
+import tests
+
+
+class TestScriptRunner(unittest.TestCase):
+    """Test independent scripts run in parallel processes.
+
+    Writes to the tests/tmp directory.
+    """
+
+    def setUp(self) -> None:
+        self.test_dir = Path(tests.TEST_TMP_DIR, "test_script_runner")
+        Path(self.test_dir, "tournaments").mkdir(mode=0o777, parents=True, exist_ok=True)
+        self.demo_dir = Path(app.APPDIR.parent, "demo")
+        self.cfg = AppConfig(
+            player_repository_file=Path(self.test_dir, "players.json"),
+            tournament_data_dir=Path(self.test_dir, "tournaments"),
+            tournament_repository_file=Path(self.test_dir, "tournaments", "tournament_index.json"),
+            head_to_head_file=Path(self.test_dir, "head_to_head.json"),
+            warm_cache=False,
+        )
+        # the player database is shared by the tournament scripts: create it first
+        chessclub_app = ChessclubApp(config=self.cfg)
+        chessclub_app.run_batch(
+            chessclub_app.load_script_file(Path(self.demo_dir, "create_players_script.txt")),
+            log_file=Path(self.test_dir, "players.log"),
+        )
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_run_scripts(self):
+        script_files = [
+            Path(self.demo_dir, "create_tournament_running_script.txt"),
+            Path(self.demo_dir, "create_tournament_ended_script.txt"),
+        ]
+        results = run_scripts(script_files, cfg=self.cfg, processes=2)
+        self.assertEqual([r.script_file for r in results], [str(f) for f in script_files])
+        for result in results:
+            self.assertIsNone(result.error)
+            self.assertGreater(result.executed, 0)
+        with open(self.cfg.tournament_repository_file, encoding="utf8") as f:
+            index = json.load(f)
+        self.assertEqual(len(index), 2)
+        # each script created its own tournament
+        self.assertEqual([len(r.changes.tournaments) for r in results], [1, 1])
+        self.assertEqual(set(index), set(results[0].changes.tournaments) | set(results[1].changes.tournaments))
+        for metadata in index.values():
+            self.assertTrue(Path(self.cfg.tournament_data_dir, metadata["data_file"]).exists())
+        # the head-to-head index holds the ended matches of both tournaments
+        with open(self.cfg.head_to_head_file, encoding="utf8") as f:
+            head_to_head = json.load(f)
+        tournament_ids = {key.split("/")[0] for meetings in head_to_head.values() for key in meetings}
+        self.assertEqual(tournament_ids, set(index))
+
+    @staticmethod
+    def _ratings(cfg: AppConfig) -> dict:
+        with open(cfg.player_repository_file, encoding="utf8") as f:
+            return {key: p.get("rating") for key, p in json.load(f).items()}
+
+    def test_shared_players_ratings(self):
+        """Scripts ending tournaments with the same players: the merged ratings account for all tournaments."""
+        ended_script = Path(self.demo_dir, "create_tournament_ended_script.txt")
+        # a single tournament, in its own data folder
+        single_dir = Path(self.test_dir, "single")
+        single_cfg = AppConfig(
+            player_repository_file=Path(single_dir, "players.json"),
+            tournament_data_dir=Path(single_dir, "tournaments"),
+            tournament_repository_file=Path(single_dir, "tournaments", "tournament_index.json"),
+            head_to_head_file=Path(single_dir, "head_to_head.json"),
+            warm_cache=False,
+        )
+        single_cfg.tournament_data_dir.mkdir(mode=0o777, parents=True, exist_ok=True)
+        shutil.copyfile(self.cfg.player_repository_file, single_cfg.player_repository_file)
+        run_scripts([ended_script], cfg=single_cfg, processes=1)
+        single = self._ratings(single_cfg)
+        results = run_scripts([ended_script, ended_script], cfg=self.cfg, processes=2)
+        self.assertEqual([r.error for r in results], [None, None])
+        with open(self.cfg.tournament_repository_file, encoding="utf8") as f:
+            index = json.load(f)
+        self.assertEqual(len(index), 2)
+        self.assertTrue(all(metadata["rated"] for metadata in index.values()))
+        # each script rated its tournament from the same initial players:
+        # keeping the ratings of either script would drop the other tournament
+        merged = self._ratings(self.cfg)
+        self.assertNotEqual(merged, single)
+        RatingUpdater(AssetLoader(cfg=self.cfg, app=None).load_tournament_repository()).rebuild(workers=1)
+        self.assertEqual(self._ratings(self.cfg), merged)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import app.models.player_model as player_model
+import app.models.tournament_model as tournament_model
+from app.models.active_tournaments import ActiveTournaments
+from app.helpers.memory import deep_sizeof
+from tests import make_players
+from pathlib import Path
+import shutil
+import tests
+
+
+class TestActiveTournaments(unittest.TestCase):
+    """Test the registry of active tournaments."""
+
+    def setUp(self) -> None:
+        self.test_dir = Path(tests.TEST_TMP_DIR, "test_active_tournaments")
+        self.test_dir.mkdir(mode=0o777, parents=True, exist_ok=True)
+        self.players = make_players("AA00001", "BB00002", "CC00003", "DD00004")
+        player_repo = player_model.PlayerRepository(Path(self.test_dir, "players.json"))
+        for p in self.players:
+            player_repo.add(p)
+        player_repo.commit_changes()
+        self.repo = tournament_model.TournamentRepository(Path(self.test_dir, "index.json"), player_repo)
+        self.tournament_ids = []
+        for section in ("Open", "U1600", "Juniors"):
+            meta = tournament_model.TournamentMetaData(round_count=2, description=section)
+            tournament = tournament_model.Tournament(metadata=meta, participants=list(self.players))
+            tournament.start_next_round()
+            self.repo.store_tournament(tournament)
+            self.tournament_ids.append(tournament.id())
+            self.repo.release_tournament(tournament.id())
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_switch(self):
+        """Switching between active tournaments doesn't reload them."""
+        active = ActiveTournaments(self.repo)
+        loaded = [active.activate(tid) for tid in self.tournament_ids]
+        self.assertEqual(active.current_id, self.tournament_ids[-1])
+        for tid in self.tournament_ids:
+            self.repo.tournament_file(self.repo.find_tournament_metadata_by_id(tid)).unlink()
+        for tid, tournament in zip(self.tournament_ids, loaded):
+            self.assertIs(active.switch(tid), tournament)
+            self.assertIs(active.current(), tournament)
+        with self.assertRaises(KeyError):
+            active.switch("unknown")
+
+    def test_deactivate(self):
+        active = ActiveTournaments(self.repo)
+        first = active.activate(self.tournament_ids[0])
+        active.activate(self.tournament_ids[1])
+        self.assertTrue(active.deactivate(self.tournament_ids[1]))
+        self.assertEqual(active.current_id, self.tournament_ids[0])
+        self.assertNotIn(self.tournament_ids[1], active)
+        self.assertFalse(active.deactivate(self.tournament_ids[1]))
+        # released tournaments are loaded again from file
+        self.assertIsNotNone(self.repo.find_tournament_by_id(self.tournament_ids[1]))
+        self.assertIs(active.activate(self.tournament_ids[0]), first)
+
+    def test_memory_usage(self):
+        """Memory usage is accounted per tournament, without the players shared by all tournaments."""
+        active = ActiveTournaments(self.repo)
+        for tid in self.tournament_ids:
+            active.activate(tid)
+        usage = active.memory_usage()
+        self.assertEqual(list(usage), self.tournament_ids)
+        tournament = active.get(self.tournament_ids[0])
+        self.assertLess(usage[tournament.id()], deep_sizeof(tournament))
+        self.assertGreater(usage[tournament.id()], deep_sizeof(tournament.metadata))
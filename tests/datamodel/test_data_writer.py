@@ -0,0 +1,78 @@
+import unittest
+import app.models.player_model as player_model
+import app.models.tournament_model as tournament_model
+from app.adapters.data_writer import DataChanges, DataConflictError, DataWriter, collect_changes, read_json
+from tests import make_players
+from pathlib import Path
+import shutil
+import tests
+
+
+class TestDataWriter(unittest.TestCase):
+    """Test the collection of changes made to copies of the data files, and their merge into the shared files."""
+
+    def setUp(self) -> None:
+        self.test_dir = Path(tests.TEST_TMP_DIR, "test_data_writer")
+        self.shared_dir = Path(self.test_dir, "shared")
+        self.shared_dir.mkdir(mode=0o777, parents=True, exist_ok=True)
+        self.players = make_players("AA00001", "BB00002", "CC00003", "DD00004")
+        player_repo = player_model.PlayerRepository(Path(self.shared_dir, "players.json"))
+        for p in self.players:
+            player_repo.add(p)
+        player_repo.commit_changes()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _files(self, data_dir: Path) -> tuple[Path, Path, Path]:
+        return (
+            Path(data_dir, "players.json"),
+            Path(data_dir, "tournaments", "tournament_index.json"),
+            Path(data_dir, "head_to_head.json"),
+        )
+
+    def _run_in_copy(self, name: str, description: str):
+        """Creates a tournament in a copy of the shared data files, and returns the changes."""
+        copy_dir = Path(self.test_dir, name)
+        shutil.copytree(self.shared_dir, copy_dir)
+        players_file, index_file, h2h_file = self._files(copy_dir)
+        before = {"players": read_json(players_file), "tournaments": read_json(index_file)}
+        player_repo = player_model.PlayerRepository(players_file)
+        repo = tournament_model.TournamentRepository(index_file, player_repo)
+        meta = tournament_model.TournamentMetaData(round_count=2, description=description)
+        tournament = tournament_model.Tournament(metadata=meta, participants=player_repo.list_all())
+        tournament.start_next_round()
+        repo.store_tournament(tournament)
+        return tournament.id(), collect_changes(before, players_file, index_file, h2h_file)
+
+    def test_merge(self):
+        id1, changes1 = self._run_in_copy("copy1", "Open")
+        id2, changes2 = self._run_in_copy("copy2", "Juniors")
+        self.assertEqual(list(changes1.tournaments), [id1])
+        self.assertEqual(changes1.players, {})
+        self.assertEqual(len(changes1.files), 1)
+        writer = DataWriter(*self._files(self.shared_dir))
+        writer.apply(changes1, source="copy1")
+        writer.apply(changes2, source="copy2")
+        writer.commit()
+        player_repo = player_model.PlayerRepository(Path(self.shared_dir, "players.json"))
+        repo = tournament_model.TournamentRepository(self._files(self.shared_dir)[1], player_repo)
+        self.assertEqual({m.id() for m in repo.list_tournament_meta()}, {id1, id2})
+        for tid in (id1, id2):
+            self.assertTrue(repo.find_tournament_by_id(tid).has_started())
+
+    def test_conflicts(self):
+        """Rating changes of the same player by two sources are not conflicts, other changes are."""
+        writer = DataWriter(*self._files(self.shared_dir))
+        player_data = read_json(self._files(self.shared_dir)[0])["AA00001"]
+        writer.apply(DataChanges(players={"AA00001": {**player_data, "rating": 1510.0}}), source="copy1")
+        self.assertTrue(writer.ratings_changed)
+        writer.apply(DataChanges(players={"AA00001": {**player_data, "rating": 1490.0}}), source="copy2")
+        id3, changes3 = self._run_in_copy("copy3", "Juniors")
+        changes3.players = {"AA00001": {**player_data, "surname": "Other"}}
+        with self.assertRaises(DataConflictError):
+            writer.apply(changes3, source="copy3")
+        writer.commit()
+        # none of the rejected changes were applied
+        self.assertNotIn(id3, read_json(self._files(self.shared_dir)[1]))
+        self.assertEqual(read_json(self._files(self.shared_dir)[0])["AA00001"]["surname"], player_data["surname"])
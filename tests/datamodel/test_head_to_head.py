@@ -0,0 +1,88 @@
+import unittest
+from datetime import date
+import app.models.player_model as player_model
+import app.models.tournament_model as tournament_model
+from app.models.head_to_head import HeadToHeadIndex
+from tests import make_players, play_round
+from pathlib import Path
+import shutil
+import tests
+
+
+class TestHeadToHead(unittest.TestCase):
+    """Test the cross-tournament head-to-head index."""
+
+    def setUp(self) -> None:
+        self.test_dir = Path(tests.TEST_TMP_DIR, "test_head_to_head")
+        self.test_dir.mkdir(mode=0o777, parents=True, exist_ok=True)
+        self.a, self.b, self.c, self.d = make_players("AA00001", "BB00002", "CC00003", "DD00004")
+        self.index_file = Path(self.test_dir, "head_to_head.json")
+        self.index = HeadToHeadIndex(self.index_file)
+        meta = tournament_model.TournamentMetaData(tournament_id="T1", round_count=2)
+        self.tournament = tournament_model.Tournament(
+            metadata=meta, participants=[self.a, self.b, self.c, self.d]
+        )
+        # round 1 (June 1st): A beats B, C and D draw
+        play_round(self.tournament, [(self.a, self.b), (self.c, self.d)], [self.a.id(), None], 1)
+        # round 2 (June 2nd): B beats A, C beats D
+        play_round(self.tournament, [(self.b, self.a), (self.c, self.d)], [self.b.id(), self.c.id()], 2)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_record(self):
+        self.assertEqual(self.index.record_tournament(self.tournament), 4)
+        record = self.index.record(self.a.id(), self.b.id())
+        self.assertEqual((record.wins, record.draws, record.losses, record.meetings), (1, 0, 1, 2))
+        self.assertEqual(record.last_meeting, date(2024, 6, 2))
+        # the record is seen from the side of the first player
+        record = self.index.record(self.d.id(), self.c.id())
+        self.assertEqual((record.wins, record.draws, record.losses), (0, 1, 1))
+        self.assertEqual(self.index.record(self.a.id(), self.c.id()).meetings, 0)
+        self.assertEqual(sorted(self.index.opponents(self.a.id())), [str(self.b.id())])
+
+    def test_filters_and_persistence(self):
+        self.index.record_tournament(self.tournament)
+        # recording the same matches again doesn't count them twice
+        self.index.record_tournament(self.tournament)
+        self.index.commit_changes()
+        index = HeadToHeadIndex(self.index_file)
+        self.assertEqual(index.meetings(self.c.id(), self.d.id()), 2)
+        self.assertEqual(index.meetings(self.c.id(), self.d.id(), since=date(2024, 6, 2)), 1)
+        self.assertEqual(index.meetings(self.c.id(), self.d.id(), exclude_tournament="T1"), 0)
+        meetings = index.list_meetings(self.d.id(), self.c.id())
+        self.assertEqual([(m["round_idx"], m["score"]) for m in meetings], [(0, 0.5), (1, 0.0)])
+
+    def test_rebuild(self):
+        player_repo = player_model.PlayerRepository(Path(self.test_dir, "players.json"))
+        for p in (self.a, self.b, self.c, self.d):
+            player_repo.add(p)
+        player_repo.commit_changes()
+        repo = tournament_model.TournamentRepository(Path(self.test_dir, "index.json"), player_repo)
+        repo.store_tournament(self.tournament)
+        self.assertEqual(self.index.rebuild(repo), 4)
+        self.assertEqual(self.index.meetings(self.a.id(), self.b.id()), 2)
+        # tournaments loaded for the rebuild are not kept in memory, the others stay loaded
+        self.assertTrue(repo.is_loaded(self.tournament.id()))
+        repo.release_tournament(self.tournament.id())
+        self.assertEqual(self.index.rebuild(repo), 4)
+        self.assertFalse(repo.is_loaded(self.tournament.id()))
+
+    def test_pairing_avoids_past_meetings(self):
+        self.index.record_tournament(self.tournament)
+        meta = tournament_model.TournamentMetaData(tournament_id="T2", round_count=2)
+        tournament = tournament_model.Tournament(metadata=meta, participants=[self.a, self.b, self.c, self.d])
+        tournament.past_meetings = lambda p1, p2: self.index.meetings(p1, p2, exclude_tournament="T2")
+        rnd = tournament.start_next_round()
+        for match in rnd.matches:
+            self.assertEqual(self.index.meetings(match.player1().id(), match.player2().id()), 0)
+
+    def test_past_meetings_lower_pairing_quality(self):
+        self.index.record_tournament(self.tournament)
+        meta = tournament_model.TournamentMetaData(tournament_id="T2", round_count=2)
+        tournament = tournament_model.Tournament(metadata=meta, participants=[self.a, self.b, self.c, self.d])
+        # A and B lead after round 1: they met twice in T1
+        play_round(tournament, [(self.a, self.c), (self.b, self.d)], [self.a.id(), self.b.id()], 10)
+        self.assertEqual(tournament._can_play(self.a.id(), self.b.id()), 1)
+        tournament.past_meetings = self.index.meetings
+        self.assertEqual(tournament._can_play(self.a.id(), self.b.id()), 0.5)
@@ -58,6 +58,17 @@ class TestJSONStorage(unittest.TestCase):
         self.assertEqual(data['another_test_str'], "done")
         self.assertNotIn('test_float', data)
 
+    def test_lazy_load(self):
+        store = JSONStorage(self.json_file, lazy=True)
+        self.assertFalse(store.loaded())
+        self.assertEqual(store['test_int'], self.initial_test_data['test_int'])
+        self.assertTrue(store.loaded())
+        # writing an unread lazy storage keeps the file content
+        store = JSONStorage(self.json_file, lazy=True)
+        store.write_store()
+        with open(self.json_file, "r") as f:
+            self.assertEqual(json.load(f), self.initial_test_data)
+
 
 @dataclass
 class DummyEntity(EntityABC):
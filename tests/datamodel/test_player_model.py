@@ -4,6 +4,8 @@ import app.models.player_model as player_model
 from datetime import date
 from pathlib import Path
 import json
+import pickle
+import threading
 
 
 class TestNationalPlayerID(unittest.TestCase):
@@ -43,6 +45,61 @@ class TestNationalPlayerID(unittest.TestCase):
         self.assertEqual(len(str(n_p_id)), 7)
         self.assertEqual(n_p_id, "AZ12345")
 
+    def test_interned_id(self):
+        """IDs are interned ints, interchangeable with their string form."""
+        n_p_id = player_model.NationalPlayerID("AZ12345")
+        self.assertIs(n_p_id, player_model.NationalPlayerID("AZ12345"))
+        self.assertIs(n_p_id, player_model.NationalPlayerID(n_p_id))
+        self.assertIsInstance(n_p_id, int)
+        self.assertEqual(int(n_p_id), 25 * 100000 + 12345)
+        self.assertNotEqual(n_p_id, "AZ12346")
+        self.assertNotEqual(n_p_id, player_model.NationalPlayerID("BA12345"))
+        self.assertLess(n_p_id, player_model.NationalPlayerID("BA00000"))
+        self.assertEqual(f"{n_p_id}", "AZ12345")
+        self.assertEqual({"AZ12345": 1}[n_p_id], 1)
+        self.assertEqual({n_p_id: 1}["AZ12345"], 1)
+        self.assertIn(n_p_id, {"AZ12345"})
+        self.assertEqual(hash(n_p_id), hash("AZ12345"))
+        # not equal to its packed int
+        self.assertNotEqual(n_p_id, int(n_p_id))
+        self.assertNotIn(int(n_p_id), {n_p_id: 1})
+        self.assertTrue(player_model.NationalPlayerID("AA00000"))
+        self.assertIs(pickle.loads(pickle.dumps(n_p_id)), n_p_id)
+
+    def test_concurrent_interning(self):
+        """IDs created at once by several threads are interned once."""
+        ids = []
+        barrier = threading.Barrier(8)
+
+        def create():
+            barrier.wait()
+            ids.append(player_model.NationalPlayerID("QZ54321"))
+
+        threads = [threading.Thread(target=create) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len({id(i) for i in ids}), 1)
+
+    def test_player_id_from_string(self):
+        """Player IDs given as strings are converted to NationalPlayerID."""
+        player = player_model.Player(national_player_id="AZ12345", surname="Doe", name="John")
+        self.assertIs(player.id(), player_model.NationalPlayerID("AZ12345"))
+        # invalid IDs are kept as typed, and reported by is_valid()
+        player = player_model.Player(national_player_id="AZ-12345", surname="Doe", name="John")
+        self.assertEqual(player.id(), "AZ-12345")
+        self.assertFalse(player.is_valid())
+
+    def test_json_id(self):
+        """IDs are written to JSON as strings, not as their packed int."""
+        player = player_model.Player(
+            national_player_id="AZ12345", surname="Doe", name="John", birthdate=date(1985, 8, 19)
+        )
+        data = json.loads(json.dumps({str(player.id()): player}, cls=player_model.PlayerJSONEncoder))
+        self.assertEqual(data, {"AZ12345": json.loads(json.dumps(player, cls=player_model.PlayerJSONEncoder))})
+        self.assertEqual(data["AZ12345"]["national_player_id"], "AZ12345")
+
     @unittest.expectedFailure
     def test_invalid_init(self):
         """Bad string format
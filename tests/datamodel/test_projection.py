@@ -0,0 +1,125 @@
+import unittest
+import itertools
+import random
+from app.models.projection import project_standings, OUTCOMES
+from tests import make_players
+import app.models.tournament_model as tournament_model
+from datetime import datetime
+
+
+def brute_force_ranges(scores: dict, matches: list) -> dict:
+    """Rank ranges computed by enumerating all outcomes, without pruning."""
+    ranges = {p: [len(scores), 1] for p in scores}
+    for outcomes in itertools.product(OUTCOMES, repeat=len(matches)):
+        final = dict(scores)
+        for (p1, p2), (s1, s2) in zip(matches, outcomes):
+            final[p1] += s1
+            final[p2] += s2
+        for p, s in final.items():
+            ranges[p][0] = min(ranges[p][0], 1 + sum(1 for o in final.values() if o > s))
+            ranges[p][1] = max(ranges[p][1], sum(1 for o in final.values() if o >= s))
+    return {p: tuple(r) for p, r in ranges.items()}
+
+
+class TestStandingsProjection(unittest.TestCase):
+    """Test the projection of final ranks."""
+
+    def test_exact_projection(self):
+        """The branch and bound search finds the same rank ranges as a full enumeration."""
+        rng = random.Random(1)
+        for _ in range(20):
+            players = [f"P{n}" for n in range(8)]
+            scores = {p: rng.choice([0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0]) for p in players}
+            rng.shuffle(players)
+            matches = [(players[i], players[i + 1]) for i in range(0, rng.choice([2, 4, 6, 8]), 2)]
+            projection = project_standings(scores, matches)
+            self.assertTrue(projection.exact)
+            expected = brute_force_ranges(scores, matches)
+            for p in projection.players:
+                self.assertEqual((p.best_rank, p.worst_rank), expected[p.player_id])
+
+    def test_idle_players(self):
+        """Players who don't play anymore are counted without branching on them."""
+        rng = random.Random(2)
+        for _ in range(10):
+            players = [f"P{n}" for n in range(30)]
+            scores = {p: rng.choice([0.0, 0.5, 1.0, 1.5, 2.0]) for p in players}
+            rng.shuffle(players)
+            matches = [(players[i], players[i + 1]) for i in range(0, 6, 2)]
+            projection = project_standings(scores, matches)
+            self.assertTrue(projection.exact)
+            expected = brute_force_ranges(scores, matches)
+            for p in projection.players:
+                self.assertEqual((p.best_rank, p.worst_rank), expected[p.player_id])
+
+    def test_exact_limit(self):
+        """The projection samples outcomes when the searches times 3^k outcomes are too many."""
+        scores = {f"P{n}": n / 2 for n in range(40)}
+        matches = [(f"P{n}", f"P{n + 1}") for n in range(0, 8, 2)]
+        # 8 players in matches and 32 distinct idle scores: 40 searches of 3^4 outcomes
+        self.assertTrue(project_standings(scores, matches, max_exact_outcomes=40 * 81).exact)
+        self.assertFalse(project_standings(scores, matches, samples=10, max_exact_outcomes=40 * 81 - 1).exact)
+
+    def test_clinched_and_eliminated(self):
+        scores = {"A": 3.0, "B": 1.5, "C": 1.0, "D": 1.0}
+        projection = project_standings(scores, [("A", "C"), ("B", "D")])
+        self.assertTrue(projection.player("A").clinched)
+        self.assertTrue(projection.player("C").eliminated)
+        self.assertTrue(projection.player("B").eliminated)
+        scores["B"] = 2.0
+        projection = project_standings(scores, [("A", "B"), ("C", "D")])
+        self.assertFalse(projection.player("A").clinched)
+        self.assertFalse(projection.player("B").eliminated)
+
+    def test_rounds_left(self):
+        """With rounds left after the current one, first place is only decided when no player can catch up."""
+        scores = {"A": 1.0, "B": 0.0, "C": 1.0, "D": 0.0}
+        projection = project_standings(scores, [], rounds_left=3)
+        self.assertEqual(projection.player("A").worst_rank, 2)
+        self.assertEqual(projection.player("B").best_rank, 3)
+        for p in projection.players:
+            self.assertFalse(p.clinched)
+            self.assertFalse(p.eliminated)
+        scores = {"A": 5.0, "B": 2.5, "C": 1.0, "D": 1.0}
+        projection = project_standings(scores, [("A", "C"), ("B", "D")], rounds_left=1)
+        self.assertTrue(projection.player("A").clinched)
+        self.assertTrue(projection.player("B").eliminated)
+        projection = project_standings(scores, [("A", "C"), ("B", "D")], rounds_left=2)
+        self.assertFalse(projection.player("A").clinched)
+        self.assertFalse(projection.player("B").eliminated)
+        self.assertTrue(projection.player("C").eliminated)
+
+    def test_sampled_projection(self):
+        """Sampled rank ranges stay within the exact ranges."""
+        scores = {f"P{n}": float(n % 4) for n in range(12)}
+        matches = [(f"P{n}", f"P{n + 1}") for n in range(0, 12, 2)]
+        exact = project_standings(scores, matches)
+        sampled = project_standings(scores, matches, max_exact=2, samples=2000, rng=random.Random(0))
+        self.assertFalse(sampled.exact)
+        for p in sampled.players:
+            e = exact.player(p.player_id)
+            self.assertGreaterEqual(p.best_rank, e.best_rank)
+            self.assertLessEqual(p.worst_rank, e.worst_rank)
+
+    def test_tournament_projection(self):
+        """Projection of a tournament during its last round."""
+        a, b, c, d = make_players("AA00001", "BB00002", "CC00003", "DD00004")
+        meta = tournament_model.TournamentMetaData(tournament_id="PR", round_count=2)
+        tournament = tournament_model.Tournament(metadata=meta, participants=[a, b, c, d])
+        tournament.start_next_round(player_pairs=[(a, b), (c, d)])
+        for m, winner in enumerate([a.id(), c.id()]):
+            tournament.start_a_match(m, start_time=datetime(2024, 6, 1, 10, 0))
+            tournament.end_a_match(m, winner_id=winner, end_time=datetime(2024, 6, 1, 11, 0))
+        projection = tournament.project_standings()
+        self.assertEqual(projection.remaining_matches, 0)
+        self.assertEqual(projection.rounds_left, 1)
+        # A and C won their first match: one round left, nothing is decided yet
+        self.assertFalse(projection.player(a.id()).clinched)
+        self.assertFalse(projection.player(b.id()).eliminated)
+        tournament.start_next_round(player_pairs=[(a, c), (b, d)])
+        tournament.start_a_match(0, start_time=datetime(2024, 6, 2, 10, 0))
+        projection = tournament.project_standings()
+        self.assertEqual(projection.remaining_matches, 2)
+        self.assertEqual(projection.rounds_left, 0)
+        self.assertEqual((projection.player(a.id()).best_rank, projection.player(a.id()).worst_rank), (1, 3))
+        self.assertTrue(projection.player(b.id()).eliminated)
@@ -0,0 +1,132 @@
+import unittest
+import tests
+import app.models.player_model as player_model
+import app.models.tournament_model as tournament_model
+from app.models.rating_model import (
+    DEFAULT_RATING,
+    EloRatingEngine,
+    MatchRecord,
+    RatingUpdater,
+    expected_score,
+    load_match_history,
+    tournament_match_records,
+)
+from datetime import datetime
+from pathlib import Path
+import shutil
+from tests import make_players, play_round
+
+
+class TestEloRatingEngine(unittest.TestCase):
+    """Test the Elo computations."""
+
+    def test_expected_score(self):
+        self.assertEqual(expected_score(1500, 1500), 0.5)
+        self.assertAlmostEqual(expected_score(1600, 1400) + expected_score(1400, 1600), 1.0)
+        self.assertGreater(expected_score(1600, 1400), 0.75)
+
+    def test_round_is_applied_as_a_batch(self):
+        """All matches of a round use the ratings from before the round,
+        while the next round uses the updated ratings."""
+        records = [
+            MatchRecord(1.0, "T", 0, "AA00001", "BB00002", 1.0),
+            MatchRecord(2.0, "T", 0, "BB00002", "CC00003", 0.5),
+        ]
+        engine = EloRatingEngine(k_factor=20)
+        self.assertEqual(engine.apply_records(records), 2)
+        # B is expected to score 0.5 in both matches, from its 1500 rating.
+        self.assertEqual(engine.rating("AA00001"), DEFAULT_RATING + 10)
+        self.assertEqual(engine.rating("BB00002"), DEFAULT_RATING - 10)
+        self.assertEqual(engine.rating("CC00003"), DEFAULT_RATING)
+        self.assertEqual(engine.rating("DD00004"), DEFAULT_RATING)
+        engine.apply_records([MatchRecord(3.0, "T", 1, "AA00001", "CC00003", 0.0)])
+        self.assertAlmostEqual(engine.rating("CC00003"), DEFAULT_RATING + 20 * expected_score(1510, 1500))
+
+
+class TestRatingUpdater(unittest.TestCase):
+    """Test rating updates stored in the repositories."""
+
+    def setUp(self) -> None:
+        self.test_dir = Path(tests.TEST_TMP_DIR, "test_rating_model")
+        self.test_dir.mkdir(mode=0o777, parents=True, exist_ok=True)
+        self.player_repo = player_model.PlayerRepository(Path(self.test_dir, "players.json"))
+        self.a, self.b, self.c, self.d = make_players("AA00001", "BB00002", "CC00003", "DD00004")
+        for p in (self.a, self.b, self.c, self.d):
+            self.player_repo.add(p)
+        self.player_repo.commit_changes()
+        self.tournament_repo = tournament_model.TournamentRepository(
+            metadata_file=Path(self.test_dir, "tournaments.json"), player_repo=self.player_repo
+        )
+        meta = tournament_model.TournamentMetaData(
+            tournament_id="RT", round_count=2, data_file="rt.json"
+        )
+        self.tournament = tournament_model.Tournament(
+            metadata=meta, participants=[self.a, self.b, self.c, self.d]
+        )
+        play_round(self.tournament, [(self.a, self.b), (self.c, self.d)], [self.a.id(), None], 1)
+        play_round(self.tournament, [(self.a, self.c), (self.b, self.d)], [None, self.b.id()], 2)
+        self.tournament_repo.store_tournament(self.tournament)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_match_records(self):
+        records = tournament_match_records(self.tournament.asdict())
+        self.assertEqual(len(records), 4)
+        self.assertListEqual([r.round_idx for r in records], [0, 0, 1, 1])
+        self.assertEqual(records[0].player1_id, "AA00001")
+        self.assertEqual(records[0].player1_score, 1.0)
+
+    def test_update_then_rebuild(self):
+        """Rating a tournament once it ended gives the same ratings as a full rebuild."""
+        updater = RatingUpdater(self.tournament_repo)
+        self.assertEqual(updater.update(self.tournament), 4)
+        self.assertTrue(self.tournament.metadata.rated)
+        # already rated: no effect
+        self.assertEqual(updater.update(self.tournament), 0)
+        ratings = self.player_repo.ratings()
+        self.assertEqual(len(ratings), 4)
+        self.assertGreater(ratings["AA00001"], ratings["CC00003"])
+        self.assertLess(ratings["DD00004"], DEFAULT_RATING)
+
+        match_count, _ = updater.rebuild()
+        self.assertEqual(match_count, 4)
+        self.assertDictEqual(self.player_repo.ratings(), ratings)
+        reloaded = player_model.PlayerRepository(Path(self.test_dir, "players.json"))
+        self.assertEqual(reloaded.find_by_id("AA00001").rating, ratings["AA00001"])
+
+    def test_parallel_history_load(self):
+        """Records loaded by worker processes are ordered by tournament end time, then by round."""
+        meta = tournament_model.TournamentMetaData(
+            tournament_id="RT2", round_count=1, data_file="rt2.json"
+        )
+        other = tournament_model.Tournament(metadata=meta, participants=[self.a, self.b, self.c, self.d])
+        play_round(other, [(self.d, self.a), (self.c, self.b)], [self.d.id(), self.c.id()], 1)
+        self.tournament_repo.store_tournament(other)
+        files = [Path(self.test_dir, "rt.json"), Path(self.test_dir, "rt2.json")]
+        sequential = list(load_match_history(files, workers=1))
+        parallel = list(load_match_history(files, workers=2))
+        self.assertEqual(len(parallel), 6)
+        self.assertListEqual(parallel, sequential)
+        # RT2 ended first (June 1st): its matches come first, although RT started the same day
+        self.assertListEqual(
+            [(r.tournament_id, r.round_idx) for r in parallel], [("RT2", 0)] * 2 + [("RT", 0)] * 2 + [("RT", 1)] * 2
+        )
+
+    def test_overlapping_tournaments(self):
+        """With tournaments running at the same time, a rebuild gives the ratings of incremental updates."""
+        meta = tournament_model.TournamentMetaData(
+            tournament_id="RT2", round_count=2, data_file="rt2.json"
+        )
+        other = tournament_model.Tournament(metadata=meta, participants=[self.a, self.b, self.c, self.d])
+        # RT2 rounds are played between and after the rounds of RT (June 1st and 2nd), at noon
+        play_round(other, [(self.d, self.a), (self.c, self.b)], [self.d.id(), self.c.id()], 1)
+        other.rounds[0].matches[0].end_time = datetime(2024, 6, 1, 12)
+        play_round(other, [(self.a, self.b), (self.c, self.d)], [self.b.id(), None], 3)
+        self.tournament_repo.store_tournament(other)
+        updater = RatingUpdater(self.tournament_repo)
+        updater.update(self.tournament)
+        updater.update(other)
+        incremental = self.player_repo.ratings()
+        updater.rebuild(workers=1)
+        self.assertDictEqual(self.player_repo.ratings(), incremental)
@@ -0,0 +1,54 @@
+import unittest
+import app.models.tournament_model as tournament_model
+from app.models.tiebreak import TieBreakBoard, TieBreakScores
+from tests import make_players, play_round
+
+
+class TestTieBreaks(unittest.TestCase):
+    """Test tie-break scores and their use in ranking lists."""
+
+    def setUp(self) -> None:
+        self.a, self.b, self.c, self.d = make_players("AA00001", "BB00002", "CC00003", "DD00004")
+        meta = tournament_model.TournamentMetaData(tournament_id="TB", round_count=2)
+        self.tournament = tournament_model.Tournament(
+            metadata=meta, participants=[self.a, self.b, self.c, self.d]
+        )
+        # round 1: A beats B, C and D draw
+        play_round(self.tournament, [(self.a, self.b), (self.c, self.d)], [self.a.id(), None], 1)
+        # round 2: A and C draw, B beats D
+        play_round(self.tournament, [(self.a, self.c), (self.b, self.d)], [None, self.b.id()], 2)
+
+    def test_tie_break_scores(self):
+        """Tie-break scores are computed from the results of ended matches."""
+        self.assertEqual(
+            self.tournament.tie_breaks(self.a.id()),
+            TieBreakScores(buchholz=2.0, median_buchholz=2.0, sonneborn_berger=1.5, cumulative=2.5),
+        )
+        self.assertEqual(self.tournament.tie_breaks(self.b.id()).sonneborn_berger, 0.5)
+        self.assertEqual(self.tournament.tie_breaks(self.c.id()).sonneborn_berger, 1.0)
+        self.assertEqual(self.tournament.tie_breaks(self.d.id()).cumulative, 1.0)
+
+    def test_ranking_list_breaks_ties(self):
+        """B and C have the same score, C wins the tie-break (Sonneborn-Berger)."""
+        ranking_list = self.tournament.ranking_list()
+        self.assertListEqual(
+            ranking_list,
+            [
+                (self.a.id(), 1, 1.5),
+                (self.c.id(), 2, 1.0),
+                (self.b.id(), 3, 1.0),
+                (self.d.id(), 4, 0.5),
+            ],
+        )
+
+    def test_incremental_update_matches_rebuild(self):
+        """Correcting an outcome updates the tie-breaks as a full recomputation would."""
+        self.tournament.rounds[1].matches[1].end(winner=self.d.id())
+        self.tournament._tie_breaks.record_match(1, 1, self.tournament.rounds[1].matches[1])
+        rebuilt = TieBreakBoard()
+        rebuilt.rebuild(self.tournament.rounds)
+        for player in self.tournament.participants:
+            self.assertEqual(
+                self.tournament.tie_breaks(player.id()), rebuilt.tie_breaks(player.id())
+            )
+        self.assertEqual(self.tournament.tie_breaks(self.b.id()).sonneborn_berger, 0.0)
@@ -0,0 +1,120 @@
+import unittest
+import app.models.player_model as player_model
+import app.models.tournament_model as tournament_model
+from app.models.tournament_events import MATCH_ENDED, OUTCOME_CORRECTED
+from tests import make_players
+from datetime import datetime
+from pathlib import Path
+import json
+import shutil
+import tests
+
+
+class TestTournamentEvents(unittest.TestCase):
+    """Test the event-sourced tournament storage."""
+
+    def setUp(self) -> None:
+        self.test_dir = Path(tests.TEST_TMP_DIR, "test_tournament_events")
+        self.test_dir.mkdir(mode=0o777, parents=True, exist_ok=True)
+        self.players = make_players("AA00001", "BB00002", "CC00003", "DD00004")
+        self.player_repo = player_model.PlayerRepository(Path(self.test_dir, "players.json"))
+        for p in self.players:
+            self.player_repo.add(p)
+        self.player_repo.commit_changes()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def make_repo(self, snapshot_interval: int = 50) -> tournament_model.TournamentRepository:
+        return tournament_model.TournamentRepository(
+            Path(self.test_dir, "index.json"),
+            self.player_repo,
+            event_sourcing=True,
+            snapshot_interval=snapshot_interval,
+        )
+
+    def play(self, repo: tournament_model.TournamentRepository) -> tournament_model.Tournament:
+        """Plays a 2-round tournament, storing it after each change."""
+        a, b, c, d = self.players
+        meta = tournament_model.TournamentMetaData(round_count=2, description="events")
+        tournament = tournament_model.Tournament(metadata=meta)
+        repo.store_tournament(tournament)
+        for p in self.players:
+            tournament.add_participant(p)
+            repo.store_tournament(tournament)
+        rounds = [([(a, b), (c, d)], [a.id(), None]), ([(a, c), (b, d)], [c.id(), b.id()])]
+        for day, (pairs, winners) in enumerate(rounds):
+            tournament.start_next_round(player_pairs=pairs)
+            repo.store_tournament(tournament)
+            for m, winner in enumerate(winners):
+                tournament.start_a_match(m, start_time=datetime(2024, 6, day + 1, 10, 0))
+                repo.store_tournament(tournament)
+                tournament.end_a_match(m, winner_id=winner, end_time=datetime(2024, 6, day + 1, 11, 0))
+                repo.store_tournament(tournament)
+        return tournament
+
+    def test_replay(self):
+        """A tournament rebuilt from its snapshot and event log has the same state."""
+        repo = self.make_repo(snapshot_interval=5)
+        tournament = self.play(repo)
+        log_file = repo.event_log(tournament.metadata).file()
+        events = [json.loads(line) for line in log_file.read_text().splitlines()]
+        # 4 registrations, 2 round starts, 4 match starts and 4 match ends
+        self.assertEqual([e["seq"] for e in events], list(range(1, 15)))
+        snapshot = json.loads(repo.tournament_file(tournament.metadata).read_text())
+        self.assertEqual(snapshot["event_seq"], 10)
+        loaded = self.make_repo(snapshot_interval=5).load_tournament(tournament.id())
+        self.assertIsNot(loaded, tournament)
+        self.assertEqual(loaded.asdict(), tournament.asdict())
+        self.assertTrue(loaded.has_ended())
+
+    def test_snapshot_interval(self):
+        """Stores between snapshots only append to the event log."""
+        repo = self.make_repo(snapshot_interval=100)
+        tournament = self.play(repo)
+        snapshot = json.loads(repo.tournament_file(tournament.metadata).read_text())
+        self.assertEqual(snapshot["event_seq"], 0)
+        self.assertEqual(snapshot["participants"], [])
+        loaded = self.make_repo().load_tournament(tournament.id())
+        self.assertEqual(loaded.asdict(), tournament.asdict())
+
+    def test_outcome_corrected(self):
+        """Ending a match again records a correction, which is replayed."""
+        repo = self.make_repo()
+        a, b, c, d = self.players
+        meta = tournament_model.TournamentMetaData(round_count=2, description="correction")
+        tournament = tournament_model.Tournament(metadata=meta, participants=[a, b, c, d])
+        repo.store_tournament(tournament)
+        tournament.start_next_round(player_pairs=[(a, b), (c, d)])
+        tournament.start_a_match(0, start_time=datetime(2024, 6, 1, 10, 0))
+        tournament.end_a_match(0, winner_id=a.id(), end_time=datetime(2024, 6, 1, 11, 0))
+        tournament.end_a_match(0, winner_id=b.id(), end_time=datetime(2024, 6, 1, 11, 5))
+        repo.store_tournament(tournament)
+        log_file = repo.event_log(tournament.metadata).file()
+        events = [json.loads(line) for line in log_file.read_text().splitlines()]
+        self.assertEqual([e["type"] for e in events[-2:]], [MATCH_ENDED, OUTCOME_CORRECTED])
+        loaded = self.make_repo().load_tournament(tournament.id())
+        self.assertEqual(loaded.player_score(b.id()), 1.0)
+        self.assertEqual(loaded.asdict(), tournament.asdict())
+
+    def test_incomplete_last_line(self):
+        """An interrupted write is dropped before the next events are appended."""
+        repo = self.make_repo(snapshot_interval=100)
+        a, b, c, d = self.players
+        meta = tournament_model.TournamentMetaData(round_count=2, description="torn")
+        tournament = tournament_model.Tournament(metadata=meta, participants=[a, b, c, d])
+        repo.store_tournament(tournament)
+        tournament.start_next_round(player_pairs=[(a, b), (c, d)])
+        repo.store_tournament(tournament)
+        log_file = repo.event_log(tournament.metadata).file()
+        with open(log_file, "ab") as f:
+            f.write(b'{"seq": 2, "type": "match_st')
+        repo = self.make_repo(snapshot_interval=100)
+        loaded = repo.load_tournament(tournament.id())
+        self.assertEqual(loaded.asdict(), tournament.asdict())
+        loaded.start_a_match(0, start_time=datetime(2024, 6, 1, 10, 0))
+        repo.store_tournament(loaded)
+        events = [json.loads(line) for line in log_file.read_text().splitlines()]
+        self.assertEqual([e["seq"] for e in events], [1, 2])
+        reloaded = self.make_repo(snapshot_interval=100).load_tournament(tournament.id())
+        self.assertEqual(reloaded.asdict(), loaded.asdict())
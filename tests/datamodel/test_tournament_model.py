@@ -1,9 +1,15 @@
 import unittest
+import dataclasses
 import app.models.player_model as player_model
 import app.models.tournament_model as tournament_model
 from datetime import date, datetime
+from pathlib import Path
 import json
 import random
+import shutil
+import threading
+import time
+import tests
 
 
 class utils:
@@ -228,6 +234,157 @@ class TestTournamentJSON(unittest.TestCase):
         self.assertEqual(tournament.metadata, loaded)
 
 
+class TestSerializationCache(unittest.TestCase):
+    """Unchanged rounds and tournaments are not serialized or stored again."""
+
+    def setUp(self) -> None:
+        self.test_dir = Path(tests.TEST_TMP_DIR, "test_serialization_cache")
+        self.test_dir.mkdir(mode=0o777, parents=True, exist_ok=True)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_round_asdict_cache(self):
+        tournament = utils.make_tournament()
+        first = tournament.asdict()
+        self.assertIs(tournament.asdict()["rounds"][0], first["rounds"][0])
+        match = tournament.rounds[0].matches[2]
+        match.end(winner=match.player1().id(), end_time=datetime.fromisoformat("2024-05-02 16:00:00"))
+        changed = tournament.asdict()
+        self.assertIsNot(changed["rounds"][0], first["rounds"][0])
+        self.assertEqual(changed["rounds"][0]["matches"][2]["end_time"], "2024-05-02T16:00:00")
+        self.assertEqual(changed["rounds"][0]["matches"][2]["players"][0][1], 1.0)
+
+    def test_store_unchanged_tournament(self):
+        repo = tournament_model.TournamentRepository(Path(self.test_dir, "index.json"), player_repo=None)
+        tournament = utils.make_tournament()
+        repo.store_tournament(tournament)
+        tournament_file = repo.tournament_file(tournament.metadata)
+        tournament_file.write_text("unchanged")
+        repo.store_tournament(tournament)
+        self.assertEqual(tournament_file.read_text(), "unchanged")
+        match = tournament.rounds[0].matches[2]
+        match.end(winner=None, end_time=datetime.fromisoformat("2024-05-02 16:00:00"))
+        repo.store_tournament(tournament)
+        self.assertEqual(json.loads(tournament_file.read_text()), tournament.asdict())
+
+
+class TestThreadSafety(unittest.TestCase):
+    """Concurrent result entry on a thread-safe tournament."""
+
+    def test_concurrent_end_matches(self):
+        """Matches ended from several threads give the same standings as sequential result entry."""
+        players = [utils.make_random_player() for _ in range(40)]
+        start_time = datetime.fromisoformat("2024-06-13T09:00:00")
+        end_time = datetime.fromisoformat("2024-06-13T10:00:00")
+        tournaments = []
+        for thread_safe in (True, False):
+            tournament = tournament_model.Tournament(
+                metadata=utils.make_tournament_metadata(rounds=2), participants=list(players), thread_safe=thread_safe
+            )
+            tournament.start_next_round(player_pairs=[(players[n], players[n + 1]) for n in range(0, 40, 2)])
+            tournaments.append(tournament)
+        concurrent, sequential = tournaments
+        barrier = threading.Barrier(20)
+
+        def enter_result(m: int):
+            barrier.wait()
+            concurrent.start_a_match(m, start_time=start_time)
+            concurrent.end_a_match(m, winner_id=players[2 * m].id() if m % 3 else None, end_time=end_time)
+
+        threads = [threading.Thread(target=enter_result, args=(m,)) for m in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for m in range(20):
+            sequential.start_a_match(m, start_time=start_time)
+            sequential.end_a_match(m, winner_id=players[2 * m].id() if m % 3 else None, end_time=end_time)
+        self.assertTrue(concurrent.current_round().has_ended())
+        self.assertEqual(concurrent.current_round().ended_count(), 20)
+        self.assertEqual(concurrent.ranking_list(), sequential.ranking_list())
+        self.assertEqual(concurrent.player_ranks, sequential.player_ranks)
+        concurrent.start_next_round()
+        self.assertEqual(len(concurrent.current_round().matches), 20)
+
+    def test_match_update_outside_state_lock(self):
+        """Matches end while another thread updates the shared state; reads wait for the match updates."""
+        tournament = utils.make_tournament_not_started(player_count=4, round_count=2)
+        tournament.set_thread_safe()
+        tournament.start_next_round()
+        start_time = datetime.fromisoformat("2024-06-13T09:00:00")
+        tournament.start_a_match(0, start_time=start_time)
+        match = tournament.current_round().matches[0]
+        with tournament._state_update():
+            thread = threading.Thread(
+                target=tournament.end_a_match,
+                args=(0, None, datetime.fromisoformat("2024-06-13T10:00:00")),
+            )
+            thread.start()
+            for _ in range(100):
+                if match.has_ended():
+                    break
+                time.sleep(0.01)
+            self.assertTrue(match.has_ended())
+        thread.join()
+        self.assertEqual(tournament.asdict()["rounds"][0]["matches"][0], match.asdict())
+        self.assertEqual(tournament.player_ranks[match.player1().id()][1], 0.5)
+
+
+class TestSnapshot(unittest.TestCase):
+    """Immutable snapshots of a tournament."""
+
+    def test_same_answers_as_live(self):
+        """Queries give the same answers on a snapshot as on the live tournament, for unknown players too."""
+        tournament = utils.make_tournament_not_started(player_count=4, round_count=2)
+        tournament.start_next_round()
+        tournament.start_a_match(0, start_time=datetime.fromisoformat("2024-06-13T09:00:00"))
+        tournament.end_a_match(0, winner_id=None, end_time=datetime.fromisoformat("2024-06-13T10:00:00"))
+        snapshot = tournament.snapshot()
+        unknown_id = player_model.NationalPlayerID("ZZ99999")
+        for player_id in [p.id() for p in tournament.participants] + [unknown_id, str(unknown_id)]:
+            self.assertEqual(snapshot.player_rank(player_id), tournament.player_rank(player_id))
+            self.assertEqual(snapshot.tie_breaks(player_id), tournament.tie_breaks(player_id))
+            self.assertEqual(
+                snapshot.current_round().find_player_match(player_id) is None,
+                tournament.current_round().find_player_match(player_id) is None,
+            )
+        for live, snap in zip(tournament.current_round().matches, snapshot.current_round().matches):
+            for player_id in (live.player1().id(), live.player2().id(), None):
+                self.assertEqual(snap.player_score(player_id), live.player_score(player_id))
+            for match in (live, snap):
+                with self.assertRaises(KeyError):
+                    match.player_score(unknown_id)
+
+    def test_snapshot(self):
+        tournament = utils.make_tournament_not_started(player_count=6, round_count=2)
+        tournament.start_next_round()
+        start_time = datetime.fromisoformat("2024-06-13T09:00:00")
+        for m in range(3):
+            tournament.start_a_match(m, start_time=start_time)
+        tournament.end_a_match(0, winner_id=None, end_time=datetime.fromisoformat("2024-06-13T10:00:00"))
+        snapshot = tournament.snapshot()
+        self.assertIs(tournament.snapshot(), snapshot)
+        self.assertEqual(snapshot.ranking_list(), tournament.ranking_list())
+        self.assertEqual([r.asdict() if r else None for r in snapshot.rounds], tournament.asdict()["rounds"])
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            snapshot.current_round_idx = 1
+        # later changes don't show in the snapshot
+        for m in (1, 2):
+            tournament.end_a_match(m, winner_id=None, end_time=datetime.fromisoformat("2024-06-13T10:00:00"))
+        self.assertFalse(snapshot.current_round().has_ended())
+        self.assertFalse(snapshot.current_round().matches[1].has_ended())
+        first_round = tournament.snapshot().rounds[0]
+        self.assertTrue(first_round.has_ended())
+        # unchanged rounds are shared between snapshots
+        tournament.start_next_round()
+        second = tournament.snapshot()
+        self.assertIs(second.rounds[0], first_round)
+        self.assertEqual(second.current_round_idx, 1)
+        self.assertEqual(second.tie_breaks(tournament.participants[0].id()),
+                         tournament.tie_breaks(tournament.participants[0].id()))
+
+
 class TestMatch(unittest.TestCase):
     """Test Match"""
 
@@ -392,6 +549,30 @@ class TestRound(unittest.TestCase):
         )
 
 
+    def test_round_match_states(self):
+        """The Round keeps track of pending, running and ended matches as they start and end."""
+        round = tournament_model.Round("a Round")
+        player_pairs = [
+            (utils.make_random_player(), utils.make_random_player()) for _ in range(4)
+        ]
+        round.setup(player_pairs)
+        self.assertEqual(round.pending_indexes(), [0, 1, 2, 3])
+        self.assertFalse(round.has_ended())
+        round.matches[1].start(start_time=datetime.fromisoformat("2024-06-01T12:00:00"))
+        round.matches[3].start(start_time=datetime.fromisoformat("2024-06-01T12:00:00"))
+        self.assertEqual(round.pending_indexes(), [0, 2])
+        self.assertEqual(round.running_indexes(), [1, 3])
+        round.matches[3].end(winner=None, end_time=datetime.fromisoformat("2024-06-01T12:30:00"))
+        self.assertEqual(round.running_indexes(), [1])
+        self.assertEqual(round.ended_count(), 1)
+        for m in (0, 2):
+            round.matches[m].start(start_time=datetime.fromisoformat("2024-06-01T12:00:00"))
+        for m in (0, 1, 2):
+            round.matches[m].end(winner=None, end_time=datetime.fromisoformat("2024-06-01T12:30:00"))
+        self.assertTrue(round.has_ended())
+        self.assertEqual((round.pending_count(), round.running_count(), round.ended_count()), (0, 0, 4))
+
+
 class TestTournament(unittest.TestCase):
     """Test the tournament class."""
 
@@ -599,6 +780,52 @@ class TestTournament(unittest.TestCase):
         self.assertTrue(tournament.has_ended())
         self.assertEqual(tournament.metadata.end_date, date(2024, 6, 13))
 
+    def test_end_matches(self):
+        """Ending several matches at once gives the same state as ending them one by one."""
+        tournament = utils.make_tournament_not_started(player_count=10, round_count=1)
+        tournament.start_next_round()
+        start_time = datetime.fromisoformat("2024-06-13T09:00:00")
+        for m in range(5):
+            tournament.start_a_match(match_index=m, start_time=start_time)
+        expected = tournament_model.Tournament(
+            metadata=utils.make_tournament_metadata(rounds=1),
+            participants=list(tournament.participants),
+            rounds=[tournament_model.Round(tournament.current_round().name, [
+                tournament_model.Match(player1=(m.player1(), 0.0), player2=(m.player2(), 0.0), start_time=start_time)
+                for m in tournament.current_round().matches
+            ])],
+            current_round=0,
+        )
+        results = [
+            (m, tournament.current_round().matches[m].player1().id() if m % 2 else None,
+             datetime.fromisoformat(f"2024-06-13T09:1{m}:00"))
+            for m in range(5)
+        ]
+        for match_index, winner_id, end_time in results:
+            expected.end_a_match(match_index, winner_id=winner_id, end_time=end_time)
+        ended = tournament.end_matches(results)
+        self.assertEqual(len(ended), 5)
+        self.assertTrue(tournament.has_ended())
+        self.assertEqual(tournament.ranking_list(), expected.ranking_list())
+        self.assertEqual(tournament.metadata.end_date, date(2024, 6, 13))
+
+    def test_end_matches_invalid_result(self):
+        """When one result is invalid, no match is ended."""
+        tournament = utils.make_tournament_not_started(player_count=6, round_count=1)
+        tournament.start_next_round()
+        start_time = datetime.fromisoformat("2024-06-13T09:00:00")
+        for m in range(3):
+            tournament.start_a_match(match_index=m, start_time=start_time)
+        before = tournament.asdict()
+        end_time = datetime.fromisoformat("2024-06-13T09:10:00")
+        results = [(0, None, end_time), (1, None, end_time), (2, None, start_time)]
+        with self.assertRaises(ValueError):
+            tournament.end_matches(results)
+        with self.assertRaises(KeyError):
+            tournament.end_matches([(0, None, end_time), (1, "ZZ99999", end_time)])
+        self.assertEqual(tournament.asdict(), before)
+        self.assertEqual(tournament.current_round().running_count(), 3)
+
     @unittest.expectedFailure
     def test_start_a_match_fails_no_current_round(self):
         """Invalid: starting a match when there is no current round."""
@@ -0,0 +1,70 @@
+import unittest
+import app.models.player_model as player_model
+import app.models.tournament_model as tournament_model
+from app.models.unit_of_work import UnitOfWork
+from tests import make_players
+from pathlib import Path
+import shutil
+import tests
+
+
+class TestUnitOfWork(unittest.TestCase):
+    """Test deferred writes of the repositories."""
+
+    def setUp(self) -> None:
+        self.test_dir = Path(tests.TEST_TMP_DIR, "test_unit_of_work")
+        self.test_dir.mkdir(mode=0o777, parents=True, exist_ok=True)
+        self.players_file = Path(self.test_dir, "players.json")
+        self.index_file = Path(self.test_dir, "index.json")
+        self.player_repo = player_model.PlayerRepository(self.players_file)
+        self.tournament_repo = tournament_model.TournamentRepository(self.index_file, self.player_repo)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _new_tournament(self) -> tournament_model.Tournament:
+        players = make_players("AA00001", "BB00002", "CC00003", "DD00004")
+        for p in players:
+            self.player_repo.add(p)
+        self.player_repo.commit_changes()
+        meta = tournament_model.TournamentMetaData(round_count=2)
+        return tournament_model.Tournament(metadata=meta, participants=players)
+
+    def test_deferred_writes(self):
+        with UnitOfWork(self.player_repo, self.tournament_repo) as uow:
+            tournament = self._new_tournament()
+            self.tournament_repo.store_tournament(tournament)
+            tournament.start_next_round()
+            self.tournament_repo.store_tournament(tournament)
+            uow.step()
+            # nothing written yet, but the data is available
+            self.assertFalse(self.players_file.exists())
+            self.assertFalse(self.index_file.exists())
+            self.assertFalse(self.tournament_repo.tournament_file(tournament.metadata).exists())
+            self.assertIs(self.tournament_repo.find_tournament_by_id(tournament.id()), tournament)
+        self.assertEqual(uow.flushes, 1)
+        self.assertFalse(self.tournament_repo.deferred)
+        # written once the unit of work is over
+        player_repo = player_model.PlayerRepository(self.players_file)
+        reloaded = tournament_model.TournamentRepository(self.index_file, player_repo)
+        loaded = reloaded.find_tournament_by_id(tournament.id())
+        self.assertTrue(loaded.has_started())
+        self.assertEqual(len(player_repo.list_all()), 4)
+
+    def test_flush_every(self):
+        with UnitOfWork(self.player_repo, self.tournament_repo, flush_every=2) as uow:
+            tournament = self._new_tournament()
+            self.tournament_repo.store_tournament(tournament)
+            uow.step()
+            self.assertFalse(self.index_file.exists())
+            uow.step()
+            self.assertTrue(self.index_file.exists())
+            self.assertTrue(self.tournament_repo.tournament_file(tournament.metadata).exists())
+        self.assertEqual(uow.flushes, 2)
+
+    def test_release_writes_deferred_store(self):
+        with UnitOfWork(self.player_repo, self.tournament_repo):
+            tournament = self._new_tournament()
+            self.tournament_repo.store_tournament(tournament)
+            self.tournament_repo.release_tournament(tournament.id())
+            self.assertTrue(self.tournament_repo.tournament_file(tournament.metadata).exists())
@@ -0,0 +1,103 @@
+import unittest
+import tests
+import app.models.player_model as player_model
+import app.models.tournament_model as tournament_model
+from app.adapters import warm_cache
+from datetime import date, datetime
+from pathlib import Path
+import json
+import os
+import shutil
+from tests import make_players, play_round
+
+
+class TestWarmCache(unittest.TestCase):
+    """Test the warm-start cache of decoded JSON files.
+
+    Writes to the tests/tmp directory.
+    """
+    def setUp(self) -> None:
+        self.test_dir = Path(tests.TEST_TMP_DIR, "test_warm_cache")
+        self.test_dir.mkdir(mode=0o777, parents=True, exist_ok=True)
+        self.json_file = Path(self.test_dir, "data.json")
+        with open(self.json_file, "w", encoding="utf8") as f:
+            json.dump({"a": 1}, f)
+        self.decoded = 0
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def decode(self, json_str: str):
+        self.decoded += 1
+        return json.loads(json_str)
+
+    def test_read_decoded(self):
+        self.assertEqual(warm_cache.read_decoded(self.json_file, self.decode), {"a": 1})
+        self.assertTrue(warm_cache.cache_file(self.json_file).exists())
+        self.assertEqual(warm_cache.read_decoded(self.json_file, self.decode), {"a": 1})
+        self.assertEqual(self.decoded, 1)
+
+    def test_invalidation(self):
+        warm_cache.read_decoded(self.json_file, self.decode)
+        stat = self.json_file.stat()
+        # same size and modification time, different content: the hash tells
+        with open(self.json_file, "w", encoding="utf8") as f:
+            json.dump({"a": 2}, f)
+        os.utime(self.json_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(warm_cache.read_decoded(self.json_file, self.decode), {"a": 2})
+        self.assertEqual(self.decoded, 2)
+
+    def test_corrupt_cache(self):
+        warm_cache.cache_file(self.json_file).write_bytes(b"not a pickle")
+        self.assertEqual(warm_cache.read_decoded(self.json_file, self.decode), {"a": 1})
+        self.assertEqual(warm_cache.read_decoded(self.json_file, self.decode), {"a": 1})
+        self.assertEqual(self.decoded, 1)
+
+    def test_player_repository(self):
+        players_file = Path(self.test_dir, "players.json")
+        repo = player_model.PlayerRepository(players_file, warm_cache=True)
+        repo.add(player_model.Player("AB12345", "Doe", "John", date(2000, 1, 1), rating=1500.0))
+        repo.commit_changes()
+        # the cache is refreshed on write
+        self.assertTrue(warm_cache.cache_file(players_file).exists())
+        with open(players_file, encoding="utf8") as f:
+            cold = json.load(f, cls=player_model.PlayerJSONDecoder)
+        hit, warm = warm_cache.load_cached(
+            players_file,
+            players_file.stat(),
+            players_file.read_bytes(),
+            unpack=player_model.PlayerJSONDecoder.warm_unpack,
+        )
+        self.assertTrue(hit)
+        self.assertEqual(warm, cold)
+        reloaded = player_model.PlayerRepository(players_file, warm_cache=True)
+        self.assertEqual(reloaded.find_by_id("AB12345"), repo.find_by_id("AB12345"))
+        self.assertIs(reloaded.find_by_id("AB12345").id(), player_model.NationalPlayerID("AB12345"))
+
+    def test_tournament_repository(self):
+        """The caches refreshed on write hold what decoding the written files returns."""
+        players_file = Path(self.test_dir, "players.json")
+        index_file = Path(self.test_dir, "tournaments", "tournament_index.json")
+        player_repo = player_model.PlayerRepository(players_file, warm_cache=True)
+        players = make_players("AA00001", "BB00002", "CC00003", "DD00004")
+        for p in players:
+            player_repo.add(p)
+        player_repo.commit_changes()
+        repo = tournament_model.TournamentRepository(index_file, player_repo, warm_cache=True)
+        meta = tournament_model.TournamentMetaData(round_count=2)
+        tournament = tournament_model.Tournament(metadata=meta, participants=players)
+        play_round(tournament, [(players[0], players[1]), (players[2], players[3])], [players[0].id(), None], 1)
+        tournament.start_next_round()
+        tournament.start_a_match(0, start_time=datetime(2024, 6, 2, 9))
+        repo.store_tournament(tournament)
+        for source_file, decode in (
+            (index_file, lambda s: json.loads(s, cls=tournament_model.TournamentMetaDataJSONDecoder)),
+            (repo.tournament_file(tournament.metadata), json.loads),
+        ):
+            hit, warm = warm_cache.load_cached(source_file, source_file.stat(), source_file.read_bytes())
+            self.assertTrue(hit)
+            self.assertEqual(warm, decode(source_file.read_text(encoding="utf8")))
+
+
+if __name__ == '__main__':
+    unittest.main()
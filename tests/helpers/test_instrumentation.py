@@ -0,0 +1,49 @@
+import unittest
+from app.helpers.instrumentation import Instrumentation, percentile
+from pathlib import Path
+import pstats
+import shutil
+import tests
+
+
+class SampleCommand:
+    def execute(self):
+        sum(range(1000))
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Test the timing instrumentation of commands."""
+
+    def setUp(self) -> None:
+        self.test_dir = Path(tests.TEST_TMP_DIR, "test_instrumentation")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([3.0], 90), 3.0)
+        self.assertEqual(percentile([], 50), 0.0)
+
+    def test_report(self):
+        instrumentation = Instrumentation()
+        for _ in range(3):
+            with instrumentation.command(SampleCommand()):
+                with instrumentation.method("SampleManager", "default"):
+                    SampleCommand().execute()
+        self.assertEqual(len(instrumentation.samples["command SampleCommand"].wall), 3)
+        self.assertEqual(len(instrumentation.samples["method SampleManager.default"].cpu), 3)
+        report = instrumentation.report().splitlines()
+        self.assertIn("p90 ms", report[0])
+        # commands include the methods they launch: slowest first
+        self.assertTrue(report[2].startswith("command SampleCommand"))
+
+    def test_profile(self):
+        instrumentation = Instrumentation(profile_dir=self.test_dir)
+        with instrumentation.command(SampleCommand()):
+            SampleCommand().execute()
+        prof_files = list(self.test_dir.glob("*.prof"))
+        self.assertEqual([f.name for f in prof_files], ["00001_SampleCommand.prof"])
+        self.assertGreater(pstats.Stats(str(prof_files[0])).total_calls, 0)
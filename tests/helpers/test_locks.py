@@ -0,0 +1,34 @@
+import unittest
+import threading
+from app.helpers.locks import SharedExclusiveLock
+
+
+class TestSharedExclusiveLock(unittest.TestCase):
+    """Test the shared and exclusive modes of the SharedExclusiveLock."""
+
+    def test_exclusive_reentrant(self):
+        lock = SharedExclusiveLock()
+        with lock.exclusive():
+            with lock.exclusive(), lock.shared():
+                pass
+            self.assertTrue(lock._exclusive_held)
+        self.assertFalse(lock._exclusive_held)
+
+    def test_exclusive_excludes_shared(self):
+        lock = SharedExclusiveLock()
+        entered = threading.Event()
+
+        def read():
+            with lock.shared():
+                entered.set()
+
+        with lock.exclusive():
+            thread = threading.Thread(target=read)
+            thread.start()
+            self.assertFalse(entered.wait(0.1))
+        thread.join()
+        self.assertTrue(entered.is_set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import time
+from app.helpers.sampling_profiler import SamplingProfiler
+from pathlib import Path
+import shutil
+import tests
+
+
+def busy_loop(duration: float):
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        sum(range(100))
+
+
+class TestSamplingProfiler(unittest.TestCase):
+    """Test the sampling profiler and its collapsed-stack output."""
+
+    def setUp(self) -> None:
+        self.test_dir = Path(tests.TEST_TMP_DIR, "test_sampling_profiler")
+        self.test_dir.mkdir(mode=0o777, parents=True, exist_ok=True)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_samples_main_thread(self):
+        profiler = SamplingProfiler(interval=0.001)
+        profiler.start()
+        self.assertTrue(profiler.running())
+        busy_loop(0.2)
+        profiler.stop()
+        self.assertFalse(profiler.running())
+        self.assertGreater(profiler.samples, 0)
+        self.assertEqual(sum(profiler.stacks.values()), profiler.samples)
+        # stacks are recorded root first
+        self.assertTrue(any("busy_loop" in stack[-1] or "busy_loop" in stack[-2] for stack in profiler.stacks))
+        self.assertGreater(profiler.elapsed, 0)
+        self.assertLess(profiler.overhead(), 1)
+
+    def test_max_depth(self):
+        profiler = SamplingProfiler(interval=0.001, max_depth=2)
+        profiler.start()
+        busy_loop(0.05)
+        profiler.stop()
+        self.assertTrue(all(len(stack) <= 2 for stack in profiler.stacks))
+
+    def test_write_collapsed(self):
+        profiler = SamplingProfiler()
+        profiler.stacks[("main (main.py:1)", "run (app.py:10)")] += 3
+        profiler.stacks[("main (main.py:1)",)] += 1
+        o_file = Path(self.test_dir, "sub", "profile.collapsed")
+        profiler.write_collapsed(o_file)
+        with open(o_file, encoding="utf8") as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines, ["main (main.py:1);run (app.py:10) 3", "main (main.py:1) 1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
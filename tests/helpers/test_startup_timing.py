@@ -0,0 +1,80 @@
+import unittest
+import subprocess
+import sys
+from app.helpers.startup_timing import StartupTimer
+from pathlib import Path
+import shutil
+import app
+import tests
+
+
+class TestStartupTiming(unittest.TestCase):
+    """Test the startup timer, and the modules imported at startup."""
+
+    def setUp(self) -> None:
+        self.test_dir = Path(tests.TEST_TMP_DIR, "test_startup_timing")
+        self.test_dir.mkdir(mode=0o777, parents=True, exist_ok=True)
+        with open(Path(self.test_dir, "startup_outer.py"), "w", encoding="utf8") as f:
+            f.write("import startup_inner\nVALUE = startup_inner.VALUE + 1\n")
+        with open(Path(self.test_dir, "startup_inner.py"), "w", encoding="utf8") as f:
+            f.write("import time\ntime.sleep(0.01)\nVALUE = 1\n")
+        sys.path.insert(0, str(self.test_dir))
+
+    def tearDown(self) -> None:
+        sys.path.remove(str(self.test_dir))
+        for module_n in ("startup_outer", "startup_inner"):
+            sys.modules.pop(module_n, None)
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_import_times(self):
+        timer = StartupTimer()
+        timer.enable()
+        try:
+            import startup_outer
+        finally:
+            timer.disable()
+        self.assertEqual(startup_outer.VALUE, 2)
+        outer, inner = timer.imports["startup_outer"], timer.imports["startup_inner"]
+        self.assertGreaterEqual(inner.self_time, 0.01)
+        self.assertGreaterEqual(outer.cumulative, inner.cumulative)
+        self.assertLess(outer.self_time, inner.self_time)
+
+    def test_phases_and_first_view(self):
+        timer = StartupTimer()
+        with timer.phase("ignored"):
+            pass
+        self.assertFalse(timer.mark_first_view())
+        timer.enable()
+        with timer.phase("load players"):
+            pass
+        self.assertTrue(timer.mark_first_view())
+        self.assertFalse(timer.mark_first_view())
+        self.assertFalse(timer.enabled)
+        self.assertEqual(list(timer.phases), ["load players"])
+        report = timer.report(target_ms=1000)
+        self.assertIn("Time to first menu", report)
+        self.assertIn("load players", report)
+
+    def test_lazy_app_imports(self):
+        """Importing the main controller doesn't import the other controllers, nor the HTML or keyboard modules."""
+        code = (
+            "import sys, app.controllers.chessclubapp\n"
+            "print(' '.join(sorted(sys.modules)))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=app.APPDIR.parent, capture_output=True, text=True, check=True
+        )
+        modules = result.stdout.split()
+        for module_n in (
+            "app.controllers.player_manager",
+            "app.controllers.tournament_manager",
+            "app.controllers.reports_manager",
+            "app.views.html.base_html",
+            "app.helpers.ansio_ui",
+            "app.models.head_to_head",
+        ):
+            self.assertNotIn(module_n, modules)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import json
+import app.models.player_model as player_model
+import app.models.tournament_model as tournament_model
+from app.helpers import tracing
+from app.helpers.tracing import Tracer, traced
+from tests import make_players
+from pathlib import Path
+import shutil
+import tests
+
+
+class TestTracing(unittest.TestCase):
+    """Test the tracing spans and their export."""
+
+    def setUp(self) -> None:
+        self.test_dir = Path(tests.TEST_TMP_DIR, "test_tracing")
+        self.test_dir.mkdir(mode=0o777, parents=True, exist_ok=True)
+
+    def tearDown(self) -> None:
+        tracing.tracer.disable()
+        tracing.tracer.clear()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_nested_spans(self):
+        tracer = Tracer()
+        tracer.enable()
+        with tracer.span("controller outer", key="value") as outer:
+            with tracer.span("repository inner") as inner:
+                pass
+        self.assertEqual(inner.parent_id, outer.id)
+        self.assertIsNone(outer.parent_id)
+        self.assertGreaterEqual(outer.duration_us, inner.duration_us)
+        self.assertEqual(outer.attrs, {"key": "value"})
+
+    def test_max_spans(self):
+        tracer = Tracer()
+        tracer.enable(max_spans=2)
+        for _ in range(5):
+            with tracer.span("step"):
+                pass
+        self.assertEqual(len(tracer.spans), 2)
+
+    def test_disabled(self):
+        calls = []
+
+        @traced()
+        def func():
+            calls.append(1)
+
+        func()
+        self.assertEqual(calls, [1])
+        self.assertEqual(tracing.tracer.spans, [])
+
+    def test_export(self):
+        tracing.tracer.enable()
+        player_repo = player_model.PlayerRepository(Path(self.test_dir, "players.json"))
+        players = make_players("AA00001", "BB00002", "CC00003", "DD00004")
+        for p in players:
+            player_repo.add(p)
+        player_repo.commit_changes()
+        repo = tournament_model.TournamentRepository(Path(self.test_dir, "index.json"), player_repo)
+        meta = tournament_model.TournamentMetaData(round_count=2)
+        tournament = tournament_model.Tournament(metadata=meta, participants=players)
+        tournament.start_next_round()
+        with tracing.span("controller test"):
+            repo.store_tournament(tournament)
+        tracing.tracer.disable()
+
+        jsonl_file = Path(self.test_dir, "trace.jsonl")
+        tracing.tracer.export(jsonl_file)
+        spans = [json.loads(line) for line in jsonl_file.read_text(encoding="utf8").splitlines()]
+        by_name = {s["name"]: s for s in spans}
+        self.assertIn("storage write_store", by_name)
+        store = by_name["repository store_tournament"]
+        self.assertEqual(store["parent"], by_name["controller test"]["id"])
+        self.assertEqual(by_name["storage write_tournament_file"]["parent"], store["id"])
+
+        chrome_file = Path(self.test_dir, "trace.json")
+        tracing.tracer.export(chrome_file)
+        events = json.loads(chrome_file.read_text(encoding="utf8"))["traceEvents"]
+        self.assertEqual(len(events), len(spans))
+        self.assertTrue(all(e["ph"] == "X" for e in events))